@@ -0,0 +1,104 @@
+"""Compare sequential and batch updates of the PowerStat learning models.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python -m benchmarks.batch_updates [samples]
+"""
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from custom_components.powerstat.models.learning import PreferenceModel
+from custom_components.powerstat.models.thermal import ThermalModel
+
+def _timed(function) -> float:
+    """Return the wall time of one call in seconds."""
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+def bench_thermal(count: int) -> None:
+    """Refit-sized thermal update: per-sample calls against one batch."""
+    modes = [random.choice(("heat", "cool", "off")) for _ in range(count)]
+    deltas = [random.gauss(1.0, 0.5) for _ in range(count)]
+    runtimes = [random.uniform(5, 60) for _ in range(count)]
+    outdoor = [random.choice((math.nan, random.uniform(-20, 40))) for _ in range(count)]
+    hours = [random.randrange(24) for _ in range(count)]
+    whens = [datetime(2026, 1, 1, hour) for hour in hours]
+
+    sequential, batch = ThermalModel(), ThermalModel()
+
+    def run_sequential() -> None:
+        for index in range(count):
+            sequential.update(
+                modes[index],
+                deltas[index],
+                runtimes[index],
+                None if math.isnan(outdoor[index]) else outdoor[index],
+                whens[index],
+            )
+
+    seconds_sequential = _timed(run_sequential)
+    arrays = [np.asarray(values) for values in (modes, deltas, runtimes, outdoor, hours)]
+    seconds_batch = _timed(lambda: batch.update_batch(*arrays))
+
+    for field in ("cell_rates", "cell_means", "cell_m2", "rate_means", "rate_m2"):
+        assert np.allclose(
+            getattr(sequential, field), getattr(batch, field), rtol=1e-9, atol=1e-12
+        ), field
+    for field in ("heat_rate", "cool_rate", "drift_rate"):
+        assert math.isclose(
+            getattr(sequential, field), getattr(batch, field), rel_tol=1e-9, abs_tol=1e-12
+        ), field
+    assert list(sequential.cell_samples) == list(batch.cell_samples)
+    assert sequential.samples_heat == batch.samples_heat
+    assert sequential.samples_cool == batch.samples_cool
+    assert sequential.samples_off == batch.samples_off
+    _report("ThermalModel", count, seconds_sequential, seconds_batch)
+
+def bench_preferences(count: int) -> None:
+    """Replay of setpoint changes: per-change calls against one batch."""
+    model = PreferenceModel()
+    contexts = [
+        model.get_context(
+            datetime(2026, 1, random.randint(1, 14), random.randrange(24), random.randrange(60)),
+            random.choice(("home", "away", "sleep")),
+            random.random() < 0.5,
+        )
+        for _ in range(count)
+    ]
+    modes = [random.choice(("heat", "cool")) for _ in range(count)]
+    setpoints = [random.uniform(17, 26) for _ in range(count)]
+
+    sequential, batch = PreferenceModel(), PreferenceModel()
+
+    def run_sequential() -> None:
+        for context, mode, setpoint in zip(contexts, modes, setpoints):
+            sequential.update_preference(context, mode, setpoint)
+
+    seconds_sequential = _timed(run_sequential)
+    seconds_batch = _timed(lambda: batch.update_preferences(contexts, modes, setpoints))
+
+    for context, pref in sequential.preferences.items():
+        for key, value in pref.items():
+            assert math.isclose(value, batch.preferences[context][key], rel_tol=1e-9, abs_tol=1e-9)
+    _report("PreferenceModel", count, seconds_sequential, seconds_batch)
+
+def _report(name: str, count: int, sequential: float, batch: float) -> None:
+    """Print one result line."""
+    print(
+        f"{name:<16} {count:>8} samples  sequential {sequential * 1000:9.1f} ms"
+        f"  batch {batch * 1000:8.1f} ms  speedup {sequential / batch:6.1f}x"
+    )
+
+if __name__ == "__main__":
+    random.seed(0)
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    bench_thermal(samples)
+    bench_preferences(samples)
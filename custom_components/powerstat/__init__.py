@@ -1,56 +1,101 @@
 """The PowerStat integration."""
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import shutil
+import time
 
+from homeassistant.components.frontend import add_extra_js_url
+from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CARD_URL_PATH,
+    CARD_FILENAME,
+    CONF_TEMP_DEADBAND,
+    RUNTIME_STORAGE_VERSION,
+    SETUP_TIME_BUDGET,
+)
 from .coordinator import PowerStatCoordinator
+from .profiler import async_register_profile_service
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = ["sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the PowerStat integration (domain-wide)."""
+    async_register_websocket_commands(hass)
+    async_register_profile_service(hass)
+    await _async_register_card(hass)
+    return True
+
+def _file_digest(path: str) -> str:
+    """Return the SHA-256 of a file."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def _sync_legacy_card(source_dir: str, dest_dir: str) -> str:
+    """Refresh the /local card copy where content changed; returns the card hash.
+
+    Runs in an executor thread. Files whose size and mtime match are skipped
+    without reading them, so a restart with an unchanged card does no copying.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    for item in os.listdir(source_dir):
+        src = os.path.join(source_dir, item)
+        dst = os.path.join(dest_dir, item)
+        if not os.path.isfile(src):
+            continue
+        if os.path.exists(dst):
+            src_stat, dst_stat = os.stat(src), os.stat(dst)
+            if (src_stat.st_size, src_stat.st_mtime) == (dst_stat.st_size, dst_stat.st_mtime):
+                continue
+            if _file_digest(src) == _file_digest(dst):
+                continue
+        shutil.copy2(src, dst)
+        _LOGGER.info("Updated PowerStat card file %s", dst)
+
+    return _file_digest(os.path.join(source_dir, CARD_FILENAME))
+
+async def _async_register_card(hass: HomeAssistant) -> None:
+    """Serve the card from the integration directory with a versioned URL."""
+    source_dir = os.path.join(os.path.dirname(__file__), "www", "powerstat-card")
+
+    try:
+        digest = await hass.async_add_executor_job(
+            _sync_legacy_card, source_dir, hass.config.path("www", "powerstat-card")
+        )
+    except OSError as err:
+        _LOGGER.error("Failed to prepare PowerStat card files: %s", err)
+        return
+
+    await hass.http.async_register_static_paths(
+        [StaticPathConfig(CARD_URL_PATH, source_dir, cache_headers=True)]
+    )
+    # The content hash in the query string busts browser caches on upgrade
+    add_extra_js_url(hass, f"{CARD_URL_PATH}/{CARD_FILENAME}?v={digest[:8]}")
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up PowerStat from a config entry."""
+    started = time.perf_counter()
     coordinator = PowerStatCoordinator(hass, entry)
     
-    # 1. Copy the card to the www folder so it's accessible
-    # This is more reliable than trying to register static paths across HA versions
-    import shutil
-    
-    def copy_card_files():
-        """Copy card files to www folder (runs in executor thread)."""
-        integration_dir = os.path.dirname(__file__)
-        source_card_dir = os.path.join(integration_dir, "www", "powerstat-card")
-        dest_card_dir = hass.config.path("www", "powerstat-card")
-        
-        # Create www directory if it doesn't exist
-        os.makedirs(dest_card_dir, exist_ok=True)
-        
-        # Copy all files from source to destination
-        if os.path.exists(source_card_dir):
-            for item in os.listdir(source_card_dir):
-                src = os.path.join(source_card_dir, item)
-                dst = os.path.join(dest_card_dir, item)
-                if os.path.isfile(src):
-                    shutil.copy2(src, dst)
-            return dest_card_dir
-        return None
-    
-    try:
-        result = await hass.async_add_executor_job(copy_card_files)
-        if result:
-            _LOGGER.info("Copied PowerStat card to %s", result)
-        else:
-            _LOGGER.warning("PowerStat card source directory not found")
-    except Exception as err:
-        _LOGGER.error("Failed to copy PowerStat card files: %s", err)
-    
-    # 2. Initial data fetch
+    # Warm the model, subscribe to the shared environment service, then fetch
+    await coordinator.async_load_episodes()
+    await coordinator.async_load_forecast_scorer()
+    await coordinator.async_load_runtime()
+    coordinator.async_setup_listeners()
     await coordinator.async_config_entry_first_refresh()
     
     hass.data.setdefault(DOMAIN, {})
@@ -58,13 +103,52 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Apply option changes in place instead of reloading the entry
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    elapsed = time.perf_counter() - started
+    if elapsed > SETUP_TIME_BUDGET:
+        _LOGGER.warning(
+            "Setting up %s took %.2fs (budget %.2fs)", entry.title, elapsed, SETUP_TIME_BUDGET
+        )
+    else:
+        _LOGGER.debug("Set up %s in %.3fs", entry.title, elapsed)
     
     return True
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an entry created by an older config flow."""
+    if entry.version == 1:
+        # Version 1 stored a deadband the planner ignored in favour of ±0.5 °C;
+        # drop it so the band doesn't change on upgrade
+        data = {key: value for key, value in entry.data.items() if key != CONF_TEMP_DEADBAND}
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+        _LOGGER.debug("Migrated %s to version 2", entry.title)
+    return True
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Hot-apply changed options to the running coordinator."""
+    coordinator: PowerStatCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_apply_config()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: PowerStatCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_save_runtime()
 
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the episode log and runtime history of a removed entry."""
+    path = hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.episodes")
+
+    def remove_logs() -> None:
+        for log_path in (path, f"{path}.1"):
+            if os.path.exists(log_path):
+                os.remove(log_path)
+
+    await hass.async_add_executor_job(remove_logs)
+    await Store(hass, RUNTIME_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.runtime").async_remove()
@@ -19,6 +19,7 @@ from .const import (
     CONF_FANS,
     CONF_AWAY_ENTITY,
     CONF_SLEEP_ENTITY,
+    CONF_LOAD_SHED_ENTITY,
     CONF_DECISION_INTERVAL,
     CONF_MIN_ACTION_INTERVAL,
     CONF_TEMP_DEADBAND,
@@ -30,6 +31,13 @@ from .const import (
     CONF_MANUAL_HOLD_DURATION,
     CONF_OVERRIDE_WINDOW,
     CONF_PRESENCE_WEIGHT_BOOST,
+    CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTDOOR_HUMIDITY_SENSOR,
+    CONF_WEATHER_ENTITY,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_ESTIMATOR,
+    CONF_AVERAGING_WINDOW,
+    CONF_SHADOW_PLANNERS,
     DEFAULT_DECISION_INTERVAL,
     DEFAULT_MIN_ACTION_INTERVAL,
     DEFAULT_TEMP_DEADBAND,
@@ -41,17 +49,87 @@ from .const import (
     DEFAULT_MANUAL_HOLD_DURATION,
     DEFAULT_OVERRIDE_WINDOW,
     DEFAULT_PRESENCE_WEIGHT_BOOST,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_ESTIMATOR,
+    DEFAULT_AVERAGING_WINDOW,
+    ESTIMATOR_WEIGHTED,
+    ESTIMATOR_KALMAN,
 )
+from .engine.shadow import SHADOW_VARIANTS
+
+def _optional_schema(config: dict[str, Any]) -> dict:
+    """Optional entity selections, suggesting the current values."""
+
+    def suggested(key: str) -> dict[str, Any]:
+        return {"suggested_value": config.get(key)}
+
+    return {
+        vol.Optional(CONF_HUMIDITY_SENSORS, description=suggested(CONF_HUMIDITY_SENSORS)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="sensor", device_class="humidity", multiple=True)
+        ),
+        vol.Optional(CONF_WINDOW_SENSORS, description=suggested(CONF_WINDOW_SENSORS)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["binary_sensor", "sensor"], multiple=True)
+        ),
+        vol.Optional(CONF_PRESENCE_SENSORS, description=suggested(CONF_PRESENCE_SENSORS)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["binary_sensor", "sensor"], multiple=True)
+        ),
+        vol.Optional(CONF_FANS, description=suggested(CONF_FANS)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain="fan", multiple=True)
+        ),
+        vol.Optional(CONF_AWAY_ENTITY, description=suggested(CONF_AWAY_ENTITY)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["person", "input_boolean", "alarm_control_panel", "input_select", "binary_sensor"], multiple=True)
+        ),
+        vol.Optional(CONF_SLEEP_ENTITY, description=suggested(CONF_SLEEP_ENTITY)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["binary_sensor", "input_boolean"], multiple=True)
+        ),
+        vol.Optional(CONF_LOAD_SHED_ENTITY, description=suggested(CONF_LOAD_SHED_ENTITY)): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=["binary_sensor", "input_boolean"])
+        ),
+    }
+
+def _advanced_schema(config: dict[str, Any]) -> dict:
+    """Tuning settings, defaulting to the current values."""
+
+    def current(key: str, default: Any) -> Any:
+        return config.get(key, default)
+
+    return {
+        vol.Optional(CONF_DECISION_INTERVAL, default=current(CONF_DECISION_INTERVAL, DEFAULT_DECISION_INTERVAL)): vol.Coerce(int),
+        vol.Optional(CONF_MIN_ACTION_INTERVAL, default=current(CONF_MIN_ACTION_INTERVAL, DEFAULT_MIN_ACTION_INTERVAL)): vol.Coerce(int),
+        vol.Optional(CONF_TEMP_DEADBAND, default=current(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)): vol.Coerce(float),
+        vol.Optional(CONF_MIN_SETPOINT_CHANGE, default=current(CONF_MIN_SETPOINT_CHANGE, DEFAULT_MIN_SETPOINT_CHANGE)): vol.Coerce(float),
+        vol.Optional(CONF_MIN_ON_TIME, default=current(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME)): vol.Coerce(int),
+        vol.Optional(CONF_MIN_OFF_TIME, default=current(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME)): vol.Coerce(int),
+        vol.Optional(CONF_OPEN_GRACE_PERIOD, default=current(CONF_OPEN_GRACE_PERIOD, DEFAULT_OPEN_GRACE_PERIOD)): vol.Coerce(int),
+        vol.Optional(CONF_CLOSE_STABILISE_PERIOD, default=current(CONF_CLOSE_STABILISE_PERIOD, DEFAULT_CLOSE_STABILISE_PERIOD)): vol.Coerce(int),
+        vol.Optional(CONF_MANUAL_HOLD_DURATION, default=current(CONF_MANUAL_HOLD_DURATION, DEFAULT_MANUAL_HOLD_DURATION)): vol.Coerce(int),
+        vol.Optional(CONF_OVERRIDE_WINDOW, default=current(CONF_OVERRIDE_WINDOW, DEFAULT_OVERRIDE_WINDOW)): vol.Coerce(int),
+        vol.Optional(CONF_PRESENCE_WEIGHT_BOOST, default=current(CONF_PRESENCE_WEIGHT_BOOST, DEFAULT_PRESENCE_WEIGHT_BOOST)): vol.Coerce(float),
+        vol.Optional(CONF_SENSOR_STALE_TIMEOUT, default=current(CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT)): vol.Coerce(int),
+        vol.Optional(CONF_ESTIMATOR, default=current(CONF_ESTIMATOR, DEFAULT_ESTIMATOR)): vol.In([ESTIMATOR_WEIGHTED, ESTIMATOR_KALMAN]),
+        vol.Optional(CONF_AVERAGING_WINDOW, default=current(CONF_AVERAGING_WINDOW, DEFAULT_AVERAGING_WINDOW)): vol.Coerce(int),
+        vol.Optional(CONF_SHADOW_PLANNERS, default=current(CONF_SHADOW_PLANNERS, [])): selector.SelectSelector(
+            selector.SelectSelectorConfig(options=list(SHADOW_VARIANTS), multiple=True)
+        ),
+    }
 
 class PowerStatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for PowerStat."""
 
-    VERSION = 1
+    VERSION = 2
 
     def __init__(self) -> None:
         """Initialize flow."""
         self._data: dict[str, Any] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> PowerStatOptionsFlow:
+        """Get the options flow for this handler."""
+        return PowerStatOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -100,25 +178,67 @@ class PowerStatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="optional",
+            data_schema=vol.Schema(_optional_schema(self._data)),
+        )
+
+    async def async_step_advanced(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Step 4: advanced settings."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return self.async_create_entry(title="PowerStat", data=self._data)
+
+        return self.async_show_form(
+            step_id="advanced",
+            data_schema=vol.Schema(_advanced_schema(self._data)),
+        )
+
+class PowerStatOptionsFlow(config_entries.OptionsFlow):
+    """Change sensors and settings of a running PowerStat entry.
+
+    Saved options are applied in place by the coordinator, so the entry is
+    not reloaded and learned state is kept.
+    """
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+        self._options: dict[str, Any] = {**config_entry.data, **config_entry.options}
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Step 1: sensors and environment sources."""
+        if user_input is not None:
+            # Cleared selectors are omitted from the input; store them as empty
+            # so they override the values given at setup.
+            for key in (CONF_HUMIDITY_SENSORS, CONF_WINDOW_SENSORS, CONF_PRESENCE_SENSORS, CONF_FANS, CONF_AWAY_ENTITY, CONF_SLEEP_ENTITY):
+                self._options[key] = []
+            for key in (CONF_LOAD_SHED_ENTITY, CONF_OUTDOOR_TEMP_SENSOR, CONF_OUTDOOR_HUMIDITY_SENSOR, CONF_WEATHER_ENTITY):
+                self._options[key] = None
+            self._options.update(user_input)
+            return await self.async_step_advanced()
+
+        def suggested(key: str) -> dict[str, Any]:
+            return {"suggested_value": self._options.get(key)}
+
+        return self.async_show_form(
+            step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Optional(CONF_HUMIDITY_SENSORS): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="sensor", device_class="humidity", multiple=True)
-                    ),
-                    vol.Optional(CONF_WINDOW_SENSORS): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain=["binary_sensor", "sensor"], multiple=True)
-                    ),
-                    vol.Optional(CONF_PRESENCE_SENSORS): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain=["binary_sensor", "sensor"], multiple=True)
+                    vol.Required(CONF_TEMP_SENSORS, default=self._options.get(CONF_TEMP_SENSORS, [])): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor", device_class="temperature", multiple=True)
                     ),
-                    vol.Optional(CONF_FANS): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain="fan", multiple=True)
+                    **_optional_schema(self._options),
+                    vol.Optional(CONF_OUTDOOR_TEMP_SENSOR, description=suggested(CONF_OUTDOOR_TEMP_SENSOR)): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor", device_class="temperature")
                     ),
-                    vol.Optional(CONF_AWAY_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain=["person", "input_boolean", "alarm_control_panel", "input_select", "binary_sensor"], multiple=True)
+                    vol.Optional(CONF_OUTDOOR_HUMIDITY_SENSOR, description=suggested(CONF_OUTDOOR_HUMIDITY_SENSOR)): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor", device_class="humidity")
                     ),
-                    vol.Optional(CONF_SLEEP_ENTITY): selector.EntitySelector(
-                        selector.EntitySelectorConfig(domain=["binary_sensor", "input_boolean"], multiple=True)
+                    vol.Optional(CONF_WEATHER_ENTITY, description=suggested(CONF_WEATHER_ENTITY)): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="weather")
                     ),
                 }
             ),
@@ -127,26 +247,18 @@ class PowerStatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_advanced(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Step 4: advanced settings."""
+        """Step 2: advanced settings."""
         if user_input is not None:
-            self._data.update(user_input)
-            return self.async_create_entry(title="PowerStat", data=self._data)
+            self._options.update(user_input)
+            # The climate entity is fixed at setup; everything else is an option
+            options = {
+                key: value
+                for key, value in self._options.items()
+                if key != CONF_CLIMATE_ENTITY
+            }
+            return self.async_create_entry(title="", data=options)
 
         return self.async_show_form(
             step_id="advanced",
-            data_schema=vol.Schema(
-                {
-                    vol.Optional(CONF_DECISION_INTERVAL, default=DEFAULT_DECISION_INTERVAL): vol.Coerce(int),
-                    vol.Optional(CONF_MIN_ACTION_INTERVAL, default=DEFAULT_MIN_ACTION_INTERVAL): vol.Coerce(int),
-                    vol.Optional(CONF_TEMP_DEADBAND, default=DEFAULT_TEMP_DEADBAND): vol.Coerce(float),
-                    vol.Optional(CONF_MIN_SETPOINT_CHANGE, default=DEFAULT_MIN_SETPOINT_CHANGE): vol.Coerce(float),
-                    vol.Optional(CONF_MIN_ON_TIME, default=DEFAULT_MIN_ON_TIME): vol.Coerce(int),
-                    vol.Optional(CONF_MIN_OFF_TIME, default=DEFAULT_MIN_OFF_TIME): vol.Coerce(int),
-                    vol.Optional(CONF_OPEN_GRACE_PERIOD, default=DEFAULT_OPEN_GRACE_PERIOD): vol.Coerce(int),
-                    vol.Optional(CONF_CLOSE_STABILISE_PERIOD, default=DEFAULT_CLOSE_STABILISE_PERIOD): vol.Coerce(int),
-                    vol.Optional(CONF_MANUAL_HOLD_DURATION, default=DEFAULT_MANUAL_HOLD_DURATION): vol.Coerce(int),
-                    vol.Optional(CONF_OVERRIDE_WINDOW, default=DEFAULT_OVERRIDE_WINDOW): vol.Coerce(int),
-                    vol.Optional(CONF_PRESENCE_WEIGHT_BOOST, default=DEFAULT_PRESENCE_WEIGHT_BOOST): vol.Coerce(float),
-                }
-            ),
+            data_schema=vol.Schema(_advanced_schema(self._options)),
         )
@@ -11,6 +11,7 @@ CONF_PRESENCE_SENSORS = "presence_sensors"
 CONF_FANS = "fans"
 CONF_AWAY_ENTITY = "away_entity"
 CONF_SLEEP_ENTITY = "sleep_entity"
+CONF_LOAD_SHED_ENTITY = "load_shed_entity"
 
 # Environmental monitoring (optional)
 CONF_OUTDOOR_TEMP_SENSOR = "outdoor_temp_sensor"
@@ -32,11 +33,15 @@ CONF_CLOSE_STABILISE_PERIOD = "close_stabilise_period"
 CONF_MANUAL_HOLD_DURATION = "manual_hold_duration"
 CONF_OVERRIDE_WINDOW = "override_window"
 CONF_PRESENCE_WEIGHT_BOOST = "presence_weight_boost"
+CONF_SENSOR_STALE_TIMEOUT = "sensor_stale_timeout"
+CONF_ESTIMATOR = "estimator"
+CONF_AVERAGING_WINDOW = "averaging_window"
+CONF_SHADOW_PLANNERS = "shadow_planners"
 
 # Defaults
 DEFAULT_DECISION_INTERVAL = 120
 DEFAULT_MIN_ACTION_INTERVAL = 300
-DEFAULT_TEMP_DEADBAND = 0.3
+DEFAULT_TEMP_DEADBAND = 0.5
 DEFAULT_MIN_SETPOINT_CHANGE = 0.5
 DEFAULT_MIN_ON_TIME = 10
 DEFAULT_MIN_OFF_TIME = 8
@@ -45,11 +50,100 @@ DEFAULT_CLOSE_STABILISE_PERIOD = 120
 DEFAULT_MANUAL_HOLD_DURATION = 60
 DEFAULT_OVERRIDE_WINDOW = 20
 DEFAULT_PRESENCE_WEIGHT_BOOST = 2.0
+DEFAULT_SENSOR_STALE_TIMEOUT = 90
+DEFAULT_ESTIMATOR = "weighted"
+DEFAULT_AVERAGING_WINDOW = 10
 DEFAULT_FREE_TEMP_DIFFERENTIAL = 2.0
 DEFAULT_WINDOW_GRACE_PERIOD = 60
 DEFAULT_EFFICIENCY_WARNINGS = True
 
+# Effective temperature estimators
+ESTIMATOR_WEIGHTED = "weighted"
+ESTIMATOR_KALMAN = "kalman"
+
 # Attributes / Internal constants
 ATTR_REASON = "reason"
 ATTR_CONFIDENCE = "confidence"
 ATTR_PLAN = "plan"
+
+# Temperature input filtering
+FILTER_WINDOW_SIZE = 7  # Samples kept per sensor
+FILTER_HAMPEL_THRESHOLD = 3.0  # Rejection threshold in scaled MADs
+FILTER_MIN_SIGMA = 0.2  # °C, floor for the MAD estimate on quantised sensors
+FILTER_MAX_RATE = 1.0  # °C/min
+FILTER_VALID_RANGE = (-30.0, 60.0)  # °C
+TWA_CAPACITY = 64  # Samples kept per sensor for time-weighted averaging
+
+# Kalman estimator tuning
+KALMAN_PROCESS_NOISE = 0.002  # °C² per minute of unmodelled drift
+KALMAN_INITIAL_SENSOR_NOISE = 0.25  # °C², i.e. 0.5 °C standard deviation
+KALMAN_MIN_SENSOR_NOISE = 0.01  # °C²
+KALMAN_NOISE_LEARNING_RATE = 0.05
+KALMAN_CONFIDENCE_SPAN = 1.0  # °C of uncertainty that maps to 0% confidence
+
+# Plan confidence
+CONFIDENCE_SAMPLE_PRIOR = 5  # Learned runs at which the sample factor reaches 50%
+CONFIDENCE_RATE_SPREAD = 0.02  # °C/min rate standard deviation that halves the spread factor
+CONFIDENCE_SETPOINT_SPREAD = 1.0  # °C learned setpoint standard deviation that halves the preference factor
+CONFIDENCE_LOW = 40  # % below which the planner acts conservatively
+CONFIDENCE_DEADBAND_FACTOR = 2.0  # Deadband multiplier while confidence is low
+
+# Runtime accounting
+RUNTIME_WINDOW = 24  # Hours of on/off history kept per climate entity
+RUNTIME_MAX_RUNS = 512  # Hard cap on runs kept in that window
+RUNTIME_RATE_WINDOW = 3  # Hours over which cycles/hour and average run are measured
+RUNTIME_STORAGE_VERSION = 1
+RUNTIME_SAVE_DELAY = 60  # Seconds; runtime changes are batched into one write
+
+# Shadow planners
+SHADOW_CPU_BUDGET = 0.02  # Seconds of CPU per cycle for all shadow planners together
+SHADOW_CYCLE_BUDGET = 0.1  # Seconds; shadow planners are skipped on slower cycles
+SHADOW_HISTORY = 720  # Shadow records kept per entry
+
+# Actuation circuit breaker
+ACTUATION_TIMEOUT = 15  # Seconds allowed for the climate service calls of one cycle
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failed cycles that open the breaker
+BREAKER_BASE_BACKOFF = 60  # Seconds open after the first trip, doubled per failed probe
+BREAKER_MAX_BACKOFF = 1800  # Seconds
+
+# Forecast free heating/cooling windows
+FORECAST_STEP = 5  # Minutes between scored points of the forecast horizon
+FORECAST_DEFER_LEAD = 40  # Minutes a run may be deferred for an upcoming free window
+FORECAST_DEFER_MAX_OVERSHOOT = 1.0  # °C beyond the deadband where deferring stops
+FORECAST_PREEMPT_LEAD = 60  # Minutes ahead checked for a worsening compressor rate
+FORECAST_PREEMPT_DROP = 0.25  # Rate loss at that point that starts a run early
+FORECAST_REFRESH_INTERVAL = 30  # Minutes between hourly forecast fetches
+
+# Manual override detection
+OWN_CONTEXT_HISTORY = 32  # Service-call contexts remembered per entry
+PREFERENCE_MIN_SAMPLES = 3  # Manual setpoints in a context before the planner follows them
+
+# Decision history
+HISTORY_SIZE = 720  # Plan records kept per entry (24h at the default interval)
+
+# Context-segmented thermal model
+THERMAL_BAND_MIN = -15.0  # °C, lower edge of the first outdoor band
+THERMAL_BAND_WIDTH = 5.0  # °C per outdoor band
+THERMAL_BAND_COUNT = 10  # Bands beyond either end are clamped to the edge
+THERMAL_TIME_BUCKETS = 6  # Four-hour time-of-day buckets
+THERMAL_MIN_CELL_SAMPLES = 3  # Below this a cell borrows from its neighbours
+
+# Thermal episode log
+EPISODE_LOG_MAX_RECORDS = 50000  # Records per file before rotation (~1.8 MB)
+EPISODE_MIN_RUNTIME = 5  # Minutes; shorter runs are not learned from
+
+# Setup
+CARD_URL_PATH = "/powerstat"  # Static path serving www/powerstat-card
+CARD_FILENAME = "powerstat-card.js"
+SETUP_TIME_BUDGET = 2.0  # Seconds per entry before a warning is logged
+
+# Profiling service
+SERVICE_PROFILE = "profile"
+PROFILE_DEFAULT_CYCLES = 5  # Coordinator cycles captured when none are given
+PROFILE_MAX_DURATION = 600  # Seconds; a session never runs longer
+PROFILE_TOP_ENTRIES = 30  # Functions and allocation sites listed in the report
+PROFILE_TRACE_FRAMES = 10  # Stack frames kept per allocation by tracemalloc
+
+# Keys in hass.data[DOMAIN] that are shared across config entries
+DATA_ENVIRONMENT = "environment"
+DATA_PROFILE_SESSION = "profile_session"
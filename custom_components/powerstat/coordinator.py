@@ -1,15 +1,21 @@
 """DataUpdateCoordinator for PowerStat."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, Context, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from homeassistant.const import STATE_ON
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
 
 from .const import (
     DOMAIN,
@@ -19,21 +25,99 @@ from .const import (
     CONF_PRESENCE_SENSORS,
     CONF_AWAY_ENTITY,
     CONF_SLEEP_ENTITY,
+    CONF_LOAD_SHED_ENTITY,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_ESTIMATOR,
+    CONF_PRESENCE_WEIGHT_BOOST,
+    CONF_AVERAGING_WINDOW,
+    CONF_MANUAL_HOLD_DURATION,
+    CONF_OVERRIDE_WINDOW,
+    CONF_SHADOW_PLANNERS,
+    CONF_WEATHER_ENTITY,
     DEFAULT_DECISION_INTERVAL,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_ESTIMATOR,
+    DEFAULT_PRESENCE_WEIGHT_BOOST,
+    DEFAULT_AVERAGING_WINDOW,
+    DEFAULT_MANUAL_HOLD_DURATION,
+    DEFAULT_OVERRIDE_WINDOW,
+    ACTUATION_TIMEOUT,
+    RUNTIME_SAVE_DELAY,
+    RUNTIME_STORAGE_VERSION,
+    ESTIMATOR_KALMAN,
+    OWN_CONTEXT_HISTORY,
 )
+from .engine.areas import AreaIndex
+from .engine.breaker import CircuitBreaker
+from .engine.confidence import assess_confidence
+from .engine.environment import EnvironmentMonitor, get_environment_service
+from .engine.filters import STATUS_OK, SensorFilterBank
 from .engine.planner import PowerStatPlanner
 from .engine.rules import PowerStatRules
+from .engine.runtime import RuntimeAccountant
+from .history import DecisionHistory
+from .models.episodes import EpisodeLog, EpisodeTracker
+from .models.learning import PreferenceModel
+from .models.thermal import ThermalModel
+
+if TYPE_CHECKING:
+    from .engine.estimator import KalmanEstimator
+    from .engine.forecast import ForecastGrid, ForecastScorer
+    from .engine.shadow import ShadowRunner
 
 _LOGGER = logging.getLogger(__name__)
 
+# hvac_action values during which the compressor (or burner) runs
+RUNNING_ACTIONS = ("heating", "cooling", "drying", "defrosting")
+
 class PowerStatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching data from sensors and triggering the planner."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize."""
         self.entry = entry
-        interval = entry.data.get(CONF_DECISION_INTERVAL, DEFAULT_DECISION_INTERVAL)
-        self.rules = PowerStatRules(hass, entry.data)
+        # Options from the options flow override the initial setup data
+        self.config: dict[str, Any] = {**entry.data, **entry.options}
+        interval = self.config.get(CONF_DECISION_INTERVAL, DEFAULT_DECISION_INTERVAL)
+        self.rules = PowerStatRules(hass, self.config)
+        self.environment = get_environment_service(hass)
+        self.env_monitor = EnvironmentMonitor(hass, self.config, self.environment)
+        self.area_index = AreaIndex(
+            hass,
+            self.config.get(CONF_TEMP_SENSORS, []),
+            self.config.get(CONF_PRESENCE_SENSORS, []),
+        )
+        self.sensor_filters = SensorFilterBank(
+            timedelta(minutes=self.config.get(CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT)),
+            timedelta(minutes=self.config.get(CONF_AVERAGING_WINDOW, DEFAULT_AVERAGING_WINDOW)),
+        )
+        self.thermal_model = ThermalModel()
+        self.history = DecisionHistory()
+        self.preference_model = PreferenceModel()
+        self.manual_hold_until: datetime | None = None
+        # Contexts of our own service calls, to tell them apart from people
+        self._own_contexts: deque[str] = deque(maxlen=OWN_CONTEXT_HISTORY)
+        self._last_command: tuple[datetime, str | None, float | None] | None = None
+        self.episodes = EpisodeTracker()
+        self.runtime = RuntimeAccountant()
+        self._runtime_store: Store[dict[str, Any]] = Store(
+            hass, RUNTIME_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.runtime"
+        )
+        self.breaker = CircuitBreaker()
+        # numpy-backed helpers are only loaded once they are needed; the
+        # forecast scorer by async_load_forecast_scorer, off the event loop
+        self.forecast_scorer: ForecastScorer | None = None
+        self.shadow: ShadowRunner | None = None
+        if self.config.get(CONF_SHADOW_PLANNERS):
+            self.shadow = self._create_shadow(hass, self.config)
+        self.episode_log = EpisodeLog(
+            hass.config.path(".storage", f"{DOMAIN}.{entry.entry_id}.episodes")
+        )
+        self.estimator: KalmanEstimator | None = None
+        if self.config.get(CONF_ESTIMATOR, DEFAULT_ESTIMATOR) == ESTIMATOR_KALMAN:
+            self.estimator = self._create_estimator()
+        self._temp_unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._environment_unsub: CALLBACK_TYPE | None = None
         
         super().__init__(
             hass,
@@ -42,66 +126,492 @@ class PowerStatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=interval),
         )
 
+    def _create_estimator(self) -> KalmanEstimator:
+        """Build the Kalman estimator, importing it only when enabled."""
+        from .engine.estimator import KalmanEstimator
+
+        return KalmanEstimator(
+            self.thermal_model, self.sensor_filters.stale_after.total_seconds()
+        )
+
+    @staticmethod
+    def _create_shadow(
+        hass: HomeAssistant, config: dict[str, Any], previous: ShadowRunner | None = None
+    ) -> ShadowRunner:
+        """Build the shadow runner, importing it only when variants are configured."""
+        from .engine.shadow import ShadowRunner
+
+        return ShadowRunner(hass, config, previous)
+
+    @callback
+    def async_setup_listeners(self) -> None:
+        """Subscribe to shared services; released when the entry unloads."""
+        self._environment_unsub = self.environment.async_subscribe(
+            self.config, self._async_environment_updated
+        )
+        self.entry.async_on_unload(self._async_remove_listeners)
+        self.entry.async_on_unload(self.area_index.async_setup())
+        self._async_sync_temp_sensors()
+
+        self._observe_runtime(self.hass.states.get(self.config.get(CONF_CLIMATE_ENTITY)))
+        self.entry.async_on_unload(
+            async_track_state_change_event(
+                self.hass, self.config.get(CONF_CLIMATE_ENTITY), self._async_climate_changed
+            )
+        )
+
+    @callback
+    def _async_remove_listeners(self) -> None:
+        """Release subscriptions that can change on reconfiguration."""
+        if self._environment_unsub:
+            self._environment_unsub()
+            self._environment_unsub = None
+        for unsub in self._temp_unsubs.values():
+            unsub()
+        self._temp_unsubs.clear()
+
+    @callback
+    def _async_sync_temp_sensors(self) -> None:
+        """Subscribe to added temperature sensors and drop removed ones."""
+        wanted = set(self.config.get(CONF_TEMP_SENSORS, []))
+
+        for entity_id in set(self._temp_unsubs) - wanted:
+            self._temp_unsubs.pop(entity_id)()
+            self.sensor_filters.remove(entity_id)
+            if self.estimator is not None:
+                self.estimator.sensor_noise.pop(entity_id, None)
+
+        # Feed every temperature report through the filters, not just the
+        # value that happens to be current when a cycle fires.
+        for entity_id in wanted - set(self._temp_unsubs):
+            self._observe_temp_sensor(entity_id, self.hass.states.get(entity_id))
+            self._temp_unsubs[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._async_temp_sensor_changed
+            )
+
+    @callback
+    def async_apply_config(self) -> None:
+        """Apply changed options in place, keeping models and timers warm."""
+        old_config = self.config
+        config = {**self.entry.data, **self.entry.options}
+        if config == old_config:
+            return
+
+        # 1. Swap the settings that are read once per cycle
+        self.config = config
+        self.rules = PowerStatRules(self.hass, config)
+        self.shadow = (
+            self._create_shadow(self.hass, config, self.shadow)
+            if config.get(CONF_SHADOW_PLANNERS)
+            else None
+        )
+        self.env_monitor.config = config
+        self.update_interval = timedelta(
+            seconds=config.get(CONF_DECISION_INTERVAL, DEFAULT_DECISION_INTERVAL)
+        )
+        self.sensor_filters.reconfigure(
+            timedelta(minutes=config.get(CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT)),
+            timedelta(minutes=config.get(CONF_AVERAGING_WINDOW, DEFAULT_AVERAGING_WINDOW)),
+        )
+        use_kalman = config.get(CONF_ESTIMATOR, DEFAULT_ESTIMATOR) == ESTIMATOR_KALMAN
+        if use_kalman and self.estimator is None:
+            self.estimator = self._create_estimator()
+        elif use_kalman:
+            self.estimator.stale_after = self.sensor_filters.stale_after.total_seconds()
+        elif not use_kalman:
+            self.estimator = None
+
+        # 2. Only touch subscriptions whose entities changed
+        self._async_sync_temp_sensors()
+        if (
+            old_config.get(CONF_TEMP_SENSORS) != config.get(CONF_TEMP_SENSORS)
+            or old_config.get(CONF_PRESENCE_SENSORS) != config.get(CONF_PRESENCE_SENSORS)
+        ):
+            self.area_index.temp_sensors = list(config.get(CONF_TEMP_SENSORS, []))
+            self.area_index.presence_sensors = list(config.get(CONF_PRESENCE_SENSORS, []))
+            self.area_index.async_rebuild()
+        if config.get(CONF_WEATHER_ENTITY) and self.forecast_scorer is None:
+            self.hass.async_create_task(self.async_load_forecast_scorer())
+        if self.environment.source_key(old_config) != self.environment.source_key(config):
+            # Take the new source before releasing the old one, so a last
+            # subscriber doesn't tear down the shared service in between
+            old_unsub = self._environment_unsub
+            self._environment_unsub = self.environment.async_subscribe(
+                config, self._async_environment_updated
+            )
+            if old_unsub:
+                old_unsub()
+
+        _LOGGER.debug("Applied new options for %s", self.entry.title)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_climate_changed(self, event: Event) -> None:
+        """Detect a person changing the thermostat and start a manual hold."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if self._observe_runtime(new_state) and self.data:
+            self.data["runtime"] = self._runtime_stats()
+            self.async_update_listeners()
+        if not old_state or not new_state:
+            return
+        if {old_state.state, new_state.state} & {STATE_UNAVAILABLE, STATE_UNKNOWN}:
+            return
+
+        setpoint = new_state.attributes.get("temperature")
+        if (
+            old_state.state == new_state.state
+            and old_state.attributes.get("temperature") == setpoint
+        ):
+            return
+
+        # 1. Changes made by our own service calls carry our context
+        context = event.context
+        if context.id in self._own_contexts or context.parent_id in self._own_contexts:
+            return
+
+        # 2. Cloud integrations often echo our command later under a new context
+        if self._is_command_echo(new_state.state, setpoint):
+            return
+
+        now = dt_util.utcnow()
+        hold_minutes = self.config.get(CONF_MANUAL_HOLD_DURATION, DEFAULT_MANUAL_HOLD_DURATION)
+        self.manual_hold_until = now + timedelta(minutes=hold_minutes)
+        _LOGGER.info(
+            "Manual change on %s (%s, %s); holding for %s minutes",
+            new_state.entity_id,
+            new_state.state,
+            setpoint,
+            hold_minutes,
+        )
+
+        # The manual setpoint is a direct preference signal
+        if new_state.state in ("heat", "cool") and setpoint is not None and self.data:
+            snapshot = self.data["snapshot"]
+            self.preference_model.update_preference(
+                self._preference_context(
+                    snapshot.get("is_away", False),
+                    snapshot.get("is_sleep", False),
+                    snapshot.get("presence", {}),
+                ),
+                new_state.state,
+                float(setpoint),
+            )
+
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _preference_context(
+        self, is_away: bool, is_sleep: bool, presence: dict[str, bool]
+    ) -> tuple:
+        """Return the preference model context for the current time and mode."""
+        mode = "home"
+        if is_away:
+            mode = "away"
+        elif is_sleep:
+            mode = "sleep"
+        return self.preference_model.get_context(dt_util.now(), mode, any(presence.values()))
+
+    def _observe_runtime(self, state: State | None) -> bool:
+        """Feed the climate's running state to the runtime accountant.
+
+        Uses hvac_action, so a thermostat idling in heat mode isn't counted
+        as running; the state arrives with the attribute change, so
+        last_updated is the transition time. Entities without hvac_action
+        fall back to the HVAC mode and last_changed, which only moves when
+        the mode itself changes. Returns True if the running state changed.
+        """
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return False
+        action = state.attributes.get("hvac_action")
+        if action is not None:
+            running = action in RUNNING_ACTIONS
+            changed_at = state.last_updated
+        else:
+            running = state.state != "off"
+            changed_at = state.last_changed
+        if running == self.runtime.running:
+            return False
+        self.runtime.observe(running, changed_at.timestamp())
+        self._runtime_store.async_delay_save(self.runtime.as_dict, RUNTIME_SAVE_DELAY)
+        return True
+
+    async def async_load_runtime(self) -> None:
+        """Restore the runtime accountant; must run before async_setup_listeners."""
+        if data := await self._runtime_store.async_load():
+            self.runtime.restore(data, dt_util.utcnow().timestamp())
+
+    async def async_save_runtime(self) -> None:
+        """Write the runtime accountant now, replacing any delayed save.
+
+        Called on unload, so a pending write can't recreate the file after
+        async_remove_entry has deleted it.
+        """
+        await self._runtime_store.async_save(self.runtime.as_dict())
+
+    def _runtime_stats(self) -> dict[str, Any]:
+        """Return the runtime figures published by the sensors."""
+        return self.runtime.stats(
+            dt_util.utcnow().timestamp(), dt_util.start_of_local_day().timestamp()
+        )
+
+    def _is_command_echo(self, hvac_mode: str, setpoint: Any) -> bool:
+        """Return True if a state matches a command we sent within the override window."""
+        if self._last_command is None:
+            return False
+
+        sent_at, sent_mode, sent_temp = self._last_command
+        window = timedelta(
+            minutes=self.config.get(CONF_OVERRIDE_WINDOW, DEFAULT_OVERRIDE_WINDOW)
+        )
+        if dt_util.utcnow() - sent_at > window:
+            return False
+
+        return (sent_mode is None or hvac_mode == sent_mode) and (
+            sent_temp is None or setpoint == sent_temp
+        )
+
+    @callback
+    def _async_temp_sensor_changed(self, event: Event) -> None:
+        """Run a temperature report through its sensor filter."""
+        self._observe_temp_sensor(event.data["entity_id"], event.data.get("new_state"))
+
+    def _observe_temp_sensor(self, entity_id: str, state: State | None) -> None:
+        """Filter a temperature report and fold accepted values into the estimator."""
+        value = self.sensor_filters.observe(entity_id, state)
+        if self.estimator is None:
+            return
+        if value is None:
+            # An unchanged reading still shows the sensor is alive
+            sensor_filter = self.sensor_filters.filters[entity_id]
+            if sensor_filter.status == STATUS_OK and sensor_filter.last_reported is not None:
+                self.estimator.report(sensor_filter.last_reported.timestamp())
+            return
+
+        weight = 1.0
+        for presence_id in self.area_index.presence_for(entity_id):
+            presence_state = self.hass.states.get(presence_id)
+            if presence_state and presence_state.state == STATE_ON:
+                weight = self.config.get(CONF_PRESENCE_WEIGHT_BOOST, DEFAULT_PRESENCE_WEIGHT_BOOST)
+                break
+
+        self.estimator.update(
+            entity_id, value, state.last_updated.timestamp(), self._current_hvac_mode(), weight
+        )
+
+    def _current_hvac_mode(self) -> str:
+        """Return the climate entity's current HVAC mode."""
+        climate_state = self.hass.states.get(self.config.get(CONF_CLIMATE_ENTITY))
+        return climate_state.state if climate_state else "off"
+
+    async def async_load_episodes(self) -> None:
+        """Warm the thermal model from the episode log.
+
+        Must run before async_setup_listeners: the refit happens in the
+        executor, together with the numpy import it needs, and nothing may
+        read the model meanwhile.
+        """
+
+        def load() -> int:
+            episodes = self.episode_log.read()
+            self.thermal_model.refit(episodes)
+            return len(episodes)
+
+        count = await self.hass.async_add_executor_job(load)
+        _LOGGER.debug("Refit thermal model from %s episodes", count)
+
+    @callback
+    def _async_environment_updated(self, conditions: dict[str, Any]) -> None:
+        """Push fresh outdoor conditions to sensors without a planning cycle."""
+        if not self.data:
+            return
+
+        if self.estimator is not None:
+            self.estimator.outdoor_temp = conditions.get("outdoor_temp")
+
+        env = self.data["snapshot"]["environment"]
+        env.update(
+            outdoor_temp=conditions.get("outdoor_temp"),
+            outdoor_humidity=conditions.get("outdoor_humidity"),
+            forecast=conditions.get("forecast", {}),
+            has_outdoor_data=conditions.get("outdoor_temp") is not None,
+            has_forecast=conditions.get("forecast", {}).get("forecast_available", False),
+        )
+        self.async_update_listeners()
+
     async def _async_update_data(self) -> dict[str, Any]:
         """Update data via library."""
+        started = time.perf_counter()
         try:
             # 1. Gather state snapshot
             snapshot = self._gather_state_snapshot()
             
             # 2. Run Planner
-            planner = PowerStatPlanner(self.hass, self.entry, snapshot)
+            planner = PowerStatPlanner(self.hass, self.config, snapshot)
             proposed_plan = await planner.async_calculate_plan()
             
-            # 3. Validate with Rules
-            final_plan = self.rules.validate_action(snapshot["climate"], proposed_plan)
+            # 3. Validate with the rule pipeline
+            final_plan = self.rules.validate_action(snapshot, proposed_plan)
             
             _LOGGER.debug("Planning cycle complete: %s", final_plan)
+            now = dt_util.utcnow().timestamp()
+            self.history.async_record(now, final_plan)
+            if final_plan.get("rule") in ("min_on_time", "min_off_time"):
+                self.runtime.record_prevented(now)
+                self._runtime_store.async_delay_save(self.runtime.as_dict, RUNTIME_SAVE_DELAY)
+
+            # Learn from the run that just ended, if any
+            episode = self.episodes.observe(
+                now,
+                snapshot["climate"]["hvac_mode"],
+                final_plan.get("effective_temp"),
+                snapshot["environment"].get("outdoor_temp"),
+            )
+            if episode:
+                self.thermal_model.update(
+                    episode.mode,
+                    episode.indoor_end - episode.indoor_start,
+                    episode.runtime,
+                    episode.outdoor_avg,
+                    dt_util.as_local(dt_util.utc_from_timestamp(episode.start)),
+                )
+                # A log that can't be written must not stop control
+                try:
+                    await self.hass.async_add_executor_job(self.episode_log.append, episode)
+                except OSError as err:
+                    _LOGGER.warning("Failed to log thermal episode: %s", err)
+
+            # Shadow planners see the same snapshot; their plans are only recorded
+            if self.shadow is not None:
+                await self.shadow.async_run(
+                    now, snapshot, proposed_plan, final_plan, time.perf_counter() - started
+                )
             
-            # 4. Actuate if necessary
-            await self._async_actuate(snapshot["climate"], final_plan)
+            # 4. Actuate if necessary, unless the breaker is open
+            await self._async_actuate_guarded(now, snapshot["climate"], final_plan)
             
             return {
                 "snapshot": snapshot,
                 "plan": final_plan,
+                "runtime": self._runtime_stats(),
+                "breaker": self.breaker.as_dict(),
             }
         except Exception as err:
             _LOGGER.exception("Planning cycle failed")
             raise UpdateFailed(f"Error communicating with sensors: {err}") from err
 
-    async def _async_actuate(self, current_climate: dict[str, Any], plan: dict[str, Any]) -> None:
-        """Send commands to the climate entity if they differ from current state."""
-        climate_entity = self.entry.data.get(CONF_CLIMATE_ENTITY)
+    async def _async_actuate_guarded(
+        self, now: float, current_climate: dict[str, Any], plan: dict[str, Any]
+    ) -> None:
+        """Actuate through the circuit breaker; failures never fail the cycle."""
+        if not self.breaker.allow(now):
+            return
+
+        climate_entity = self.config.get(CONF_CLIMATE_ENTITY)
+        if not current_climate.get("available"):
+            self.breaker.record_failure(now, f"{climate_entity} unavailable")
+            return
+
+        try:
+            async with asyncio.timeout(ACTUATION_TIMEOUT):
+                sent = await self._async_actuate(current_climate, plan)
+        except TimeoutError:
+            self.breaker.record_failure(now, f"Timed out after {ACTUATION_TIMEOUT}s")
+        except Exception as err:  # Integrations raise all kinds of errors
+            self.breaker.record_failure(now, str(err) or type(err).__name__)
+        else:
+            # Only a command that went through proves the entity works; a
+            # no-op cycle leaves the failure count (and a half-open probe) as is
+            if sent:
+                self.breaker.record_success()
+            return
+
+        _LOGGER.warning(
+            "Commanding %s failed (%s); breaker %s",
+            climate_entity,
+            self.breaker.last_error,
+            self.breaker.state,
+        )
+
+    async def _async_actuate(self, current_climate: dict[str, Any], plan: dict[str, Any]) -> bool:
+        """Send commands to the climate entity if they differ from current state.
+
+        Returns True if any command was sent.
+        """
+        climate_entity = self.config.get(CONF_CLIMATE_ENTITY)
         
         target_mode = plan.get("hvac_mode")
         target_temp = plan.get("target_temp")
 
+        change_mode = bool(target_mode) and target_mode != current_climate.get("hvac_mode")
+        change_temp = (
+            bool(target_temp)
+            and target_temp != current_climate.get("target_temp")
+            and target_mode != "off"
+        )
+        if not change_mode and not change_temp:
+            return False
+
+        # Tag our calls so the resulting state changes aren't seen as manual
+        context = Context()
+        self._own_contexts.append(context.id)
+        self._last_command = (
+            dt_util.utcnow(),
+            target_mode if change_mode else None,
+            target_temp if change_temp else None,
+        )
+
         # 1. Update HVAC Mode
-        if target_mode and target_mode != current_climate.get("hvac_mode"):
+        if change_mode:
             _LOGGER.info("Changing %s mode to %s", climate_entity, target_mode)
             await self.hass.services.async_call(
                 "climate",
                 "set_hvac_mode",
                 {"entity_id": climate_entity, "hvac_mode": target_mode},
                 blocking=True,
+                context=context,
             )
 
         # 2. Update Temperature
-        if target_temp and target_temp != current_climate.get("target_temp") and target_mode != "off":
+        if change_temp:
             _LOGGER.info("Changing %s setpoint to %s", climate_entity, target_temp)
             await self.hass.services.async_call(
                 "climate",
                 "set_temperature",
                 {"entity_id": climate_entity, "temperature": target_temp},
                 blocking=True,
+                context=context,
             )
 
+        return True
+
+    @staticmethod
+    def _create_forecast_scorer() -> ForecastScorer:
+        """Build the forecast scorer; the import pulls in numpy."""
+        from .engine.forecast import ForecastScorer
+
+        return ForecastScorer()
+
+    async def async_load_forecast_scorer(self) -> None:
+        """Load the forecast scorer in the executor if a weather entity is set."""
+        if self.forecast_scorer is None and self.config.get(CONF_WEATHER_ENTITY):
+            self.forecast_scorer = await self.hass.async_add_import_executor_job(
+                self._create_forecast_scorer
+            )
+
+    def _score_forecast(self) -> ForecastGrid | None:
+        """Score the forecast, once the scorer has been loaded."""
+        points = self.env_monitor.conditions.get("forecast_points", ())
+        if len(points) < 2 or self.forecast_scorer is None:
+            return None
+        return self.forecast_scorer.score(points, self.thermal_model)
+
     def _gather_state_snapshot(self) -> dict[str, Any]:
         """Gather current state of all configured entities."""
-        climate_entity = self.entry.data.get(CONF_CLIMATE_ENTITY)
-        temp_sensors = self.entry.data.get(CONF_TEMP_SENSORS, [])
-        presence_sensors = self.entry.data.get(CONF_PRESENCE_SENSORS, [])
-        away_entities = self.entry.data.get(CONF_AWAY_ENTITY, [])
-        sleep_entities = self.entry.data.get(CONF_SLEEP_ENTITY, [])
+        climate_entity = self.config.get(CONF_CLIMATE_ENTITY)
+        temp_sensors = self.config.get(CONF_TEMP_SENSORS, [])
+        presence_sensors = self.config.get(CONF_PRESENCE_SENSORS, [])
+        away_entities = self.config.get(CONF_AWAY_ENTITY, [])
+        sleep_entities = self.config.get(CONF_SLEEP_ENTITY, [])
 
         # Climate State
         climate_state = self.hass.states.get(climate_entity)
@@ -109,14 +619,43 @@ class PowerStatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "hvac_mode": climate_state.state if climate_state else "off",
             "target_temp": float(climate_state.attributes.get("temperature", 0)) if climate_state else 0.0,
             "last_changed": climate_state.last_changed if climate_state else None,
+            # Whether the compressor runs, and since when, from the accountant
+            "running": self.runtime.running,
+            "state_since": (
+                dt_util.utc_from_timestamp(self.runtime.since)
+                if self.runtime.since is not None
+                else None
+            ),
+            "available": (
+                climate_state is not None
+                and climate_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+            ),
+            "manual_hold_until": self.manual_hold_until,
+            "last_command_at": self._last_command[0] if self._last_command else None,
+        }
+
+        # Environmental Data (shared outdoor conditions, forecast, windows)
+        env_snapshot = self.env_monitor.build_environment_snapshot()
+        outdoor_temp = env_snapshot["outdoor_temp"]
+
+        # Thermal rates expected in the current conditions
+        now = dt_util.utcnow()
+        local_now = dt_util.as_local(now)
+        thermal = {
+            "heat_rate": self.thermal_model.predict_rate("heat", outdoor_temp, local_now),
+            "cool_rate": self.thermal_model.predict_rate("cool", outdoor_temp, local_now),
         }
 
-        # Sensors
-        sensor_data = {}
+        # Sensors (filtered; re-observing refreshes staleness for quiet sensors)
+        if self.estimator is not None:
+            self.estimator.outdoor_temp = outdoor_temp
         for entity_id in temp_sensors:
-            state = self.hass.states.get(entity_id)
-            if state:
-                sensor_data[entity_id] = state.state
+            self._observe_temp_sensor(entity_id, self.hass.states.get(entity_id))
+        filtered = self.sensor_filters.snapshot(now)
+        sensor_data = filtered["values"]
+        estimate = None
+        if self.estimator is not None:
+            estimate = self.estimator.estimate(now.timestamp(), climate_data["hvac_mode"])
 
         # Presence
         presence_data = {}
@@ -152,17 +691,41 @@ class PowerStatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 is_sleep = True
                 break
 
-        # Environmental Data (outdoor conditions, forecast, windows)
-        from .engine.environment import EnvironmentMonitor
-        
-        env_monitor = EnvironmentMonitor(self.hass, self.entry, {})
-        env_snapshot = env_monitor.build_environment_snapshot()
+        # Load shedding request
+        load_shed_entity = self.config.get(CONF_LOAD_SHED_ENTITY)
+        load_shed_state = self.hass.states.get(load_shed_entity) if load_shed_entity else None
+        load_shed = bool(load_shed_state and load_shed_state.state == STATE_ON)
+
+        # Setpoints learned from manual changes in this context
+        preference_context = self._preference_context(is_away, is_sleep, presence_data)
+        preference = dict(self.preference_model.get_preference(preference_context))
+
+        confidence = assess_confidence(
+            self.thermal_model,
+            self.preference_model,
+            preference_context,
+            climate_data["hvac_mode"],
+            outdoor_temp,
+            local_now,
+            len(temp_sensors),
+            len(sensor_data.keys() - filtered["rejected"].keys()),
+            estimate,
+        )
 
         return {
             "climate": climate_data,
             "sensors": sensor_data,
+            "rejected_sensors": filtered["rejected"],
+            "stale_sensors": filtered["stale"],
+            "estimate": estimate,
+            "confidence": confidence,
             "presence": presence_data,
+            "presence_map": self.area_index.mapping,
             "is_away": is_away,
             "is_sleep": is_sleep,
+            "load_shed": load_shed,
+            "preference": preference,
             "environment": env_snapshot,
+            "thermal": thermal,
+            "forecast_grid": self._score_forecast(),
         }
@@ -0,0 +1,103 @@
+"""Area index linking temperature sensors to presence sensors for PowerStat."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+_LOGGER = logging.getLogger(__name__)
+
+class AreaIndex:
+    """Map each temperature sensor to the presence sensors in its area.
+
+    The index is built once from the entity and device registries and only
+    rebuilt when one of them reports a change to a watched entity or device,
+    so presence weighting is a single dict lookup per sensor.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        temp_sensors: Iterable[str],
+        presence_sensors: Iterable[str],
+    ) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self.temp_sensors = list(temp_sensors)
+        self.presence_sensors = list(presence_sensors)
+        self.mapping: dict[str, tuple[str, ...]] = {}
+        self._devices: set[str] = set()
+
+    @callback
+    def async_setup(self) -> CALLBACK_TYPE:
+        """Build the index and listen for registry updates."""
+        self.async_rebuild()
+        unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_registry_updated
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_registry_updated
+            ),
+        ]
+
+        @callback
+        def _async_unsubscribe() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _async_unsubscribe
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Rebuild the sensor -> presence mapping from the registries."""
+        ent_reg = er.async_get(self.hass)
+        dev_reg = dr.async_get(self.hass)
+        self._devices = set()
+
+        def _area_of(entity_id: str) -> str | None:
+            entry = ent_reg.async_get(entity_id)
+            if entry is None:
+                return None
+            if entry.device_id:
+                self._devices.add(entry.device_id)
+            if entry.area_id:
+                return entry.area_id
+            if entry.device_id:
+                device = dev_reg.async_get(entry.device_id)
+                return device.area_id if device else None
+            return None
+
+        presence_by_area: dict[str, list[str]] = {}
+        for entity_id in self.presence_sensors:
+            area_id = _area_of(entity_id)
+            if area_id:
+                presence_by_area.setdefault(area_id, []).append(entity_id)
+
+        mapping: dict[str, tuple[str, ...]] = {}
+        for entity_id in self.temp_sensors:
+            area_id = _area_of(entity_id)
+            if area_id and area_id in presence_by_area:
+                mapping[entity_id] = tuple(presence_by_area[area_id])
+
+        self.mapping = mapping
+        _LOGGER.debug("Rebuilt area index: %s", mapping)
+
+    def presence_for(self, entity_id: str) -> tuple[str, ...]:
+        """Return the presence sensors sharing an area with a sensor."""
+        return self.mapping.get(entity_id, ())
+
+    @callback
+    def _async_entity_registry_updated(self, event: Event) -> None:
+        """Rebuild when a watched entity changes."""
+        entity_id = event.data.get("entity_id")
+        if entity_id in self.temp_sensors or entity_id in self.presence_sensors:
+            self.async_rebuild()
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Rebuild when a device backing a watched entity changes."""
+        if event.data.get("device_id") in self._devices:
+            self.async_rebuild()
@@ -0,0 +1,63 @@
+"""Circuit breaker guarding climate actuation for PowerStat."""
+from __future__ import annotations
+
+from typing import Any
+
+from ..const import BREAKER_BASE_BACKOFF, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_BACKOFF
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Stop sending commands to a climate entity that keeps failing.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens
+    and commands are skipped. Once the backoff has passed it is half-open:
+    the next command is a probe. Success closes it; failure reopens it with
+    the backoff doubled, up to BREAKER_MAX_BACKOFF. Times are Unix seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed breaker."""
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at: float | None = None
+        self.last_error: str | None = None
+
+    def allow(self, now: float) -> bool:
+        """Return True if a command may be sent now."""
+        if self.state == BREAKER_OPEN:
+            if self.retry_at is not None and now < self.retry_at:
+                return False
+            self.state = BREAKER_HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a command went through."""
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = None
+        self.last_error = None
+
+    def record_failure(self, now: float, error: str) -> None:
+        """Count a failed command, opening the breaker when due."""
+        self.failures += 1
+        self.last_error = error
+        if self.state == BREAKER_HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            backoff = min(BREAKER_BASE_BACKOFF * 2**self.trips, BREAKER_MAX_BACKOFF)
+            self.trips += 1
+            self.state = BREAKER_OPEN
+            self.retry_at = now + backoff
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for sensors."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_at": self.retry_at,
+            "last_error": self.last_error,
+        }
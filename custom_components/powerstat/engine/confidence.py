@@ -0,0 +1,89 @@
+"""Plan confidence scoring for PowerStat."""
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any
+
+from ..const import (
+    CONFIDENCE_LOW,
+    CONFIDENCE_RATE_SPREAD,
+    CONFIDENCE_SAMPLE_PRIOR,
+    CONFIDENCE_SETPOINT_SPREAD,
+    KALMAN_CONFIDENCE_SPAN,
+    PREFERENCE_MIN_SAMPLES,
+)
+from ..models.learning import PreferenceModel
+from ..models.thermal import ThermalModel
+
+# Modes whose learned rates a plan relies on; the passive drift is not one
+RUN_MODES = ("heat", "cool")
+
+def assess_confidence(
+    thermal_model: ThermalModel,
+    preference_model: PreferenceModel,
+    preference_context: tuple,
+    hvac_mode: str,
+    outdoor_temp: float | None,
+    when: datetime,
+    sensor_count: int,
+    fresh_count: int,
+    estimate: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Score how far the inputs of a plan can be trusted (0-100).
+
+    Two groups of factors, each between 0 and 1:
+    - data: the share of configured sensors that are fresh and accepted,
+      times the estimator's certainty when the Kalman estimator is enabled.
+    - model: the learned run count and the spread of the observed rates
+      for the running mode, or the better of heat and cool when idle (the
+      house may only ever need one), times the spread of the learned
+      setpoints the planner follows for that mode, if any.
+
+    Bad data scales the score down fully; a weak model at most halves it.
+    With no learned run at all, or none for the running mode, the rates are
+    zero and the score is kept below CONFIDENCE_LOW.
+    """
+    freshness = fresh_count / sensor_count if sensor_count else 0.0
+    certainty = 1.0
+    if estimate:
+        certainty = max(0.0, 1 - estimate["uncertainty"] / KALMAN_CONFIDENCE_SPAN)
+
+    modes = (hvac_mode,) if hvac_mode in RUN_MODES else RUN_MODES
+    factors = []
+    for mode in modes:
+        samples, variance = thermal_model.rate_stats(mode, outdoor_temp, when)
+        spread = None if variance is None else math.sqrt(variance)
+        sample_factor = samples / (samples + CONFIDENCE_SAMPLE_PRIOR)
+        spread_factor = 0.0 if spread is None else 1 / (1 + spread / CONFIDENCE_RATE_SPREAD)
+        factors.append((sample_factor * spread_factor, mode, samples, spread, sample_factor, spread_factor))
+    model, mode, samples, spread, sample_factor, spread_factor = max(factors)
+
+    # Learned setpoints only count once the planner follows them
+    preference = preference_model.get_preference(preference_context)
+    setpoint_spread = None
+    if preference[f"n_{mode}"] >= PREFERENCE_MIN_SAMPLES:
+        variance = preference_model.get_variance(preference_context, mode)
+        if variance is not None:
+            setpoint_spread = math.sqrt(variance)
+    preference_factor = 1.0
+    if setpoint_spread is not None:
+        preference_factor = 1 / (1 + setpoint_spread / CONFIDENCE_SETPOINT_SPREAD)
+
+    data = freshness * certainty
+    score = round(100 * data * (0.5 + 0.5 * model * preference_factor))
+    untrained = not (thermal_model.samples_heat or thermal_model.samples_cool)
+    if untrained or (hvac_mode in RUN_MODES and not samples):
+        score = min(score, CONFIDENCE_LOW - 1)
+    return {
+        "score": score,
+        "freshness": round(freshness, 2),
+        "estimator_certainty": round(certainty, 2),
+        "model_mode": mode,
+        "model_samples": samples,
+        "rate_std": None if spread is None else round(spread, 4),
+        "sample_factor": round(sample_factor, 2),
+        "spread_factor": round(spread_factor, 2),
+        "setpoint_std": None if setpoint_spread is None else round(setpoint_spread, 2),
+        "preference_factor": round(preference_factor, 2),
+    }
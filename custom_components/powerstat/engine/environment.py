@@ -1,119 +1,321 @@
 """Environmental awareness engine for PowerStat."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable, Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.const import STATE_ON, STATE_OPEN
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    DOMAIN,
+    DATA_ENVIRONMENT,
+    CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTDOOR_HUMIDITY_SENSOR,
+    CONF_WEATHER_ENTITY,
+    CONF_WINDOW_SENSORS,
+    CONF_WINDOW_GRACE_PERIOD,
+    CONF_FREE_TEMP_DIFFERENTIAL,
+    DEFAULT_WINDOW_GRACE_PERIOD,
+    DEFAULT_FREE_TEMP_DIFFERENTIAL,
+    FORECAST_REFRESH_INTERVAL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-class EnvironmentMonitor:
-    """Monitor environmental conditions for smart HVAC decisions."""
+# (outdoor temp sensor, outdoor humidity sensor, weather entity)
+SourceKey = tuple[str | None, str | None, str | None]
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, snapshot: dict[str, Any]) -> None:
-        """Initialize the environment monitor."""
+class _SharedSource:
+    """Cached outdoor conditions for one combination of source entities."""
+
+    def __init__(self, key: SourceKey) -> None:
+        """Initialize the source."""
+        self.key = key
+        self.listeners: list[Callable[[dict[str, Any]], None]] = []
+        self.conditions: dict[str, Any] = {}
+        self.forecast: list[dict[str, Any]] = []  # Hourly weather.get_forecasts entries
+        self.unsub: CALLBACK_TYPE | None = None
+        self.unsub_refresh: CALLBACK_TYPE | None = None
+        self.refresh_task: asyncio.Task | None = None
+
+class EnvironmentService:
+    """Domain-level outdoor conditions shared by every PowerStat entry.
+
+    Outdoor readings and the forecast trend are parsed once per source state
+    change and pushed to every subscribed coordinator. Entries that watch the
+    same entities share one cache, so extra entries only cost a dict lookup.
+
+    Weather entities no longer carry the forecast as an attribute, so the
+    hourly forecast is fetched with the weather.get_forecasts service every
+    FORECAST_REFRESH_INTERVAL minutes and whenever the weather entity changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the service."""
         self.hass = hass
-        self.entry = entry
-        self.snapshot = snapshot
-        
-    def get_outdoor_temp(self) -> float | None:
-        """Get outdoor temperature from configured sensor."""
-        from ..const import CONF_OUTDOOR_TEMP_SENSOR
-        
-        outdoor_sensor = self.entry.data.get(CONF_OUTDOOR_TEMP_SENSOR)
-        if not outdoor_sensor:
-            return None
-            
-        state = self.hass.states.get(outdoor_sensor)
-        if not state:
-            return None
-            
+        self._sources: dict[SourceKey, _SharedSource] = {}
+
+    @staticmethod
+    def source_key(config: Mapping[str, Any]) -> SourceKey:
+        """Return the cache key for the environment sources of an entry."""
+        return (
+            config.get(CONF_OUTDOOR_TEMP_SENSOR) or None,
+            config.get(CONF_OUTDOOR_HUMIDITY_SENSOR) or None,
+            config.get(CONF_WEATHER_ENTITY) or None,
+        )
+
+    @callback
+    def async_subscribe(
+        self,
+        config: Mapping[str, Any],
+        listener: Callable[[dict[str, Any]], None],
+    ) -> CALLBACK_TYPE:
+        """Subscribe to condition updates; returns the unsubscribe callback."""
+        key = self.source_key(config)
+        source = self._sources.get(key)
+
+        if source is None:
+            source = _SharedSource(key)
+            source.conditions = self._compute_conditions(key, source.forecast)
+            self._sources[key] = source
+            weather_entity = key[2]
+
+            entity_ids = [entity_id for entity_id in key if entity_id]
+            if entity_ids:
+
+                @callback
+                def _async_source_changed(event: Event) -> None:
+                    """Recompute conditions and fan them out to listeners."""
+                    self._async_publish(source)
+                    if event.data["entity_id"] == weather_entity:
+                        self._async_schedule_refresh(source)
+
+                source.unsub = async_track_state_change_event(
+                    self.hass, entity_ids, _async_source_changed
+                )
+
+            if weather_entity:
+
+                @callback
+                def _async_refresh_due(now: datetime) -> None:
+                    """Fetch the forecast on the refresh interval."""
+                    self._async_schedule_refresh(source)
+
+                source.unsub_refresh = async_track_time_interval(
+                    self.hass, _async_refresh_due, timedelta(minutes=FORECAST_REFRESH_INTERVAL)
+                )
+                self._async_schedule_refresh(source)
+
+        source.listeners.append(listener)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            """Drop the listener and release the source when unused."""
+            source.listeners.remove(listener)
+            if source.listeners:
+                return
+            if source.unsub:
+                source.unsub()
+            if source.unsub_refresh:
+                source.unsub_refresh()
+            if source.refresh_task:
+                source.refresh_task.cancel()
+            self._sources.pop(key, None)
+            if not self._sources:
+                self.hass.data.get(DOMAIN, {}).pop(DATA_ENVIRONMENT, None)
+
+        return _async_unsubscribe
+
+    def get_conditions(self, config: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the cached outdoor conditions for an entry's sources."""
+        key = self.source_key(config)
+        source = self._sources.get(key)
+        if source is None:
+            return self._compute_conditions(key, [])
+        return source.conditions
+
+    @callback
+    def _async_publish(self, source: _SharedSource) -> None:
+        """Recompute a source's conditions and fan them out to listeners."""
+        source.conditions = self._compute_conditions(source.key, source.forecast)
+        for subscriber in list(source.listeners):
+            subscriber(source.conditions)
+
+    @callback
+    def _async_schedule_refresh(self, source: _SharedSource) -> None:
+        """Start a forecast fetch unless one is already running."""
+        if source.refresh_task and not source.refresh_task.done():
+            return
+        source.refresh_task = self.hass.async_create_background_task(
+            self._async_refresh_forecast(source), f"{DOMAIN} forecast {source.key[2]}"
+        )
+
+    async def _async_refresh_forecast(self, source: _SharedSource) -> None:
+        """Fetch the hourly forecast of a source's weather entity."""
+        weather_entity = source.key[2]
         try:
-            return float(state.state)
-        except (ValueError, TypeError):
-            _LOGGER.warning("Invalid outdoor temp state: %s", state.state)
-            return None
-    
-    def get_outdoor_humidity(self) -> float | None:
-        """Get outdoor humidity from configured sensor."""
-        from ..const import CONF_OUTDOOR_HUMIDITY_SENSOR
-        
-        humidity_sensor = self.entry.data.get(CONF_OUTDOOR_HUMIDITY_SENSOR)
-        if not humidity_sensor:
+            response = await self.hass.services.async_call(
+                "weather",
+                "get_forecasts",
+                {"entity_id": weather_entity, "type": "hourly"},
+                blocking=True,
+                return_response=True,
+            )
+        except HomeAssistantError as err:
+            # Not loaded yet, or no hourly forecast; retried on the next change
+            _LOGGER.debug("No hourly forecast from %s: %s", weather_entity, err)
+            forecast = []
+        else:
+            forecast = (response or {}).get(weather_entity, {}).get("forecast") or []
+
+        if self._sources.get(source.key) is not source:
+            return  # Released while fetching
+        source.forecast = forecast
+        self._async_publish(source)
+
+    def _compute_conditions(
+        self, key: SourceKey, forecast: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Read and parse the source entities and the fetched forecast."""
+        outdoor_sensor, humidity_sensor, weather_entity = key
+        outdoor_temp = self._read_float(outdoor_sensor, "outdoor temp")
+        outdoor_humidity = self._read_float(humidity_sensor, "outdoor humidity")
+
+        return {
+            "outdoor_temp": outdoor_temp,
+            "outdoor_humidity": outdoor_humidity,
+            "forecast": self._parse_forecast(weather_entity, forecast, outdoor_temp),
+            "forecast_points": self._forecast_points(forecast),
+        }
+
+    def _read_float(self, entity_id: str | None, label: str) -> float | None:
+        """Read a numeric state."""
+        if not entity_id:
             return None
-            
-        state = self.hass.states.get(humidity_sensor)
+
+        state = self.hass.states.get(entity_id)
         if not state:
             return None
-            
+
         try:
             return float(state.state)
         except (ValueError, TypeError):
-            _LOGGER.warning("Invalid outdoor humidity state: %s", state.state)
+            _LOGGER.warning("Invalid %s state: %s", label, state.state)
             return None
-    
-    def get_forecast_data(self) -> dict[str, Any]:
-        """Parse weather entity forecast for next 4-6 hours."""
-        from ..const import CONF_WEATHER_ENTITY
-        
-        weather_entity = self.entry.data.get(CONF_WEATHER_ENTITY)
-        if not weather_entity:
+
+    @staticmethod
+    def _forecast_points(forecast: list[dict[str, Any]]) -> tuple[tuple[float, float, bool], ...]:
+        """Return (timestamp, temperature, sunny) for every forecast entry."""
+        points = []
+        for item in forecast:
+            item_time = dt_util.parse_datetime(str(item.get("datetime", "")))
+            temperature = item.get("temperature")
+            if item_time is None or temperature is None:
+                continue
+            points.append(
+                (item_time.timestamp(), float(temperature), item.get("condition") == "sunny")
+            )
+
+        return tuple(sorted(points))
+
+    def _parse_forecast(
+        self,
+        weather_entity: str | None,
+        forecast: list[dict[str, Any]],
+        outdoor_temp: float | None,
+    ) -> dict[str, Any]:
+        """Parse the hourly forecast for the next 4-6 hours."""
+        if not weather_entity or not forecast:
             return {}
-            
+
         state = self.hass.states.get(weather_entity)
-        if not state or not state.attributes:
-            return {}
-        
-        forecast = state.attributes.get("forecast", [])
-        if not forecast:
-            return {}
-        
+
         # Extract next 4 hours of data
-        now = datetime.now()
+        now = dt_util.now()
         future_temps = []
-        
+
         for item in forecast[:6]:  # Look at next 6 hourly entries
-            try:
-                item_time = datetime.fromisoformat(item.get("datetime", ""))
-                if item_time > now and item_time <= now + timedelta(hours=4):
-                    future_temps.append(item.get("temperature"))
-            except (ValueError, TypeError):
+            item_time = dt_util.parse_datetime(str(item.get("datetime", "")))
+            temperature = item.get("temperature")
+            if item_time is None or temperature is None:
                 continue
-        
+            if now < item_time <= now + timedelta(hours=4):
+                future_temps.append(temperature)
+
         if not future_temps:
             return {}
-        
+
         # Calculate trend
         temp_in_2h = future_temps[1] if len(future_temps) > 1 else future_temps[0]
         temp_in_4h = future_temps[-1]
-        current_outdoor = self.get_outdoor_temp()
-        
-        if current_outdoor is None:
+        current_outdoor = outdoor_temp
+
+        if current_outdoor is None and state:
             current_outdoor = state.attributes.get("temperature")
-        
+
         # Determine trending direction
         trend = "stable"
-        if temp_in_4h > current_outdoor + 1.5:
-            trend = "warming"
-        elif temp_in_4h < current_outdoor - 1.5:
-            trend = "cooling"
-        
+        if current_outdoor is not None:
+            if temp_in_4h > current_outdoor + 1.5:
+                trend = "warming"
+            elif temp_in_4h < current_outdoor - 1.5:
+                trend = "cooling"
+
         return {
             "temp_in_2h": temp_in_2h,
             "temp_in_4h": temp_in_4h,
             "trending": trend,
             "forecast_available": True,
         }
-    
+
+@callback
+def get_environment_service(hass: HomeAssistant) -> EnvironmentService:
+    """Return the shared environment service, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    service = domain_data.get(DATA_ENVIRONMENT)
+    if service is None:
+        service = domain_data[DATA_ENVIRONMENT] = EnvironmentService(hass)
+    return service
+
+class EnvironmentMonitor:
+    """Monitor environmental conditions for smart HVAC decisions."""
+
+    def __init__(self, hass: HomeAssistant, config: Mapping[str, Any], service: EnvironmentService) -> None:
+        """Initialize the environment monitor."""
+        self.hass = hass
+        self.config = config
+        self.service = service
+
+    @property
+    def conditions(self) -> dict[str, Any]:
+        """Shared outdoor conditions for this entry's sources."""
+        return self.service.get_conditions(self.config)
+
+    def get_outdoor_temp(self) -> float | None:
+        """Get outdoor temperature from the shared cache."""
+        return self.conditions.get("outdoor_temp")
+
+    def get_outdoor_humidity(self) -> float | None:
+        """Get outdoor humidity from the shared cache."""
+        return self.conditions.get("outdoor_humidity")
+
+    def get_forecast_data(self) -> dict[str, Any]:
+        """Get the parsed forecast trend from the shared cache."""
+        return self.conditions.get("forecast", {})
+
     def get_open_windows(self) -> list[str]:
         """Get list of currently open windows/doors."""
-        from ..const import CONF_WINDOW_SENSORS
-        
-        window_sensors = self.entry.data.get(CONF_WINDOW_SENSORS, [])
+        window_sensors = self.config.get(CONF_WINDOW_SENSORS, [])
         open_windows = []
         
         for entity_id in window_sensors:
@@ -125,6 +327,23 @@ class EnvironmentMonitor:
         
         return open_windows
     
+    def get_window_states(self) -> dict[str, dict[str, Any]]:
+        """Get open state, name and seconds in that state for each window/door."""
+        now = dt_util.utcnow()
+        window_states = {}
+
+        for entity_id in self.config.get(CONF_WINDOW_SENSORS, []):
+            state = self.hass.states.get(entity_id)
+            if not state:
+                continue
+            window_states[entity_id] = {
+                "name": state.attributes.get("friendly_name", entity_id.split(".")[-1]),
+                "open": state.state in [STATE_ON, STATE_OPEN],
+                "duration": (now - state.last_changed).total_seconds(),
+            }
+
+        return window_states
+
     def should_pause_for_openings(self, window_states: dict[str, dict]) -> tuple[bool, str | None]:
         """
         Check if HVAC should pause due to open windows/doors.
@@ -132,9 +351,7 @@ class EnvironmentMonitor:
         Returns:
             (should_pause, reason_message)
         """
-        from ..const import CONF_WINDOW_GRACE_PERIOD
-        
-        grace_period = self.entry.data.get(CONF_WINDOW_GRACE_PERIOD, 60)  # Default 60s
+        grace_period = self.config.get(CONF_WINDOW_GRACE_PERIOD, DEFAULT_WINDOW_GRACE_PERIOD)
         
         for entity_id, window_data in window_states.items():
             if window_data.get("state") == "open":
@@ -148,14 +365,12 @@ class EnvironmentMonitor:
     
     def is_free_cooling_available(self, indoor_temp: float, target_temp: float) -> bool:
         """Check if outdoor conditions allow free cooling (opening windows)."""
-        from ..const import CONF_FREE_TEMP_DIFFERENTIAL
-        
         outdoor_temp = self.get_outdoor_temp()
         if outdoor_temp is None:
             return False
         
         # Need cooling (indoor > target) AND outdoor is cooler by threshold
-        differential = self.entry.data.get(CONF_FREE_TEMP_DIFFERENTIAL, 2.0)
+        differential = self.config.get(CONF_FREE_TEMP_DIFFERENTIAL, DEFAULT_FREE_TEMP_DIFFERENTIAL)
         
         if indoor_temp > target_temp and outdoor_temp < indoor_temp - differential:
             return True
@@ -164,14 +379,12 @@ class EnvironmentMonitor:
     
     def is_free_heating_available(self, indoor_temp: float, target_temp: float) -> bool:
         """Check if outdoor conditions allow free heating (solar gain)."""
-        from ..const import CONF_FREE_TEMP_DIFFERENTIAL
-        
         outdoor_temp = self.get_outdoor_temp()
         if outdoor_temp is None:
             return False
         
         # Need heating (indoor < target) AND outdoor is warmer by threshold
-        differential = self.entry.data.get(CONF_FREE_TEMP_DIFFERENTIAL, 2.0)
+        differential = self.config.get(CONF_FREE_TEMP_DIFFERENTIAL, DEFAULT_FREE_TEMP_DIFFERENTIAL)
         
         if indoor_temp < target_temp and outdoor_temp > indoor_temp + differential:
             return True
@@ -180,16 +393,19 @@ class EnvironmentMonitor:
     
     def build_environment_snapshot(self) -> dict[str, Any]:
         """Build comprehensive environment snapshot for decision making."""
-        outdoor_temp = self.get_outdoor_temp()
-        outdoor_humidity = self.get_outdoor_humidity()
-        forecast = self.get_forecast_data()
-        open_windows = self.get_open_windows()
+        conditions = self.conditions
+        outdoor_temp = conditions.get("outdoor_temp")
+        outdoor_humidity = conditions.get("outdoor_humidity")
+        forecast = conditions.get("forecast", {})
+        window_states = self.get_window_states()
+        open_windows = [window["name"] for window in window_states.values() if window["open"]]
         
         return {
             "outdoor_temp": outdoor_temp,
             "outdoor_humidity": outdoor_humidity,
             "forecast": forecast,
             "open_windows": open_windows,
+            "window_states": window_states,
             "has_outdoor_data": outdoor_temp is not None,
             "has_forecast": forecast.get("forecast_available", False),
         }
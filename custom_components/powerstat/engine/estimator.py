@@ -0,0 +1,112 @@
+"""Kalman-filter state estimator for PowerStat."""
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    KALMAN_PROCESS_NOISE,
+    KALMAN_INITIAL_SENSOR_NOISE,
+    KALMAN_MIN_SENSOR_NOISE,
+    KALMAN_NOISE_LEARNING_RATE,
+)
+from ..models.thermal import ThermalModel
+
+_LOGGER = logging.getLogger(__name__)
+
+class KalmanEstimator:
+    """Fuse room sensors with the thermal model prediction.
+
+    The state is a single room temperature. Between measurements it drifts by
+    the learned heat/cool rate for the running HVAC mode; each measurement is
+    a scalar update weighted by that sensor's learned noise variance. Once no
+    sensor has reported for stale_after seconds there is no estimate, rather
+    than a prediction drifting on the model alone.
+    """
+
+    def __init__(self, thermal_model: ThermalModel, stale_after: float) -> None:
+        """Initialize the estimator."""
+        self.thermal_model = thermal_model
+        self.stale_after = stale_after
+        self.temperature: float | None = None
+        self.variance = KALMAN_INITIAL_SENSOR_NOISE
+        self.timestamp: float | None = None
+        self.reported_at: float | None = None  # Last sensor report, changed or not
+        self.sensor_noise: dict[str, float] = {}
+        self.outdoor_temp: float | None = None
+
+    def _predicted(self, timestamp: float, hvac_mode: str) -> tuple[float, float]:
+        """Return the (temperature, variance) propagated to a timestamp."""
+        minutes = max(0.0, (timestamp - self.timestamp) / 60)
+        rate = self.thermal_model.predict_rate(
+            hvac_mode, self.outdoor_temp, dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+        )
+        return (
+            self.temperature + rate * minutes,
+            self.variance + KALMAN_PROCESS_NOISE * minutes,
+        )
+
+    def update(
+        self,
+        entity_id: str,
+        value: float,
+        timestamp: float,
+        hvac_mode: str,
+        weight: float = 1.0,
+    ) -> None:
+        """Fold one sensor measurement into the estimate."""
+        self.report(timestamp)
+        noise = self.sensor_noise.get(entity_id, KALMAN_INITIAL_SENSOR_NOISE)
+
+        if self.temperature is None or self.timestamp is None:
+            self.temperature = value
+            self.variance = noise
+            self.timestamp = timestamp
+            return
+
+        if timestamp > self.timestamp:
+            self.temperature, self.variance = self._predicted(timestamp, hvac_mode)
+            self.timestamp = timestamp
+
+        prior_variance = self.variance
+        innovation = value - self.temperature
+        # Occupied rooms are trusted more by shrinking their effective noise
+        gain = prior_variance / (prior_variance + noise / weight)
+        self.temperature += gain * innovation
+        self.variance = (1 - gain) * prior_variance
+
+        # E[innovation²] = prior variance + sensor noise
+        observed_noise = innovation * innovation - prior_variance
+        self.sensor_noise[entity_id] = max(
+            KALMAN_MIN_SENSOR_NOISE,
+            (1 - KALMAN_NOISE_LEARNING_RATE) * noise
+            + KALMAN_NOISE_LEARNING_RATE * observed_noise,
+        )
+
+    def report(self, timestamp: float) -> None:
+        """Note that a sensor reported, even if its value did not change."""
+        if self.reported_at is None or timestamp > self.reported_at:
+            self.reported_at = timestamp
+
+    def estimate(self, timestamp: float, hvac_mode: str) -> dict[str, Any] | None:
+        """Return the estimate at a timestamp without changing the state.
+
+        Returns None if no sensor has reported within stale_after seconds.
+        """
+        if self.temperature is None or self.reported_at is None:
+            return None
+        if timestamp - self.reported_at > self.stale_after:
+            return None
+
+        temperature, variance = self._predicted(timestamp, hvac_mode)
+        return {
+            "temperature": round(temperature, 2),
+            "uncertainty": round(math.sqrt(variance), 3),
+            "sensor_noise": {
+                entity_id: round(math.sqrt(noise), 3)
+                for entity_id, noise in self.sensor_noise.items()
+            },
+        }
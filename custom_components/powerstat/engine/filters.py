@@ -0,0 +1,243 @@
+"""Streaming input filters for PowerStat temperature sensors."""
+from __future__ import annotations
+
+import logging
+from array import array
+from collections import deque
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import State
+
+from ..const import (
+    FILTER_WINDOW_SIZE,
+    FILTER_HAMPEL_THRESHOLD,
+    FILTER_MIN_SIGMA,
+    FILTER_MAX_RATE,
+    FILTER_VALID_RANGE,
+    TWA_CAPACITY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_OUTLIER = "outlier"
+STATUS_RATE = "rate_limited"
+STATUS_OUT_OF_RANGE = "out_of_range"
+STATUS_UNAVAILABLE = "unavailable"
+STATUS_STALE = "stale"
+
+class TimeWeightedAverage:
+    """Sample-and-hold time-weighted mean over a sliding window.
+
+    Samples live in a fixed-capacity timestamp/value ring and the integral of
+    the closed segments between them is maintained incrementally, so adding
+    a sample or reading the mean is O(1) amortised.
+    """
+
+    def __init__(self, window: float, capacity: int = TWA_CAPACITY) -> None:
+        """Initialize with a window length in seconds."""
+        self.window = window
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0  # Index of the oldest sample
+        self._size = 0
+        self._integral = 0.0  # Integral from the oldest to the newest sample
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample; it holds until the next one arrives."""
+        if self._size:
+            last = (self._head + self._size - 1) % self._capacity
+            last_time = self._times[last]
+            if timestamp < last_time:
+                return
+            if timestamp == last_time:
+                self._values[last] = value
+                return
+            self._integral += self._values[last] * (timestamp - last_time)
+            if self._size == self._capacity:
+                self._drop_oldest()
+
+        index = (self._head + self._size) % self._capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+        self._size += 1
+
+    def value(self, now: float) -> float | None:
+        """Return the time-weighted mean over the window ending at now."""
+        if not self._size:
+            return None
+
+        start = now - self.window
+        # Evict samples whose hold period ended before the window
+        while self._size >= 2 and self._times[(self._head + 1) % self._capacity] <= start:
+            self._drop_oldest()
+
+        last = (self._head + self._size - 1) % self._capacity
+        total = self._integral + self._values[last] * max(0.0, now - self._times[last])
+        first_time = self._times[self._head]
+        if first_time < start:
+            total -= self._values[self._head] * (start - first_time)
+            span = now - start
+        else:
+            span = now - first_time
+
+        if span <= 0:
+            return self._values[last]
+        return total / span
+
+    def _drop_oldest(self) -> None:
+        """Remove the oldest sample and its segment from the integral."""
+        following = (self._head + 1) % self._capacity
+        if self._size >= 2:
+            self._integral -= self._values[self._head] * (
+                self._times[following] - self._times[self._head]
+            )
+        self._head = following
+        self._size -= 1
+
+class SensorFilter:
+    """Hampel outlier and rate-of-change rejection for a single sensor.
+
+    Raw samples go into a fixed-size ring buffer so a genuine level shift is
+    accepted once it dominates the window; each sample costs a median over
+    at most FILTER_WINDOW_SIZE values.
+    """
+
+    def __init__(self, averaging_window: float = 0) -> None:
+        """Initialize the filter with an optional averaging window in seconds."""
+        self.window: deque[float] = deque(maxlen=FILTER_WINDOW_SIZE)
+        self.average = TimeWeightedAverage(averaging_window) if averaging_window > 0 else None
+        self.value: float | None = None  # Last accepted value
+        self.accepted_at: float | None = None  # Timestamp of last accepted value
+        self.last_updated: datetime | None = None
+        self.last_reported: datetime | None = None
+        self.status = STATUS_UNAVAILABLE
+
+    def add(self, value: float, timestamp: float) -> bool:
+        """Add a raw sample; returns True if it was accepted."""
+        low, high = FILTER_VALID_RANGE
+        if not low <= value <= high:
+            self.status = STATUS_OUT_OF_RANGE
+            return False
+
+        window = self.window
+        window.append(value)
+
+        # 1. Rate-of-change limit against the last accepted value
+        if self.value is not None and self.accepted_at is not None:
+            minutes = (timestamp - self.accepted_at) / 60
+            if minutes > 0 and abs(value - self.value) / minutes > FILTER_MAX_RATE:
+                self.status = STATUS_RATE
+                return False
+
+        # 2. Hampel identifier over the ring buffer
+        if len(window) >= 3:
+            centre = median(window)
+            mad = median(abs(x - centre) for x in window)
+            sigma = max(1.4826 * mad, FILTER_MIN_SIGMA)
+            if abs(value - centre) > FILTER_HAMPEL_THRESHOLD * sigma:
+                self.status = STATUS_OUTLIER
+                return False
+
+        self.value = value
+        self.accepted_at = timestamp
+        self.status = STATUS_OK
+        if self.average is not None:
+            self.average.add(timestamp, value)
+        return True
+
+class SensorFilterBank:
+    """Per-sensor filters plus staleness detection for the planner inputs."""
+
+    def __init__(self, stale_after: timedelta, averaging_window: timedelta) -> None:
+        """Initialize the bank."""
+        self.stale_after = stale_after
+        self.averaging_window = averaging_window.total_seconds()
+        self.filters: dict[str, SensorFilter] = {}
+
+    def observe(self, entity_id: str, state: State | None) -> float | None:
+        """Feed the current state of a sensor; repeated states are ignored.
+
+        Returns the value if a new sample was accepted, otherwise None.
+        """
+        sensor_filter = self.filters.get(entity_id)
+        if sensor_filter is None:
+            sensor_filter = self.filters[entity_id] = SensorFilter(self.averaging_window)
+
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            sensor_filter.status = STATUS_UNAVAILABLE
+            return None
+
+        # last_reported moves on every report, even when the value is unchanged
+        sensor_filter.last_reported = getattr(state, "last_reported", state.last_updated)
+        if state.last_updated == sensor_filter.last_updated:
+            return None
+        sensor_filter.last_updated = state.last_updated
+
+        try:
+            value = float(state.state)
+        except (ValueError, TypeError):
+            sensor_filter.status = STATUS_UNAVAILABLE
+            return None
+
+        if not sensor_filter.add(value, state.last_updated.timestamp()):
+            _LOGGER.debug(
+                "Rejected %s reading %s (%s)", entity_id, value, sensor_filter.status
+            )
+            return None
+        return value
+
+    def snapshot(self, now: datetime) -> dict[str, Any]:
+        """Return accepted values and the sensors that were rejected or stale.
+
+        Values are time-weighted means over the averaging window when one is
+        configured, so the result does not depend on when the cycle fires.
+        """
+        values: dict[str, float] = {}
+        rejected: dict[str, str] = {}
+        stale: list[str] = []
+
+        for entity_id, sensor_filter in self.filters.items():
+            if sensor_filter.status == STATUS_UNAVAILABLE:
+                rejected[entity_id] = STATUS_UNAVAILABLE
+                continue
+            if (
+                sensor_filter.last_reported is None
+                or now - sensor_filter.last_reported > self.stale_after
+            ):
+                stale.append(entity_id)
+                continue
+            if sensor_filter.status != STATUS_OK:
+                rejected[entity_id] = sensor_filter.status
+            if sensor_filter.value is None:
+                continue
+            # A rejected latest sample falls back to the last good value
+            value = sensor_filter.value
+            if sensor_filter.average is not None:
+                value = sensor_filter.average.value(now.timestamp())
+            values[entity_id] = value
+
+        return {"values": values, "rejected": rejected, "stale": stale}
+
+    def reconfigure(self, stale_after: timedelta, averaging_window: timedelta) -> None:
+        """Change thresholds in place, keeping sensor history where possible."""
+        self.stale_after = stale_after
+        self.averaging_window = averaging_window.total_seconds()
+        for sensor_filter in self.filters.values():
+            if self.averaging_window <= 0:
+                sensor_filter.average = None
+            elif sensor_filter.average is None:
+                sensor_filter.average = TimeWeightedAverage(self.averaging_window)
+                # Seed with the held value, or a steady sensor has no mean
+                if sensor_filter.value is not None and sensor_filter.accepted_at is not None:
+                    sensor_filter.average.add(sensor_filter.accepted_at, sensor_filter.value)
+            else:
+                sensor_filter.average.window = self.averaging_window
+
+    def remove(self, entity_id: str) -> None:
+        """Forget a sensor that is no longer configured."""
+        self.filters.pop(entity_id, None)
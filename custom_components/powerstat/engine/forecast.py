@@ -0,0 +1,182 @@
+"""Forecast-driven free heating and cooling windows for PowerStat."""
+from __future__ import annotations
+
+import logging
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    FORECAST_DEFER_LEAD,
+    FORECAST_DEFER_MAX_OVERSHOOT,
+    FORECAST_PREEMPT_DROP,
+    FORECAST_PREEMPT_LEAD,
+    FORECAST_STEP,
+    THERMAL_BAND_COUNT,
+    THERMAL_BAND_MIN,
+    THERMAL_BAND_WIDTH,
+    THERMAL_TIME_BUCKETS,
+)
+from ..models.thermal import ThermalModel
+
+_LOGGER = logging.getLogger(__name__)
+
+class ForecastGrid(NamedTuple):
+    """The forecast horizon sampled every FORECAST_STEP minutes."""
+
+    times: np.ndarray  # Unix seconds
+    outdoor: np.ndarray  # °C
+    sunny: np.ndarray
+    heat_rate: np.ndarray  # °C/min the thermal model expects at each point
+    cool_rate: np.ndarray
+    drift_rate: np.ndarray  # °C/min with the system off
+
+class ForecastScorer:
+    """Build the forecast grid, cached until the forecast or the model changes."""
+
+    def __init__(self) -> None:
+        """Initialize the scorer."""
+        self._key: tuple[tuple, int] | None = None
+        self._grid: ForecastGrid | None = None
+
+    def score(
+        self, points: tuple[tuple[float, float, bool], ...], thermal_model: ThermalModel
+    ) -> ForecastGrid | None:
+        """Return the grid for (timestamp, temperature, sunny) forecast points."""
+        if len(points) < 2:
+            return None
+
+        key = (points, thermal_model.version)
+        if key == self._key:
+            return self._grid
+
+        point_times, point_temps, point_sunny = (np.array(column) for column in zip(*points))
+        times = np.arange(point_times[0], point_times[-1] + 1, FORECAST_STEP * 60)
+        outdoor = np.interp(times, point_times, point_temps)
+        sunny = point_sunny.astype(bool)[np.searchsorted(point_times, times, side="right") - 1]
+
+        # Rates come from the model's context cells; local hours use the
+        # current UTC offset across the horizon.
+        offset = dt_util.now().utcoffset().total_seconds()
+        buckets = ((times + offset) // 3600 % 24).astype(int) * THERMAL_TIME_BUCKETS // 24
+        bands = np.clip(
+            np.floor_divide(outdoor - THERMAL_BAND_MIN, THERMAL_BAND_WIDTH), 0, THERMAL_BAND_COUNT - 1
+        ).astype(int)
+        table = thermal_model.rate_table()
+
+        self._key = key
+        self._grid = ForecastGrid(
+            times,
+            outdoor,
+            sunny,
+            table[0, bands, buckets],
+            table[1, bands, buckets],
+            table[2, bands, buckets],
+        )
+        _LOGGER.debug("Scored %s forecast points", len(times))
+        return self._grid
+
+def _runs(mask: np.ndarray) -> list[tuple[int, int]]:
+    """Return (start, end) index pairs of the True runs in a mask."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), (edges[1::2] - 1).tolist()))
+
+def free_energy_stage(
+    grid: ForecastGrid,
+    now: float,
+    indoor: float,
+    target: float,
+    deadband: float,
+    hvac_mode: str,
+    differential: float,
+) -> dict[str, Any]:
+    """Score the horizon ahead and adjust the proposed mode if worthwhile.
+
+    A free window is where outdoor air (or sun) favours heating or cooling
+    and the thermal model's drift with the system off points the same way.
+    Windows carry the drift they are expected to bring. Returns them and,
+    when the forecast changes the decision, "hvac_mode", "reason" and
+    "reason_code": a run is deferred for a window starting within
+    FORECAST_DEFER_LEAD minutes, but only if the predicted drift keeps the
+    room within FORECAST_DEFER_MAX_OVERSHOOT of the deadband until then and
+    brings it to the target during the window. A window already in progress
+    never defers: it evidently isn't doing the work. A run is started early
+    inside the deadband if the compressor rate is about to drop by
+    FORECAST_PREEMPT_DROP.
+    """
+    if grid.times[-1] < now:
+        return {"free_windows": []}
+    # Start at the point covering now, so a window in progress shows as such
+    start = max(int(np.searchsorted(grid.times, now, side="right")) - 1, 0)
+
+    minutes = (grid.times[start:] - now) / 60
+    outdoor = grid.outdoor[start:]
+    drift = grid.drift_rate[start:]
+    free = {
+        "cool": (outdoor < indoor - differential) & (drift < 0),
+        "heat": (
+            (outdoor > indoor + differential)
+            | (grid.sunny[start:] & (outdoor >= indoor - differential))
+        )
+        & (drift > 0),
+    }
+    # Indoor temperature at each point if the system stays off from now
+    elapsed = np.maximum(minutes, 0.0)
+    predicted = indoor + np.concatenate(([0.0], np.cumsum(drift[:-1] * np.diff(elapsed))))
+
+    runs = sorted((first, last, mode) for mode, mask in free.items() for first, last in _runs(mask))
+    windows = [
+        {
+            "type": mode,
+            "start": grid.times[start + first].item(),
+            "end": grid.times[start + last].item(),
+            "drift": round((drift[first : last + 1] * FORECAST_STEP).sum().item(), 2),
+        }
+        for first, last, mode in runs
+    ]
+    result: dict[str, Any] = {"free_windows": windows}
+
+    # Defer: a proposed run the house's own drift will soon make unnecessary
+    if hvac_mode in free:
+        sign = 1 if hvac_mode == "heat" else -1
+        floor = -(deadband + FORECAST_DEFER_MAX_OVERSHOOT)
+        for first, last, mode in runs:
+            if mode != hvac_mode or minutes[first] <= 0:
+                continue
+            if minutes[first] > FORECAST_DEFER_LEAD:
+                break
+            if (sign * (predicted[: first + 1] - target)).min() < floor:
+                break  # Too cold (or warm) by then; later windows are no better
+            if (sign * (predicted[first : last + 1] - target)).max() < 0:
+                continue
+            lead = round(minutes[first].item())
+            label = "Cooling" if hvac_mode == "cool" else "Heating"
+            result.update(
+                hvac_mode="off",
+                reason=f"{label} deferred: free {hvac_mode}ing expected in {lead} min",
+                reason_code=f"free_{hvac_mode}ing",
+            )
+            break
+        return result
+
+    # Pre-empt: inside the deadband, run now while the compressor is efficient
+    ahead = int(np.searchsorted(minutes, FORECAST_PREEMPT_LEAD))
+    if hvac_mode != "off" or ahead >= len(minutes):
+        return result
+    for mode, rates, needed in (
+        ("heat", grid.heat_rate[start:], indoor < target),
+        ("cool", -grid.cool_rate[start:], indoor > target),
+    ):
+        if not needed or free[mode][: ahead + 1].any():
+            continue
+        if rates[0] > 0 and rates[ahead] < rates[0] * (1 - FORECAST_PREEMPT_DROP):
+            drop = round(100 * (1 - rates[ahead] / rates[0]))
+            result.update(
+                hvac_mode=mode,
+                reason=f"Running early: {mode} rate drops {drop}% within {FORECAST_PREEMPT_LEAD} min",
+                reason_code="preempt",
+            )
+            break
+    return result
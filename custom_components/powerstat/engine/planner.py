@@ -2,31 +2,51 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 from homeassistant.core import HomeAssistant
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    CONF_FREE_TEMP_DIFFERENTIAL,
+    CONF_PRESENCE_WEIGHT_BOOST,
+    CONF_TEMP_DEADBAND,
+    DEFAULT_FREE_TEMP_DIFFERENTIAL,
+    DEFAULT_PRESENCE_WEIGHT_BOOST,
+    DEFAULT_TEMP_DEADBAND,
+    CONFIDENCE_LOW,
+    CONFIDENCE_DEADBAND_FACTOR,
+    PREFERENCE_MIN_SAMPLES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 class PowerStatPlanner:
     """The 'Brain' of the thermostat."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, snapshot: dict[str, Any]) -> None:
+    def __init__(self, hass: HomeAssistant, config: Mapping[str, Any], snapshot: dict[str, Any]) -> None:
         """Initialize the planner."""
         self.hass = hass
-        self.entry = entry
+        self.config = config
         self.snapshot = snapshot
 
     async def async_calculate_plan(self) -> dict[str, Any]:
         """Calculate the next HVAC plan based on current state."""
-        # 1. Compute effective temp
-        eff_temp = self._calculate_effective_temperature()
+        # 1. Compute effective temp (Kalman estimate when enabled)
+        estimate = self.snapshot.get("estimate")
+        uncertainty = None
+        if estimate:
+            eff_temp = round(estimate["temperature"], 1)
+            uncertainty = estimate["uncertainty"]
+        else:
+            eff_temp = self._calculate_effective_temperature()
         
         if eff_temp is None:
             return {
                 "hvac_mode": "off",
                 "reason": "No temperature data available",
+                "reason_code": "no_data",
                 "confidence": 0
             }
 
@@ -37,46 +57,105 @@ class PowerStatPlanner:
         # Default targets (these will be moved to user-configurable settings later)
         target_temp = 21.0
         reason = "Mode: Home"
+        reason_code = "home"
         
         if is_away:
             target_temp = 18.0
             reason = "Mode: Away (Eco)"
+            reason_code = "away"
         elif is_sleep:
             target_temp = 19.0
             reason = "Mode: Sleep"
+            reason_code = "sleep"
+
+        # Setpoints learned from manual changes in this context replace the
+        # default: heating aims at the heat one, cooling at the cool one
+        heat_target = cool_target = target_temp
+        preference = self.snapshot.get("preference") or {}
+        if preference.get("n_heat", 0) >= PREFERENCE_MIN_SAMPLES:
+            heat_target = round(preference["heat"], 1)
+        if preference.get("n_cool", 0) >= PREFERENCE_MIN_SAMPLES:
+            cool_target = round(preference["cool"], 1)
+        cool_target = max(cool_target, heat_target)
+        if (heat_target, cool_target) != (target_temp, target_temp):
+            reason += " (learned)"
+        target_temp = cool_target if eff_temp > cool_target else heat_target
             
+        deadband = self.config.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+
+        # Low confidence: widen the band so doubtful readings don't start runs
+        confidence = self.snapshot.get("confidence", {}).get("score", 100)
+        low_confidence = confidence < CONFIDENCE_LOW
+        if low_confidence:
+            deadband *= CONFIDENCE_DEADBAND_FACTOR
+            reason += " (low confidence)"
+
         hvac_mode = "off"
-        if eff_temp < target_temp - 0.5:
+        if eff_temp < target_temp - deadband:
             hvac_mode = "heat"
-        elif eff_temp > target_temp + 0.5:
+        elif eff_temp > target_temp + deadband:
             hvac_mode = "cool"
 
+        # 3. Let forecast free heating/cooling windows defer or pre-empt runs
+        free_windows = []
+        grid = self.snapshot.get("forecast_grid")
+        if grid is not None and not low_confidence:
+            from .forecast import free_energy_stage  # Loaded with the grid's scorer
+
+            stage = free_energy_stage(
+                grid,
+                dt_util.utcnow().timestamp(),
+                eff_temp,
+                target_temp,
+                deadband,
+                hvac_mode,
+                self.config.get(CONF_FREE_TEMP_DIFFERENTIAL, DEFAULT_FREE_TEMP_DIFFERENTIAL),
+            )
+            free_windows = stage["free_windows"]
+            if "hvac_mode" in stage:
+                hvac_mode = stage["hvac_mode"]
+                reason = stage["reason"]
+                reason_code = stage["reason_code"]
+
+        # 4. Predict how long the chosen mode needs (not on doubtful inputs)
+        eta_minutes = None
+        thermal = {} if low_confidence else self.snapshot.get("thermal", {})
+        if hvac_mode == "heat" and thermal.get("heat_rate", 0) > 0:
+            eta_minutes = round((target_temp - eff_temp) / thermal["heat_rate"])
+        elif hvac_mode == "cool" and thermal.get("cool_rate", 0) < 0:
+            eta_minutes = round((target_temp - eff_temp) / thermal["cool_rate"])
+
         return {
             "effective_temp": eff_temp,
             "hvac_mode": hvac_mode,
             "target_temp": target_temp,
             "reason": reason,
-            "confidence": 100
+            "reason_code": reason_code,
+            "confidence": confidence,
+            "low_confidence": low_confidence,
+            "uncertainty": uncertainty,
+            "eta_minutes": eta_minutes,
+            "free_windows": free_windows,
         }
 
     def _calculate_effective_temperature(self) -> float | None:
         """Weighted average of temperature sensors."""
         sensors = self.snapshot.get("sensors", {})
         presence = self.snapshot.get("presence", {})
+        presence_map = self.snapshot.get("presence_map", {})
         
         total_temp = 0.0
         total_weight = 0.0
         
-        presence_boost = self.entry.data.get("presence_weight_boost", 2.0)
+        presence_boost = self.config.get(CONF_PRESENCE_WEIGHT_BOOST, DEFAULT_PRESENCE_WEIGHT_BOOST)
 
         for entity_id, state in sensors.items():
             try:
                 temp = float(state)
                 weight = 1.0
                 
-                # Check presence boost if presence entity is linked to this sensor (simplified for now)
-                # In full version, we map sensors to Areas and presence to Areas.
-                if presence.get(entity_id):
+                # Boost sensors whose area has an occupied presence sensor
+                if any(presence.get(p) for p in presence_map.get(entity_id, ())):
                     weight *= presence_boost
                 
                 total_temp += temp * weight
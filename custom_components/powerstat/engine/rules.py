@@ -2,79 +2,313 @@
 from __future__ import annotations
 
 import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, ClassVar
 
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
 from ..const import (
+    CONF_LOAD_SHED_ENTITY,
+    CONF_MIN_ACTION_INTERVAL,
     CONF_MIN_ON_TIME,
     CONF_MIN_OFF_TIME,
+    CONF_OPEN_GRACE_PERIOD,
+    CONF_WINDOW_SENSORS,
+    DEFAULT_MIN_ACTION_INTERVAL,
     DEFAULT_MIN_ON_TIME,
     DEFAULT_MIN_OFF_TIME,
+    DEFAULT_OPEN_GRACE_PERIOD,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+OUTCOME_PASS = "pass"
+OUTCOME_MODIFIED = "modified"
+OUTCOME_BLOCKED = "blocked"
+
+# Rule classes by name; PowerStatRules compiles the enabled ones per config
+RULES: dict[str, type[Rule]] = {}
+
+def register_rule(rule_class: type[Rule]) -> type[Rule]:
+    """Class decorator adding a rule to the pipeline registry."""
+    RULES[rule_class.name] = rule_class
+    return rule_class
+
+class Rule(ABC):
+    """One step of the rule pipeline.
+
+    `inputs` names the snapshot keys the rule reads; only those are passed to
+    evaluate(). A rule returns None to pass, a changed plan to modify it, or
+    a plan with "blocked": True to stop the pipeline.
+    """
+
+    name: ClassVar[str]
+    order: ClassVar[int]
+    inputs: ClassVar[tuple[str, ...]] = ()
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Read the rule's settings once per config."""
+
+    @classmethod
+    def enabled(cls, config: Mapping[str, Any]) -> bool:
+        """Return True if the rule applies to this config."""
+        return True
+
+    @abstractmethod
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Check a plan."""
+
+def _hold(plan: dict[str, Any], climate: dict[str, Any], reason: str, rule: str) -> dict[str, Any]:
+    """Return the plan rewritten to keep the climate entity as it is."""
+    return {
+        **plan,
+        "hvac_mode": climate.get("hvac_mode"),
+        "target_temp": climate.get("target_temp"),
+        "reason": reason,
+        "blocked": True,
+        "rule": rule,
+    }
+
+@register_rule
+class ManualHoldRule(Rule):
+    """Leave the thermostat as a person set it."""
+
+    name = "manual_hold"
+    order = 10
+    inputs = ("climate",)
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Block while the hold runs."""
+        climate = inputs["climate"]
+        hold_until = climate.get("manual_hold_until")
+        if hold_until and now < hold_until:
+            return _hold(
+                plan,
+                climate,
+                f"Manual hold until {dt_util.as_local(hold_until).strftime('%H:%M')}",
+                self.name,
+            )
+        return None
+
+@register_rule
+class LoadShedRule(Rule):
+    """Keep the HVAC off while the utility or a load manager asks to shed."""
+
+    name = "load_shed"
+    order = 20
+    inputs = ("climate", "load_shed")
+
+    @classmethod
+    def enabled(cls, config: Mapping[str, Any]) -> bool:
+        """Only with a load-shed entity configured."""
+        return bool(config.get(CONF_LOAD_SHED_ENTITY))
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Turn the plan off; the compressor rules still get a say."""
+        if not inputs["load_shed"] or plan.get("hvac_mode") == "off":
+            return None
+        return {**plan, "hvac_mode": "off", "reason": "Load shedding active", "rule": self.name}
+
+@register_rule
+class WindowPauseRule(Rule):
+    """Pause heating or cooling while a window or door stays open."""
+
+    name = "window_pause"
+    order = 30
+    inputs = ("environment",)
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Read the grace period."""
+        self.grace_period = config.get(CONF_OPEN_GRACE_PERIOD, DEFAULT_OPEN_GRACE_PERIOD)
+
+    @classmethod
+    def enabled(cls, config: Mapping[str, Any]) -> bool:
+        """Only with window sensors configured."""
+        return bool(config.get(CONF_WINDOW_SENSORS))
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Turn the plan off once an opening outlasts the grace period."""
+        if plan.get("hvac_mode") == "off":
+            return None
+        for window in inputs["environment"].get("window_states", {}).values():
+            if window["open"] and window["duration"] >= self.grace_period:
+                return {
+                    **plan,
+                    "hvac_mode": "off",
+                    "reason": f"Paused: {window['name']} open ({round(window['duration'])}s)",
+                    "rule": self.name,
+                }
+        return None
+
+@register_rule
+class MinOnTimeRule(Rule):
+    """Compressor short-cycle protection when turning off."""
+
+    name = "min_on_time"
+    order = 40
+    inputs = ("climate",)
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Read the minimum run time."""
+        self.min_on_time = timedelta(minutes=config.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME))
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Keep running until the minimum on-time has passed."""
+        climate = inputs["climate"]
+        state_since = climate.get("state_since") or climate.get("last_changed")
+        current_hvac_mode = climate.get("hvac_mode")
+        if not state_since or current_hvac_mode == "off" or plan.get("hvac_mode") != "off":
+            return None
+        if climate.get("running") is False:
+            return None  # Idling in its mode; switching off cuts no run short
+
+        time_since_change = now - state_since
+        if time_since_change >= self.min_on_time:
+            return None
+
+        _LOGGER.debug(
+            "Short-cycle protection: Holding %s for another %s",
+            current_hvac_mode,
+            self.min_on_time - time_since_change,
+        )
+        return _hold(
+            plan,
+            climate,
+            f"Waiting (min on-time: {self.min_on_time.total_seconds()/60}m)",
+            self.name,
+        )
+
+@register_rule
+class MinOffTimeRule(Rule):
+    """Compressor short-cycle protection when turning on."""
+
+    name = "min_off_time"
+    order = 50
+    inputs = ("climate",)
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Read the minimum rest time."""
+        self.min_off_time = timedelta(minutes=config.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME))
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Stay off until the minimum off-time has passed."""
+        climate = inputs["climate"]
+        state_since = climate.get("state_since") or climate.get("last_changed")
+        if not state_since or climate.get("hvac_mode") != "off" or plan.get("hvac_mode") == "off":
+            return None
+
+        time_since_change = now - state_since
+        if time_since_change >= self.min_off_time:
+            return None
+
+        _LOGGER.debug(
+            "Short-cycle protection: Holding OFF for another %s",
+            self.min_off_time - time_since_change,
+        )
+        return {
+            **plan,
+            "hvac_mode": "off",
+            "reason": f"Waiting (min off-time: {self.min_off_time.total_seconds()/60}m)",
+            "blocked": True,
+            "rule": self.name,
+        }
+
+@register_rule
+class ActionRateLimitRule(Rule):
+    """Space out commands to the climate entity."""
+
+    name = "action_rate_limit"
+    order = 60
+    inputs = ("climate",)
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Read the minimum interval between commands."""
+        self.interval = timedelta(
+            seconds=config.get(CONF_MIN_ACTION_INTERVAL, DEFAULT_MIN_ACTION_INTERVAL)
+        )
+
+    @classmethod
+    def enabled(cls, config: Mapping[str, Any]) -> bool:
+        """Off when the interval is set to zero."""
+        return config.get(CONF_MIN_ACTION_INTERVAL, DEFAULT_MIN_ACTION_INTERVAL) > 0
+
+    def evaluate(
+        self, inputs: dict[str, Any], plan: dict[str, Any], now: datetime
+    ) -> dict[str, Any] | None:
+        """Block a change if the last command was sent too recently."""
+        climate = inputs["climate"]
+        last_command_at = climate.get("last_command_at")
+        if not last_command_at or now - last_command_at >= self.interval:
+            return None
+
+        changes_mode = plan.get("hvac_mode") != climate.get("hvac_mode")
+        changes_temp = (
+            plan.get("hvac_mode") != "off"
+            and plan.get("target_temp") != climate.get("target_temp")
+        )
+        if not changes_mode and not changes_temp:
+            return None
+
+        wait = self.interval - (now - last_command_at)
+        return _hold(
+            plan, climate, f"Waiting (next change in {round(wait.total_seconds())}s)", self.name
+        )
+
 class PowerStatRules:
     """Class to handle safety rules like compressor protection."""
 
-    def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
-        """Initialize rules."""
+    def __init__(self, hass: HomeAssistant, config: Mapping[str, Any]) -> None:
+        """Initialize rules and compile the pipeline for this config."""
         self.hass = hass
         self.config = config
-        self.min_on_time = timedelta(minutes=config.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME))
-        self.min_off_time = timedelta(minutes=config.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME))
+        self.pipeline: list[Rule] = [
+            rule_class(config)
+            for rule_class in sorted(RULES.values(), key=lambda rule_class: rule_class.order)
+            if rule_class.enabled(config)
+        ]
 
     def validate_action(
-        self, 
-        current_state: dict[str, Any], 
+        self,
+        snapshot: dict[str, Any],
         proposed_action: dict[str, Any]
     ) -> dict[str, Any]:
         """
-        Validate a proposed HVAC action against safety rules.
-        Returns a modified action or the original if safe.
+        Validate a proposed HVAC action against the rule pipeline.
+        Returns the final action with a per-rule trace under "rules".
         """
         now = dt_util.now()
-        last_changed = current_state.get("last_changed")
-        current_hvac_mode = current_state.get("hvac_mode")
-        proposed_hvac_mode = proposed_action.get("hvac_mode")
-
-        if not last_changed:
-            return proposed_action
-
-        time_since_change = now - last_changed
-
-        # Compressor Short-Cycle Protection
-        if current_hvac_mode != "off" and proposed_hvac_mode == "off":
-            # Attempting to turn OFF
-            if time_since_change < self.min_on_time:
-                _LOGGER.debug(
-                    "Short-cycle protection: Holding %s for another %s",
-                    current_hvac_mode,
-                    self.min_on_time - time_since_change
-                )
-                return {
-                    **proposed_action,
-                    "hvac_mode": current_hvac_mode,
-                    "target_temp": current_state.get("target_temp"),
-                    "reason": f"Waiting (min on-time: {self.min_on_time.total_seconds()/60}m)",
-                    "blocked": True
-                }
+        plan = proposed_action
+        trace: list[dict[str, Any]] = []
 
-        if current_hvac_mode == "off" and proposed_hvac_mode != "off":
-            # Attempting to turn ON
-            if time_since_change < self.min_off_time:
-                _LOGGER.debug(
-                    "Short-cycle protection: Holding OFF for another %s",
-                    self.min_off_time - time_since_change
-                )
-                return {
-                    **proposed_action,
-                    "hvac_mode": "off",
-                    "reason": f"Waiting (min off-time: {self.min_off_time.total_seconds()/60}m)",
-                    "blocked": True
-                }
+        for rule in self.pipeline:
+            started = time.perf_counter()
+            result = rule.evaluate({key: snapshot.get(key) for key in rule.inputs}, plan, now)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+
+            if result is None:
+                trace.append({"rule": rule.name, "outcome": OUTCOME_PASS, "ms": elapsed_ms})
+                continue
+
+            plan = result
+            if plan.get("blocked"):
+                trace.append({"rule": rule.name, "outcome": OUTCOME_BLOCKED, "ms": elapsed_ms})
+                break
+            trace.append({"rule": rule.name, "outcome": OUTCOME_MODIFIED, "ms": elapsed_ms})
 
-        return proposed_action
+        return {**plan, "rules": trace}
@@ -0,0 +1,91 @@
+"""Compressor runtime and cycling accounting for PowerStat."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from ..const import RUNTIME_MAX_RUNS, RUNTIME_RATE_WINDOW, RUNTIME_WINDOW
+
+class RuntimeAccountant:
+    """Track on/off intervals of one climate entity from its state changes.
+
+    Closed runs are kept as (start, end) Unix timestamps for the last
+    RUNTIME_WINDOW hours, capped at RUNTIME_MAX_RUNS, so every figure is
+    computed from memory without recorder queries. The state is small enough
+    to be persisted whole, so the figures survive restarts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accountant."""
+        self.running: bool | None = None
+        self.since: float | None = None
+        self.runs: deque[tuple[float, float]] = deque(maxlen=RUNTIME_MAX_RUNS)
+        self.prevented: deque[float] = deque(maxlen=RUNTIME_MAX_RUNS)
+        self._prevented_since: float | None = None
+
+    def observe(self, running: bool, timestamp: float) -> None:
+        """Record the on/off state at the time it took effect."""
+        if running == self.running:
+            return
+
+        if self.running and self.since is not None:
+            self.runs.append((self.since, timestamp))
+        self.running = running
+        self.since = timestamp
+        self._prune(timestamp)
+
+    def record_prevented(self, timestamp: float) -> None:
+        """Count a blocked short cycle, once per on or off period."""
+        if self.since is not None and self._prevented_since == self.since:
+            return
+        self._prevented_since = self.since
+        self.prevented.append(timestamp)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "running": self.running,
+            "since": self.since,
+            "runs": list(self.runs),
+            "prevented": list(self.prevented),
+            "prevented_since": self._prevented_since,
+        }
+
+    def restore(self, data: dict[str, Any], now: float) -> None:
+        """Load persisted state; the live on/off state is observed afterwards."""
+        self.running = data.get("running")
+        self.since = data.get("since")
+        self.runs.extend((start, end) for start, end in data.get("runs", []))
+        self.prevented.extend(data.get("prevented", []))
+        self._prevented_since = data.get("prevented_since")
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Drop runs and preventions older than the rolling window."""
+        cutoff = now - RUNTIME_WINDOW * 3600
+        while self.runs and self.runs[0][1] < cutoff:
+            self.runs.popleft()
+        while self.prevented and self.prevented[0] < cutoff:
+            self.prevented.popleft()
+
+    def stats(self, now: float, day_start: float) -> dict[str, Any]:
+        """Return runtime today, cycling rate and short cycles prevented."""
+        self._prune(now)
+        runs = list(self.runs)
+        if self.running and self.since is not None:
+            runs.append((self.since, now))
+
+        runtime_today = sum(
+            end - max(start, day_start) for start, end in runs if end > day_start
+        )
+        rate_start = now - RUNTIME_RATE_WINDOW * 3600
+        starts = sum(1 for start, _ in runs if start >= rate_start)
+        closed = [end - start for start, end in self.runs if end >= rate_start]
+
+        return {
+            "running": self.running,
+            "runtime_today": round(runtime_today / 60, 1),
+            "cycles_per_hour": round(starts / RUNTIME_RATE_WINDOW, 2),
+            "average_run": round(sum(closed) / len(closed) / 60, 1) if closed else None,
+            "short_cycles_prevented": sum(1 for when in self.prevented if when >= day_start),
+        }
@@ -0,0 +1,239 @@
+"""Shadow planners evaluated beside production but never actuated."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from ..const import (
+    CONF_DECISION_INTERVAL,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
+    CONF_SHADOW_PLANNERS,
+    CONF_TEMP_DEADBAND,
+    DEFAULT_DECISION_INTERVAL,
+    DEFAULT_MIN_OFF_TIME,
+    DEFAULT_MIN_ON_TIME,
+    DEFAULT_TEMP_DEADBAND,
+    SHADOW_CPU_BUDGET,
+    SHADOW_CYCLE_BUDGET,
+    SHADOW_HISTORY,
+)
+from .planner import PowerStatPlanner
+from .rules import PowerStatRules
+
+_LOGGER = logging.getLogger(__name__)
+
+# Variant name -> (planner class, config overrides)
+SHADOW_VARIANTS: dict[str, tuple[type[PowerStatPlanner], dict[str, Any]]] = {}
+
+def register_shadow_variant(
+    name: str, planner_class: type[PowerStatPlanner], overrides: dict[str, Any]
+) -> None:
+    """Make a planner class and settings available as a shadow variant.
+
+    An override may be a callable, given the production config, so a
+    variant can stay relative to what the user configured.
+    """
+    SHADOW_VARIANTS[name] = (planner_class, overrides)
+
+def _scaled(key: str, default: float, factor: float) -> Callable[[Mapping[str, Any]], float]:
+    """Return an override that scales the configured value of a setting."""
+    return lambda config: config.get(key, default) * factor
+
+register_shadow_variant(
+    "narrow_deadband",
+    PowerStatPlanner,
+    {CONF_TEMP_DEADBAND: _scaled(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND, 0.5)},
+)
+register_shadow_variant(
+    "wide_deadband",
+    PowerStatPlanner,
+    {CONF_TEMP_DEADBAND: _scaled(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND, 2)},
+)
+register_shadow_variant(
+    "long_min_times",
+    PowerStatPlanner,
+    {
+        CONF_MIN_ON_TIME: _scaled(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME, 1.5),
+        CONF_MIN_OFF_TIME: _scaled(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME, 1.5),
+    },
+)
+
+def _project(plan: dict[str, Any], thermal: dict[str, Any], minutes: float) -> tuple[float | None, float]:
+    """Return the temperature a plan leads to after one interval, and its run minutes."""
+    temperature = plan.get("effective_temp")
+    mode = plan.get("hvac_mode")
+    if mode not in ("heat", "cool"):
+        return temperature, 0.0
+    if temperature is not None:
+        temperature += thermal.get(f"{mode}_rate", 0.0) * minutes
+    return temperature, minutes
+
+class ShadowRunner:
+    """Run the configured shadow variants on each production snapshot.
+
+    Each variant's config is merged and its rules compiled once. Per cycle,
+    nothing runs if the cycle already took SHADOW_CYCLE_BUDGET, and a
+    variant only starts if its last measured CPU cost fits in what is left
+    of SHADOW_CPU_BUDGET. A run that still goes over is counted as an
+    overrun and the excess comes out of the following cycles' budgets, so
+    shadow work averages no more than SHADOW_CPU_BUDGET per cycle. A variant
+    too slow to ever fit has its cost estimate halved on each skip, so it is
+    retried ever more rarely rather than never. Records
+    and running totals of projected comfort error and runtime, relative to
+    production, are kept in a bounded buffer and carried over from the
+    previous runner for variants that stay enabled.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: Mapping[str, Any],
+        previous: ShadowRunner | None = None,
+    ) -> None:
+        """Compile the configured variants."""
+        self.hass = hass
+        self.interval = config.get(CONF_DECISION_INTERVAL, DEFAULT_DECISION_INTERVAL) / 60
+        self.variants: list[tuple[str, type[PowerStatPlanner], dict[str, Any], PowerStatRules]] = []
+        for name in config.get(CONF_SHADOW_PLANNERS, []):
+            if name not in SHADOW_VARIANTS:
+                _LOGGER.warning("Unknown shadow planner %s", name)
+                continue
+            planner_class, overrides = SHADOW_VARIANTS[name]
+            variant_config = {
+                **config,
+                **{
+                    key: value(config) if callable(value) else value
+                    for key, value in overrides.items()
+                },
+            }
+            self.variants.append(
+                (name, planner_class, variant_config, PowerStatRules(hass, variant_config))
+            )
+        self.records: deque[dict[str, Any]] = deque(maxlen=SHADOW_HISTORY)
+        self.totals: dict[str, dict[str, float]] = {
+            name: {
+                "cycles": 0,
+                "differences": 0,
+                "comfort_delta": 0.0,
+                "runtime_delta": 0.0,
+                "overruns": 0,
+            }
+            for name, *_ in self.variants
+        }
+        self.costs: dict[str, float] = {}  # Last CPU seconds per variant
+        self.debt = 0.0  # CPU seconds spent beyond earlier cycles' budgets
+        self.skipped = 0
+
+        if previous is not None:
+            self.records.extend(
+                record for record in previous.records if record["variant"] in self.totals
+            )
+            for name in self.totals.keys() & previous.totals.keys():
+                self.totals[name] = previous.totals[name]
+                if name in previous.costs:
+                    self.costs[name] = previous.costs[name]
+            self.skipped = previous.skipped
+            self.debt = previous.debt
+
+    async def async_run(
+        self,
+        timestamp: float,
+        snapshot: dict[str, Any],
+        proposed: dict[str, Any],
+        final: dict[str, Any],
+        cycle_elapsed: float,
+    ) -> None:
+        """Evaluate the variants against production's proposed and final plans."""
+        budget = SHADOW_CPU_BUDGET - self.debt
+        if cycle_elapsed > SHADOW_CYCLE_BUDGET or budget <= 0:
+            self.skipped += 1
+            self.debt = max(0.0, -budget)
+            return
+
+        thermal = snapshot.get("thermal", {})
+        comfort_target = proposed.get("target_temp")
+        production_temp, production_runtime = _project(final, thermal, self.interval)
+        production_error = (
+            abs(production_temp - comfort_target)
+            if production_temp is not None and comfort_target is not None
+            else None
+        )
+
+        started = time.thread_time()
+        for name, planner_class, config, rules in self.variants:
+            remaining = budget - (time.thread_time() - started)
+            if self.costs.get(name, 0.0) > remaining:
+                self.skipped += 1
+                self.costs[name] = self.costs.get(name, 0.0) / 2
+                _LOGGER.debug("Shadow CPU budget left %.4fs; skipping %s", remaining, name)
+                continue
+
+            variant_started = time.thread_time()
+            try:
+                plan = await planner_class(self.hass, config, snapshot).async_calculate_plan()
+                plan = rules.validate_action(snapshot, plan)
+            except Exception:  # A broken variant must not fail the cycle
+                _LOGGER.exception("Shadow planner %s failed", name)
+                continue
+            finally:
+                self.costs[name] = time.thread_time() - variant_started
+
+            if self.costs[name] > remaining:
+                self.totals[name]["overruns"] += 1
+                _LOGGER.debug(
+                    "Shadow planner %s took %.4fs of CPU, over the %.4fs left",
+                    name,
+                    self.costs[name],
+                    remaining,
+                )
+
+            temperature, runtime = _project(plan, thermal, self.interval)
+            comfort_delta = 0.0
+            if production_error is not None and temperature is not None:
+                comfort_delta = abs(temperature - comfort_target) - production_error
+            differs = (
+                plan.get("hvac_mode") != final.get("hvac_mode")
+                or plan.get("target_temp") != final.get("target_temp")
+            )
+
+            totals = self.totals[name]
+            totals["cycles"] += 1
+            totals["differences"] += differs
+            totals["comfort_delta"] += comfort_delta
+            totals["runtime_delta"] += runtime - production_runtime
+            self.records.append(
+                {
+                    "timestamp": timestamp,
+                    "variant": name,
+                    "hvac_mode": plan.get("hvac_mode"),
+                    "target_temp": plan.get("target_temp"),
+                    "rule": plan.get("rule"),
+                    "differs": differs,
+                    "comfort_delta": round(comfort_delta, 3),
+                    "runtime_delta": round(runtime - production_runtime, 2),
+                }
+            )
+
+        self.debt = max(0.0, time.thread_time() - started - budget)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return totals and the buffered records."""
+        return {
+            "totals": {
+                name: {
+                    **totals,
+                    "comfort_delta": round(totals["comfort_delta"], 2),
+                    "runtime_delta": round(totals["runtime_delta"], 1),
+                    "cpu_ms": round(self.costs.get(name, 0.0) * 1000, 2),
+                }
+                for name, totals in self.totals.items()
+            },
+            "skipped": self.skipped,
+            "records": list(self.records),
+        }
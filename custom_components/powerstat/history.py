@@ -0,0 +1,87 @@
+"""In-memory decision history for PowerStat."""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import HISTORY_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Field order of the compact record tuples
+RECORD_FIELDS = (
+    "timestamp",
+    "effective_temp",
+    "hvac_mode",
+    "target_temp",
+    "reason_code",
+    "blocked",
+    "rule",
+)
+
+def _timestamp(record: tuple) -> float:
+    """Sort key for records."""
+    return record[0]
+
+class DecisionHistory:
+    """Bounded ring buffer of compact plan records for one entry."""
+
+    def __init__(self, maxlen: int = HISTORY_SIZE) -> None:
+        """Initialize the history."""
+        self.records: deque[tuple] = deque(maxlen=maxlen)
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+
+    @staticmethod
+    def as_dict(record: tuple) -> dict[str, Any]:
+        """Expand a compact record."""
+        return dict(zip(RECORD_FIELDS, record))
+
+    @callback
+    def async_record(self, timestamp: float, plan: dict[str, Any]) -> None:
+        """Append a plan and push it to subscribers."""
+        record = (
+            timestamp,
+            plan.get("effective_temp"),
+            plan.get("hvac_mode"),
+            plan.get("target_temp"),
+            plan.get("reason_code"),
+            bool(plan.get("blocked")),
+            plan.get("rule"),
+        )
+        self.records.append(record)
+
+        if self._listeners:
+            expanded = self.as_dict(record)
+            for listener in list(self._listeners):
+                listener(expanded)
+
+    def window(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return records between two timestamps, newest `limit` only."""
+        records = self.records
+        lo = bisect_left(records, start, key=_timestamp) if start is not None else 0
+        hi = bisect_right(records, end, key=_timestamp) if end is not None else len(records)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return [self.as_dict(records[i]) for i in range(lo, hi)]
+
+    @callback
+    def async_subscribe(self, listener: Callable[[dict[str, Any]], None]) -> CALLBACK_TYPE:
+        """Push each new record to a listener; returns the unsubscribe callback."""
+        self._listeners.append(listener)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _async_unsubscribe
@@ -0,0 +1,178 @@
+"""Append-only binary log of thermal episodes for PowerStat."""
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import struct
+from typing import NamedTuple
+
+from ..const import EPISODE_LOG_MAX_RECORDS, EPISODE_MIN_RUNTIME
+
+_LOGGER = logging.getLogger(__name__)
+
+# start, end (Unix seconds), mode, indoor start/end, outdoor average (°C), runtime (min)
+EPISODE_RECORD = struct.Struct("<ddB3xffff")
+
+MODES = ("off", "heat", "cool")
+
+class Episode(NamedTuple):
+    """One continuous heating or cooling run, or off period."""
+
+    start: float
+    end: float
+    mode: str
+    indoor_start: float
+    indoor_end: float
+    outdoor_avg: float | None
+    runtime: float
+
+def _pack(episode: Episode) -> bytes:
+    """Encode an episode as a fixed-width record."""
+    outdoor = episode.outdoor_avg if episode.outdoor_avg is not None else math.nan
+    return EPISODE_RECORD.pack(
+        episode.start,
+        episode.end,
+        MODES.index(episode.mode),
+        episode.indoor_start,
+        episode.indoor_end,
+        outdoor,
+        episode.runtime,
+    )
+
+def _unpack(fields: tuple) -> Episode:
+    """Decode a fixed-width record."""
+    start, end, mode, indoor_start, indoor_end, outdoor, runtime = fields
+    return Episode(
+        start,
+        end,
+        MODES[mode] if mode < len(MODES) else "off",
+        indoor_start,
+        indoor_end,
+        None if math.isnan(outdoor) else outdoor,
+        runtime,
+    )
+
+class EpisodeLog:
+    """Fixed-width episode records in a file beside the .storage data.
+
+    Appends are single writes; once the file reaches max_records it is rotated
+    to a single `.1` generation, bounding disk use to twice that. Reads map the
+    files into memory and unpack them in one pass. All I/O is blocking and must
+    run in an executor thread.
+    """
+
+    def __init__(self, path: str, max_records: int = EPISODE_LOG_MAX_RECORDS) -> None:
+        """Initialize the log."""
+        self.path = path
+        self.max_records = max_records
+
+    def append(self, episode: Episode) -> None:
+        """Append one episode, rotating the file when full."""
+        try:
+            if os.path.getsize(self.path) >= self.max_records * EPISODE_RECORD.size:
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+
+        with open(self.path, "ab") as log_file:
+            log_file.write(_pack(episode))
+
+    def read(self, since: float | None = None) -> list[Episode]:
+        """Return all logged episodes, oldest first."""
+        episodes: list[Episode] = []
+        for path in (f"{self.path}.1", self.path):
+            episodes.extend(self._read_file(path))
+
+        if since is not None:
+            episodes = [episode for episode in episodes if episode.end >= since]
+        return episodes
+
+    @staticmethod
+    def _read_file(path: str) -> list[Episode]:
+        """Memory-map one log file and decode its records."""
+        try:
+            with open(path, "rb") as log_file:
+                size = os.fstat(log_file.fileno()).st_size
+                # Ignore a partial trailing record left by an interrupted write
+                usable = size - size % EPISODE_RECORD.size
+                if not usable:
+                    return []
+                with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)[:usable]
+                    try:
+                        return [_unpack(fields) for fields in EPISODE_RECORD.iter_unpack(view)]
+                    finally:
+                        view.release()
+        except FileNotFoundError:
+            return []
+
+class EpisodeTracker:
+    """Turn a stream of planning cycles into closed episodes.
+
+    Off periods are episodes too: their drift is what the house does on its
+    own. The first period after startup has no known start and is dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.mode = "off"
+        self.start: float | None = None
+        self.indoor_start: float | None = None
+        self.last_indoor: float | None = None
+        self._outdoor_sum = 0.0
+        self._outdoor_count = 0
+
+    def observe(
+        self,
+        timestamp: float,
+        hvac_mode: str,
+        indoor: float | None,
+        outdoor: float | None,
+    ) -> Episode | None:
+        """Feed one cycle; returns the episode that just ended, if any."""
+        if indoor is not None:
+            self.last_indoor = indoor
+
+        mode = hvac_mode if hvac_mode in ("heat", "cool") else "off"
+        closed = None
+        if mode != self.mode:
+            closed = self._close(timestamp)
+            self.mode = mode
+            self.start = timestamp
+            self.indoor_start = indoor
+            self._outdoor_sum = 0.0
+            self._outdoor_count = 0
+
+        if self.start is not None:
+            if self.indoor_start is None:
+                self.indoor_start = indoor
+            if outdoor is not None:
+                self._outdoor_sum += outdoor
+                self._outdoor_count += 1
+
+        return closed
+
+    def _close(self, timestamp: float) -> Episode | None:
+        """Close the open episode if it is long enough to learn from."""
+        if (
+            self.start is None
+            or self.indoor_start is None
+            or self.last_indoor is None
+        ):
+            return None
+
+        runtime = (timestamp - self.start) / 60
+        if runtime < EPISODE_MIN_RUNTIME:
+            return None
+
+        return Episode(
+            self.start,
+            timestamp,
+            self.mode,
+            self.indoor_start,
+            self.last_indoor,
+            self._outdoor_sum / self._outdoor_count if self._outdoor_count else None,
+            runtime,
+        )
@@ -2,18 +2,36 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
+from .thermal import grouped_welford, welford
+
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_PREFERENCE = {
+    "heat": 21.0,
+    "cool": 24.0,
+    "count": 0,
+    "n_heat": 0,
+    "n_cool": 0,
+    "m2_heat": 0.0,
+    "m2_cool": 0.0,
+}
+
 class PreferenceModel:
-    """Tracks user setpoint preferences based on context."""
+    """Tracks user setpoint preferences based on context.
+
+    Each mode's setpoint is the running mean of the manual setpoints seen in
+    that context, with a Welford M2 so the spread is known as well.
+    """
 
     def __init__(self) -> None:
         """Initialize model."""
         # Key: (day_type, time_bucket, mode, occupied)
-        # Value: {"heat": temp, "cool": temp, "count": int}
+        # Value: {"heat": temp, "cool": temp, "count": int,
+        #         "n_heat"/"n_cool": int, "m2_heat"/"m2_cool": float}
         self.preferences: dict[tuple, dict[str, Any]] = {}
 
     def get_context(self, now: datetime, mode: str, occupied: bool) -> tuple:
@@ -25,22 +43,74 @@ class PreferenceModel:
     def update_preference(self, context: tuple, hvac_mode: str, setpoint: float) -> None:
         """Update preference for a given context and hvac mode."""
         if context not in self.preferences:
-            self.preferences[context] = {"heat": 21.0, "cool": 24.0, "count": 0}
+            self.preferences[context] = dict(DEFAULT_PREFERENCE)
 
         pref = self.preferences[context]
-        count = pref["count"]
-        
-        # Learning rate decays as we get more samples
-        learning_rate = 1.0 / (count + 1)
-        
-        if hvac_mode == "heat":
-            pref["heat"] = (learning_rate * setpoint) + ((1 - learning_rate) * pref["heat"])
-        elif hvac_mode == "cool":
-            pref["cool"] = (learning_rate * setpoint) + ((1 - learning_rate) * pref["cool"])
-            
+
+        # Per-mode counts, so a heat setpoint doesn't dilute the cool mean
+        if hvac_mode in ("heat", "cool"):
+            count = pref[f"n_{hvac_mode}"] + 1
+            pref[hvac_mode], pref[f"m2_{hvac_mode}"] = welford(
+                count,
+                pref[hvac_mode] if count > 1 else 0.0,
+                pref[f"m2_{hvac_mode}"],
+                setpoint,
+            )
+            pref[f"n_{hvac_mode}"] = count
+
         pref["count"] += 1
         _LOGGER.debug("Updated preference for context %s: %s", context, pref)
 
+    def update_preferences(
+        self,
+        contexts: Sequence[tuple],
+        hvac_modes: Sequence[str],
+        setpoints: Sequence[float],
+    ) -> None:
+        """Apply many setpoint changes, in order, with one vectorised pass.
+
+        Gives the same means, counts and variances as calling
+        update_preference() for each change.
+        """
+        if not contexts:
+            return
+
+        import numpy as np
+
+        keys = list(dict.fromkeys(contexts))
+        key_index = {key: index for index, key in enumerate(keys)}
+        groups = np.fromiter((key_index[context] for context in contexts), dtype=np.intp, count=len(contexts))
+        modes = np.asarray(hvac_modes)
+        values = np.asarray(setpoints, dtype=float)
+        prefs = [self.preferences.setdefault(key, dict(DEFAULT_PREFERENCE)) for key in keys]
+
+        for mode in ("heat", "cool"):
+            selected = modes == mode
+            if not selected.any():
+                continue
+            counts = np.array([pref[f"n_{mode}"] for pref in prefs])
+            counts, means, m2 = grouped_welford(
+                groups[selected],
+                values[selected],
+                counts,
+                np.array([pref[mode] if pref[f"n_{mode}"] else 0.0 for pref in prefs]),
+                np.array([pref[f"m2_{mode}"] for pref in prefs]),
+            )
+            for pref, count, mean, spread in zip(prefs, counts.tolist(), means.tolist(), m2.tolist()):
+                if count:
+                    pref[mode], pref[f"m2_{mode}"], pref[f"n_{mode}"] = mean, spread, count
+
+        for pref, count in zip(prefs, np.bincount(groups, minlength=len(keys)).tolist()):
+            pref["count"] += count
+        _LOGGER.debug("Applied %s setpoint changes across %s contexts", len(values), len(keys))
+
     def get_preference(self, context: tuple) -> dict[str, float]:
         """Get the preferred setpoints for a context."""
-        return self.preferences.get(context, {"heat": 21.0, "cool": 24.0, "count": 0})
+        return self.preferences.get(context) or dict(DEFAULT_PREFERENCE)
+
+    def get_variance(self, context: tuple, hvac_mode: str) -> float | None:
+        """Return the spread of the setpoints learned for a context and mode."""
+        pref = self.preferences.get(context)
+        if pref is None or hvac_mode not in ("heat", "cool") or pref[f"n_{hvac_mode}"] < 2:
+            return None
+        return pref[f"m2_{hvac_mode}"] / (pref[f"n_{hvac_mode}"] - 1)
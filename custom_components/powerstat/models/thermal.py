@@ -2,28 +2,182 @@
 from __future__ import annotations
 
 import logging
+import math
+from array import array
+from collections.abc import Iterable, Sequence
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+from ..const import (
+    THERMAL_BAND_MIN,
+    THERMAL_BAND_WIDTH,
+    THERMAL_BAND_COUNT,
+    THERMAL_TIME_BUCKETS,
+    THERMAL_MIN_CELL_SAMPLES,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .episodes import Episode
 
 _LOGGER = logging.getLogger(__name__)
 
+THERMAL_MODES = ("heat", "cool", "off")  # "off" learns the passive drift
+
+def welford(count: int, mean: float, m2: float, value: float) -> tuple[float, float]:
+    """Fold one value into a running mean and sum of squared deviations.
+
+    `count` includes the new value. Returns the updated (mean, m2); the
+    sample variance is m2 / (count - 1).
+    """
+    delta = value - mean
+    mean += delta / count
+    return mean, m2 + delta * (value - mean)
+
+def grouped_ema(
+    groups: np.ndarray,
+    values: np.ndarray,
+    current: np.ndarray,
+    samples: np.ndarray,
+    alpha: float,
+) -> np.ndarray:
+    """Fold values into per-group EMAs in one pass, as sequential updates would.
+
+    After n further samples a value keeps weight (1 - alpha)^n, and the k-th
+    of them weight alpha * (1 - alpha)^(n - 1 - k). A group without earlier
+    samples starts from its first value, which therefore keeps weight
+    (1 - alpha)^(n - 1).
+    """
+    import numpy as np
+
+    size = len(current)
+    decay = 1 - alpha
+    order = np.argsort(groups, kind="stable")
+    groups, values = groups[order], values[order]
+    counts = np.bincount(groups, minlength=size)
+    position = np.arange(len(groups)) - (np.cumsum(counts) - counts)[groups]
+    weights = np.exp(math.log(decay) * (counts[groups] - 1 - position))
+    seeds = (position == 0) & (samples[groups] == 0)
+    weights[~seeds] *= alpha
+    carried = np.where(samples > 0, current * decay**counts, 0.0)
+    return np.where(
+        counts > 0, carried + np.bincount(groups, weights * values, minlength=size), current
+    )
+
+def grouped_welford(
+    groups: np.ndarray,
+    values: np.ndarray,
+    counts: np.ndarray,
+    means: np.ndarray,
+    m2: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge a batch into per-group (count, mean, M2) using Chan's formula."""
+    import numpy as np
+
+    size = len(counts)
+    batch_counts = np.bincount(groups, minlength=size)
+    has_batch = batch_counts > 0
+    batch_means = np.divide(
+        np.bincount(groups, values, minlength=size),
+        batch_counts,
+        out=np.zeros(size),
+        where=has_batch,
+    )
+    batch_m2 = np.bincount(groups, (values - batch_means[groups]) ** 2, minlength=size)
+
+    total = counts + batch_counts
+    share = np.divide(batch_counts, total, out=np.zeros(size), where=total > 0)
+    delta = batch_means - means
+    return (
+        total,
+        np.where(has_batch, means + delta * share, means),
+        np.where(has_batch, m2 + batch_m2 + delta**2 * counts * share, m2),
+    )
+
 class ThermalModel:
-    """Tracks heat/cool rates (°C/min) using exponential moving average."""
+    """Tracks heat/cool rates (°C/min) using exponential moving average.
+
+    The passive drift with the system off is learned the same way, so the
+    forecast can tell when the house will warm or cool by itself. Besides
+    the global rates, every (outdoor band, time-of-day bucket, mode)
+    cell keeps its own EMA and sample count in flat fixed-size arrays. Cells
+    with few samples borrow from their neighbours and the global rate.
+
+    Alongside each EMA a Welford mean and M2 track how much the observed
+    rates spread, which feeds the plan confidence. numpy is only imported
+    by the batch paths, so a model that is never refit or scored doesn't
+    load it.
+    """
 
     def __init__(self, learning_rate: float = 0.1) -> None:
         """Initialize model."""
         self.learning_rate = learning_rate
+        # Bumped on every change, so caches built from the rates can tell
+        self.version = 0
         self.heat_rate = 0.0  # °C/min
         self.cool_rate = 0.0  # °C/min
+        self.drift_rate = 0.0  # °C/min with the system off
         self.samples_heat = 0
         self.samples_cool = 0
+        self.samples_off = 0
+        # Welford (mean, M2) per mode, indexed like THERMAL_MODES
+        self.rate_means = [0.0] * len(THERMAL_MODES)
+        self.rate_m2 = [0.0] * len(THERMAL_MODES)
+        cells = THERMAL_BAND_COUNT * THERMAL_TIME_BUCKETS * len(THERMAL_MODES)
+        self.cell_rates = array("d", bytes(8 * cells))
+        self.cell_samples = array("I", bytes(4 * cells))
+        self.cell_means = array("d", bytes(8 * cells))
+        self.cell_m2 = array("d", bytes(8 * cells))
+
+    @staticmethod
+    def _band(outdoor_temp: float) -> int:
+        """Return the outdoor temperature band, clamped to the edge bands."""
+        band = int((outdoor_temp - THERMAL_BAND_MIN) // THERMAL_BAND_WIDTH)
+        return min(max(band, 0), THERMAL_BAND_COUNT - 1)
+
+    @staticmethod
+    def _bucket(when: datetime) -> int:
+        """Return the time-of-day bucket of a local time."""
+        return (when.hour * THERMAL_TIME_BUCKETS) // 24
+
+    @staticmethod
+    def _cell(mode_index: int, band: int, bucket: int) -> int:
+        """Return the flat array index of a cell."""
+        return (mode_index * THERMAL_BAND_COUNT + band) * THERMAL_TIME_BUCKETS + bucket
 
-    def update(self, mode: str, delta_temp: float, delta_time_mins: float) -> None:
+    def update(
+        self,
+        mode: str,
+        delta_temp: float,
+        delta_time_mins: float,
+        outdoor_temp: float | None = None,
+        when: datetime | None = None,
+    ) -> None:
         """Update the model with a new measurement."""
         if delta_time_mins <= 0:
             return
 
         rate = delta_temp / delta_time_mins
+        if mode in THERMAL_MODES:
+            self.version += 1
+
+        if mode in THERMAL_MODES and outdoor_temp is not None and when is not None:
+            cell = self._cell(
+                THERMAL_MODES.index(mode), self._band(outdoor_temp), self._bucket(when)
+            )
+            if self.cell_samples[cell] == 0:
+                self.cell_rates[cell] = rate
+            else:
+                self.cell_rates[cell] = (
+                    self.learning_rate * rate + (1 - self.learning_rate) * self.cell_rates[cell]
+                )
+            self.cell_samples[cell] += 1
+            self.cell_means[cell], self.cell_m2[cell] = welford(
+                self.cell_samples[cell], self.cell_means[cell], self.cell_m2[cell], rate
+            )
 
         if mode == "heat":
             if self.samples_heat == 0:
@@ -31,6 +185,9 @@ class ThermalModel:
             else:
                 self.heat_rate = (self.learning_rate * rate) + ((1 - self.learning_rate) * self.heat_rate)
             self.samples_heat += 1
+            self.rate_means[0], self.rate_m2[0] = welford(
+                self.samples_heat, self.rate_means[0], self.rate_m2[0], rate
+            )
             _LOGGER.debug("Updated heat_rate: %s", self.heat_rate)
             
         elif mode == "cool":
@@ -41,13 +198,206 @@ class ThermalModel:
             else:
                 self.cool_rate = (self.learning_rate * rate) + ((1 - self.learning_rate) * self.cool_rate)
             self.samples_cool += 1
+            self.rate_means[1], self.rate_m2[1] = welford(
+                self.samples_cool, self.rate_means[1], self.rate_m2[1], rate
+            )
             _LOGGER.debug("Updated cool_rate: %s", self.cool_rate)
 
+        elif mode == "off":
+            if self.samples_off == 0:
+                self.drift_rate = rate
+            else:
+                self.drift_rate = (self.learning_rate * rate) + ((1 - self.learning_rate) * self.drift_rate)
+            self.samples_off += 1
+            self.rate_means[2], self.rate_m2[2] = welford(
+                self.samples_off, self.rate_means[2], self.rate_m2[2], rate
+            )
+            _LOGGER.debug("Updated drift_rate: %s", self.drift_rate)
+
+    def update_batch(
+        self,
+        modes: Sequence[str],
+        delta_temps: Sequence[float],
+        delta_times_mins: Sequence[float],
+        outdoor_temps: Sequence[float] | None = None,
+        hours: Sequence[int] | None = None,
+    ) -> None:
+        """Apply many measurements, in order, with one vectorised pass.
+
+        Gives the same rates, counts and variances as calling update() for
+        each sample. Outdoor temperatures are NaN where unknown; hours are
+        the local hour of each sample.
+        """
+        import numpy as np
+
+        modes = np.asarray(modes)
+        delta_times = np.asarray(delta_times_mins, dtype=float)
+        mode_index = np.full(len(modes), -1)
+        for index, mode in enumerate(THERMAL_MODES):
+            mode_index[modes == mode] = index
+        keep = (delta_times > 0) & (mode_index >= 0)
+        mode_index = mode_index[keep]
+        rates = np.asarray(delta_temps, dtype=float)[keep] / delta_times[keep]
+        if not len(rates):
+            return
+        self.version += 1
+
+        samples = np.array([self.samples_heat, self.samples_cool, self.samples_off])
+        heat_rate, cool_rate, drift_rate = grouped_ema(
+            mode_index,
+            rates,
+            np.array([self.heat_rate, self.cool_rate, self.drift_rate]),
+            samples,
+            self.learning_rate,
+        )
+        counts, means, m2 = grouped_welford(
+            mode_index, rates, samples, np.array(self.rate_means), np.array(self.rate_m2)
+        )
+        self.heat_rate, self.cool_rate = float(heat_rate), float(cool_rate)
+        self.drift_rate = float(drift_rate)
+        self.samples_heat, self.samples_cool, self.samples_off = (int(count) for count in counts)
+        self.rate_means, self.rate_m2 = means.tolist(), m2.tolist()
+
+        if outdoor_temps is not None and hours is not None:
+            outdoor = np.asarray(outdoor_temps, dtype=float)[keep]
+            known = ~np.isnan(outdoor)
+            band = np.clip(
+                np.floor_divide(outdoor[known] - THERMAL_BAND_MIN, THERMAL_BAND_WIDTH),
+                0,
+                THERMAL_BAND_COUNT - 1,
+            ).astype(int)
+            bucket = np.asarray(hours, dtype=int)[keep][known] * THERMAL_TIME_BUCKETS // 24
+            cells = (mode_index[known] * THERMAL_BAND_COUNT + band) * THERMAL_TIME_BUCKETS + bucket
+            cell_rates = np.frombuffer(self.cell_rates, dtype=np.float64)
+            cell_samples = np.frombuffer(self.cell_samples, dtype=np.uintc)
+            cell_means = np.frombuffer(self.cell_means, dtype=np.float64)
+            cell_m2 = np.frombuffer(self.cell_m2, dtype=np.float64)
+
+            cell_rates[:] = grouped_ema(
+                cells, rates[known], cell_rates, cell_samples, self.learning_rate
+            )
+            counts, cell_means[:], cell_m2[:] = grouped_welford(
+                cells, rates[known], cell_samples.astype(np.int64), cell_means, cell_m2
+            )
+            cell_samples[:] = counts
+
+        _LOGGER.debug("Applied %s samples: %s", len(rates), self.get_rates())
+
+    def predict_rate(
+        self,
+        mode: str,
+        outdoor_temp: float | None = None,
+        when: datetime | None = None,
+    ) -> float:
+        """Return the expected rate (°C/min) for a mode in the given conditions."""
+        if mode == "heat":
+            global_rate = self.heat_rate
+        elif mode == "cool":
+            global_rate = self.cool_rate
+        elif mode == "off":
+            global_rate = self.drift_rate
+        else:
+            return 0.0
+
+        if outdoor_temp is None or when is None:
+            return global_rate
+
+        mode_index = THERMAL_MODES.index(mode)
+        band = self._band(outdoor_temp)
+        bucket = self._bucket(when)
+        cell = self._cell(mode_index, band, bucket)
+        if self.cell_samples[cell] >= THERMAL_MIN_CELL_SAMPLES:
+            return self.cell_rates[cell]
+
+        # Sparse cell: pool the 3x3 neighbourhood (time wraps around midnight)
+        # and shrink towards the global rate with a fixed prior weight.
+        weighted = THERMAL_MIN_CELL_SAMPLES * global_rate
+        total = THERMAL_MIN_CELL_SAMPLES
+        for near_band in range(max(band - 1, 0), min(band + 2, THERMAL_BAND_COUNT)):
+            for offset in (-1, 0, 1):
+                near = self._cell(mode_index, near_band, (bucket + offset) % THERMAL_TIME_BUCKETS)
+                samples = self.cell_samples[near]
+                if samples:
+                    weighted += samples * self.cell_rates[near]
+                    total += samples
+        return weighted / total
+
+    def rate_table(self) -> np.ndarray:
+        """Return predicted rates for every (mode, outdoor band, time bucket).
+
+        Bands are evaluated at their centre; the result is what predict_rate
+        gives for any temperature and hour falling into that cell.
+        """
+        import numpy as np
+
+        table = np.zeros((len(THERMAL_MODES), THERMAL_BAND_COUNT, THERMAL_TIME_BUCKETS))
+        for mode_index, mode in enumerate(THERMAL_MODES):
+            for band in range(THERMAL_BAND_COUNT):
+                outdoor = THERMAL_BAND_MIN + (band + 0.5) * THERMAL_BAND_WIDTH
+                for bucket in range(THERMAL_TIME_BUCKETS):
+                    when = datetime(2000, 1, 1, bucket * 24 // THERMAL_TIME_BUCKETS)
+                    table[mode_index, band, bucket] = self.predict_rate(mode, outdoor, when)
+        return table
+
+    def rate_stats(
+        self,
+        mode: str,
+        outdoor_temp: float | None = None,
+        when: datetime | None = None,
+    ) -> tuple[int, float | None]:
+        """Return (samples, variance) behind the rate predicted for a mode.
+
+        Uses the context cell once it has enough samples to be predicted on
+        its own, otherwise the global statistics. Variance is None below two
+        samples.
+        """
+        if mode not in THERMAL_MODES:
+            return 0, None
+
+        mode_index = THERMAL_MODES.index(mode)
+        if outdoor_temp is not None and when is not None:
+            cell = self._cell(mode_index, self._band(outdoor_temp), self._bucket(when))
+            samples = self.cell_samples[cell]
+            if samples >= THERMAL_MIN_CELL_SAMPLES:
+                return samples, self.cell_m2[cell] / (samples - 1)
+
+        samples = (self.samples_heat, self.samples_cool, self.samples_off)[mode_index]
+        if samples < 2:
+            return samples, None
+        return samples, self.rate_m2[mode_index] / (samples - 1)
+
+    def refit(self, episodes: Iterable[Episode]) -> None:
+        """Rebuild the rates from scratch using logged episodes."""
+        self.version += 1
+        self.heat_rate = 0.0
+        self.cool_rate = 0.0
+        self.drift_rate = 0.0
+        self.samples_heat = 0
+        self.samples_cool = 0
+        self.samples_off = 0
+        self.rate_means = [0.0] * len(THERMAL_MODES)
+        self.rate_m2 = [0.0] * len(THERMAL_MODES)
+        for cells in (self.cell_rates, self.cell_samples, self.cell_means, self.cell_m2):
+            cells[:] = array(cells.typecode, bytes(cells.itemsize * len(cells)))
+
+        episodes = list(episodes)
+        if not episodes:
+            return
+        self.update_batch(
+            [episode.mode for episode in episodes],
+            [episode.indoor_end - episode.indoor_start for episode in episodes],
+            [episode.runtime for episode in episodes],
+            [math.nan if episode.outdoor_avg is None else episode.outdoor_avg for episode in episodes],
+            [dt_util.as_local(dt_util.utc_from_timestamp(episode.start)).hour for episode in episodes],
+        )
+
     def get_rates(self) -> dict[str, float]:
         """Return current estimated rates."""
         return {
             "heat_rate": round(self.heat_rate, 4),
             "cool_rate": round(self.cool_rate, 4),
+            "drift_rate": round(self.drift_rate, 4),
             "samples_heat": self.samples_heat,
             "samples_cool": self.samples_cool,
+            "samples_off": self.samples_off,
         }
@@ -0,0 +1,259 @@
+"""On-demand profiling of PowerStat's own code paths."""
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import re
+import tracemalloc
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DATA_PROFILE_SESSION,
+    PROFILE_DEFAULT_CYCLES,
+    PROFILE_MAX_DURATION,
+    PROFILE_TOP_ENTRIES,
+    PROFILE_TRACE_FRAMES,
+    SERVICE_PROFILE,
+)
+from .coordinator import PowerStatCoordinator
+from .engine.planner import PowerStatPlanner
+from .engine.rules import PowerStatRules
+
+_LOGGER = logging.getLogger(__name__)
+
+PACKAGE_DIR = os.path.dirname(__file__)
+# Report only the package's own frames, leaving out this module
+REPORT_PATTERN = rf"^{re.escape(PACKAGE_DIR + os.sep)}(?!profiler\.py)"
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("cycles", default=PROFILE_DEFAULT_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional("duration", default=PROFILE_MAX_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=PROFILE_MAX_DURATION)
+        ),
+    }
+)
+
+@callback
+def async_register_profile_service(hass: HomeAssistant) -> None:
+    """Register the powerstat.profile service."""
+
+    async def _async_profile(call: ServiceCall) -> None:
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        if domain_data.get(DATA_PROFILE_SESSION) is not None:
+            raise HomeAssistantError("A PowerStat profile is already running")
+
+        coordinators = [
+            coordinator
+            for coordinator in domain_data.values()
+            if isinstance(coordinator, PowerStatCoordinator)
+        ]
+        if not coordinators:
+            raise HomeAssistantError("No PowerStat entries are loaded")
+
+        session = ProfileSession(hass, coordinators, call.data["cycles"], call.data["duration"])
+        domain_data[DATA_PROFILE_SESSION] = session
+        session.async_start()
+
+    hass.services.async_register(DOMAIN, SERVICE_PROFILE, _async_profile, schema=PROFILE_SCHEMA)
+
+class ProfileSession:
+    """cProfile and tracemalloc capture around the synchronous stages of a cycle.
+
+    cProfile only sees one thread and keeps counting across an await, so
+    it is switched on only where nothing else can run on the event loop:
+    the state snapshot, the planner (which never awaits), the rule pipeline
+    and `async_update_listeners`, inside which sensor states are written.
+    Time spent waiting on service calls or the executor is not in the
+    report. The coordinators' methods are shadowed by instance attributes
+    and the planner and rules methods are wrapped on their classes, so
+    shadow planners are covered too. Stopping removes every hook, so
+    nothing is left in the call path when no session runs. The report only
+    lists code in this package.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: list[PowerStatCoordinator],
+        cycles: int,
+        duration: float,
+    ) -> None:
+        """Initialize the session."""
+        self.hass = hass
+        self.coordinators = coordinators
+        self.cycles = cycles
+        self.duration = duration
+        self.cycles_done = 0
+        self.profiler = cProfile.Profile()
+        self._depth = 0
+        self._started_tracing = False
+        self._started_at = dt_util.utcnow()
+        self._cancel_timer: CALLBACK_TYPE | None = None
+        self._class_methods: list[tuple[type, str, Any]] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Hook the coordinators and start tracing allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACE_FRAMES)
+            self._started_tracing = True
+
+        for coordinator in self.coordinators:
+            self._hook(coordinator)
+        self._hook_classes()
+
+        self._cancel_timer = async_call_later(
+            self.hass, timedelta(seconds=self.duration), self._async_timeout
+        )
+        _LOGGER.info(
+            "Profiling PowerStat for %s cycles or %ss", self.cycles, round(self.duration)
+        )
+
+    def _hook(self, coordinator: PowerStatCoordinator) -> None:
+        """Shadow a coordinator's methods to count cycles and profile its stages."""
+        update_data = coordinator._async_update_data
+
+        async def _counted_update_data() -> dict[str, Any]:
+            try:
+                return await update_data()
+            finally:
+                self.cycles_done += 1
+                if self.cycles_done >= self.cycles:
+                    self.hass.async_create_task(self.async_stop())
+
+        coordinator._async_update_data = _counted_update_data
+        coordinator._gather_state_snapshot = self._profiled(coordinator._gather_state_snapshot)
+        coordinator.async_update_listeners = callback(
+            self._profiled(coordinator.async_update_listeners)
+        )
+
+    def _hook_classes(self) -> None:
+        """Wrap the planner and rules on their classes; instances come and go."""
+        calculate_plan = PowerStatPlanner.async_calculate_plan
+
+        async def _profiled_calculate_plan(planner: PowerStatPlanner) -> dict[str, Any]:
+            self._enter()
+            try:
+                return await calculate_plan(planner)
+            finally:
+                self._exit()
+
+        self._class_methods = [
+            (PowerStatPlanner, "async_calculate_plan", calculate_plan),
+            (PowerStatRules, "validate_action", PowerStatRules.validate_action),
+        ]
+        PowerStatPlanner.async_calculate_plan = _profiled_calculate_plan
+        PowerStatRules.validate_action = self._profiled(PowerStatRules.validate_action)
+
+    def _profiled(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a synchronous function wrapped to run under the profiler."""
+
+        @functools.wraps(function)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            self._enter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._exit()
+
+        return _wrapper
+
+    def _enter(self) -> None:
+        """Enable the profiler for the outermost hooked call."""
+        if self._depth == 0:
+            self.profiler.enable()
+        self._depth += 1
+
+    def _exit(self) -> None:
+        """Disable the profiler when the outermost hooked call returns."""
+        self._depth -= 1
+        if self._depth == 0:
+            self.profiler.disable()
+
+    @callback
+    def _async_timeout(self, _now: Any) -> None:
+        """Stop when the duration has passed."""
+        self._cancel_timer = None
+        self.hass.async_create_task(self.async_stop())
+
+    async def async_stop(self) -> None:
+        """Unhook, snapshot allocations and write the report."""
+        domain_data = self.hass.data.get(DOMAIN, {})
+        if domain_data.get(DATA_PROFILE_SESSION) is not self:
+            return
+        domain_data.pop(DATA_PROFILE_SESSION)
+
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+        for coordinator in self.coordinators:
+            for name in ("_async_update_data", "_gather_state_snapshot", "async_update_listeners"):
+                coordinator.__dict__.pop(name, None)
+        for owner, name, method in self._class_methods:
+            setattr(owner, name, method)
+        self._class_methods = []
+        if self._depth:
+            self.profiler.disable()
+            self._depth = 0
+
+        path = self.hass.config.path(
+            f"powerstat_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        try:
+            await self.hass.async_add_executor_job(self._write_report, path)
+        except OSError as err:
+            _LOGGER.error("Failed to write PowerStat profile: %s", err)
+            return
+        _LOGGER.info("Wrote PowerStat profile of %s cycles to %s", self.cycles_done, path)
+
+    def _write_report(self, path: str) -> None:
+        """Snapshot allocations, format and write the report; runs in an executor thread.
+
+        Taking and filtering the snapshot walks every traced block, which is
+        far too slow for the event loop.
+        """
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        elapsed = (dt_util.utcnow() - self._started_at).total_seconds()
+        stream = io.StringIO()
+        stream.write(
+            f"PowerStat profile: {self.cycles_done} cycles over {elapsed:.1f}s, "
+            f"{len(self.coordinators)} entries\n\n"
+            f"Top {PROFILE_TOP_ENTRIES} functions by cumulative time\n"
+        )
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            REPORT_PATTERN, PROFILE_TOP_ENTRIES
+        )
+
+        stream.write(f"\nTop {PROFILE_TOP_ENTRIES} allocation sites\n")
+        owned = snapshot.filter_traces(
+            [
+                tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*")),
+                tracemalloc.Filter(False, __file__),
+            ]
+        )
+        for statistic in owned.statistics("lineno")[:PROFILE_TOP_ENTRIES]:
+            stream.write(f"{statistic}\n")
+
+        with open(path, "w", encoding="utf-8") as report:
+            report.write(stream.getvalue())
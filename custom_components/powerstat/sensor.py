@@ -10,12 +10,14 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, PERCENTAGE
+from homeassistant.const import UnitOfTemperature, UnitOfTime, PERCENTAGE
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, ATTR_PLAN
+from .engine.breaker import BREAKER_HALF_OPEN, BREAKER_OPEN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +38,10 @@ async def async_setup_entry(
         PowerStatOutdoorHumiditySensor(coordinator),
         PowerStatWindowStatusSensor(coordinator),
         PowerStatForecastTrendSensor(coordinator),
+        PowerStatRuntimeTodaySensor(coordinator),
+        PowerStatCyclesPerHourSensor(coordinator),
+        PowerStatAverageRunSensor(coordinator),
+        PowerStatShortCyclesPreventedSensor(coordinator),
     ]
     
     async_add_entities(sensors)
@@ -62,10 +68,34 @@ class PowerStatStatusSensor(PowerStatBaseSensor):
     def native_value(self) -> str:
         """Return the state of the sensor."""
         plan = self.coordinator.data.get("plan")
+        breaker = self.coordinator.data.get("breaker", {})
+        if breaker.get("state") == BREAKER_OPEN:
+            return "Offline"
+        if breaker.get("state") == BREAKER_HALF_OPEN:
+            return "Reconnecting"
+        if plan and plan.get("rule") == "manual_hold":
+            return "Manual Hold"
         if plan and plan.get("blocked"):
             return "Suspended"
+        if plan and plan.get("rule") in ("window_pause", "load_shed"):
+            return "Paused"
         return "Idle"
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the actuation circuit breaker state."""
+        breaker = self.coordinator.data.get("breaker", {})
+        retry_at = breaker.get("retry_at")
+
+        return {
+            "breaker_state": breaker.get("state"),
+            "breaker_failures": breaker.get("failures", 0),
+            "breaker_retry_at": (
+                dt_util.utc_from_timestamp(retry_at).isoformat() if retry_at else None
+            ),
+            "breaker_last_error": breaker.get("last_error"),
+        }
+
 class PowerStatEffectiveTempSensor(PowerStatBaseSensor):
     """Sensor that shows the calculated weighted temperature."""
 
@@ -95,6 +125,18 @@ class PowerStatReasonSensor(PowerStatBaseSensor):
             return plan.get("reason", "Waiting")
         return "Initializing"
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return excluded sensors and the rule trace behind the decision."""
+        snapshot = self.coordinator.data.get("snapshot", {})
+        plan = self.coordinator.data.get("plan") or {}
+
+        return {
+            "rejected_sensors": snapshot.get("rejected_sensors", {}),
+            "stale_sensors": snapshot.get("stale_sensors", []),
+            "rules": plan.get("rules", []),
+        }
+
 class PowerStatConfidenceSensor(PowerStatBaseSensor):
     """Sensor that shows the confidence score of the current plan."""
 
@@ -109,6 +151,25 @@ class PowerStatConfidenceSensor(PowerStatBaseSensor):
             return plan.get("confidence", 0)
         return 0
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the breakdown behind the score."""
+        plan = self.coordinator.data.get("plan") or {}
+        snapshot = self.coordinator.data.get("snapshot", {})
+        estimate = snapshot.get("estimate") or {}
+        breakdown = {
+            key: value
+            for key, value in snapshot.get("confidence", {}).items()
+            if key != "score"
+        }
+
+        return {
+            **breakdown,
+            "low_confidence": plan.get("low_confidence", False),
+            "uncertainty": plan.get("uncertainty"),
+            "sensor_noise": estimate.get("sensor_noise", {}),
+        }
+
 class PowerStatOutdoorTempSensor(PowerStatBaseSensor):
     """Sensor that shows outdoor temperature."""
 
@@ -195,8 +256,71 @@ class PowerStatForecastTrendSensor(PowerStatBaseSensor):
         env = snapshot.get("environment", {})
         forecast = env.get("forecast", {})
         
+        plan = self.coordinator.data.get("plan") or {}
+        
         return {
             "temp_in_2h": forecast.get("temp_in_2h"),
             "temp_in_4h": forecast.get("temp_in_4h"),
             "trending": forecast.get("trending"),
+            "free_windows": [
+                {
+                    **window,
+                    "start": dt_util.utc_from_timestamp(window["start"]).isoformat(),
+                    "end": dt_util.utc_from_timestamp(window["end"]).isoformat(),
+                }
+                for window in plan.get("free_windows", [])
+            ],
         }
+
+class PowerStatRuntimeTodaySensor(PowerStatBaseSensor):
+    """Sensor that shows how long the HVAC has run since local midnight."""
+
+    _attr_name = "PowerStat Runtime Today"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("runtime", {}).get("runtime_today")
+
+class PowerStatCyclesPerHourSensor(PowerStatBaseSensor):
+    """Sensor that shows how often the HVAC starts a run."""
+
+    _attr_name = "PowerStat Cycles Per Hour"
+    _attr_icon = "mdi:sync"
+    _attr_native_unit_of_measurement = "cycles/h"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("runtime", {}).get("cycles_per_hour")
+
+class PowerStatAverageRunSensor(PowerStatBaseSensor):
+    """Sensor that shows the average length of recent runs."""
+
+    _attr_name = "PowerStat Average Run Length"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("runtime", {}).get("average_run")
+
+class PowerStatShortCyclesPreventedSensor(PowerStatBaseSensor):
+    """Sensor that counts short cycles blocked by the min on/off rules today."""
+
+    _attr_name = "PowerStat Short Cycles Prevented"
+    _attr_icon = "mdi:shield-check-outline"
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the sensor."""
+        return self.coordinator.data.get("runtime", {}).get("short_cycles_prevented", 0)
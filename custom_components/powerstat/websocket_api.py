@@ -0,0 +1,104 @@
+"""Websocket API for PowerStat."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import PowerStatCoordinator
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the PowerStat websocket commands."""
+    websocket_api.async_register_command(hass, ws_history)
+    websocket_api.async_register_command(hass, ws_subscribe_history)
+    websocket_api.async_register_command(hass, ws_shadow)
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> PowerStatCoordinator | None:
+    """Return the coordinator for a config entry, if loaded."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if isinstance(coordinator, PowerStatCoordinator):
+        return coordinator
+    return None
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "powerstat/history",
+        vol.Required("entry_id"): str,
+        vol.Optional("start"): vol.Coerce(float),
+        vol.Optional("end"): vol.Coerce(float),
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@callback
+def ws_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return a window of decision records."""
+    coordinator = _get_coordinator(hass, msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not loaded")
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "records": coordinator.history.window(
+                msg.get("start"), msg.get("end"), msg.get("limit")
+            )
+        },
+    )
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "powerstat/history/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("start"): vol.Coerce(float),
+    }
+)
+@callback
+def ws_subscribe_history(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Send the current window, then push each new decision record."""
+    coordinator = _get_coordinator(hass, msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not loaded")
+        return
+
+    @callback
+    def _async_forward(record: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], {"records": [record]}))
+
+    connection.subscriptions[msg["id"]] = coordinator.history.async_subscribe(_async_forward)
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"records": coordinator.history.window(msg.get("start"))}
+        )
+    )
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "powerstat/shadow",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_shadow(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return shadow planner totals and recent records."""
+    coordinator = _get_coordinator(hass, msg["entry_id"])
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Entry not loaded")
+        return
+    if coordinator.shadow is None:
+        connection.send_result(msg["id"], {"totals": {}, "skipped": 0, "records": []})
+        return
+
+    connection.send_result(msg["id"], coordinator.shadow.as_dict())
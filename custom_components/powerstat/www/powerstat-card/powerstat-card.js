@@ -1,4 +1,4 @@
-console.info("%c POWERSTAT-CARD %c v0.2.0 ", "color: white; background: #007aff; font-weight: 700;", "color: #007aff; background: white; font-weight: 700;");
+console.info("%c POWERSTAT-CARD %c v0.3.0 ", "color: white; background: #007aff; font-weight: 700;", "color: #007aff; background: white; font-weight: 700;");
 
 class PowerStatCard extends HTMLElement {
   set hass(hass) {
@@ -8,23 +8,36 @@ class PowerStatCard extends HTMLElement {
 
     // Handle missing entity configuration
     if (!this.config || !this.config.entity) {
-      this._renderPlaceholder();
+      if (this._view !== 'placeholder') {
+        this._renderPlaceholder();
+      }
       return;
     }
 
     const entityId = this.config.entity;
     const stateObj = hass.states[entityId];
-    
+    const tempObj = hass.states[entityId.replace('_status', '_effective_temperature')];
+    const reasonObj = hass.states[entityId.replace('_status', '_reason')];
+    const confidenceObj = hass.states[entityId.replace('_status', '_confidence')];
+
+    // Home Assistant replaces state objects on change, so identity is enough
+    // to skip the updates for every other entity in the instance.
+    if (
+      this._view === 'main' &&
+      stateObj === this._stateObj &&
+      tempObj === this._tempObj &&
+      reasonObj === this._reasonObj &&
+      confidenceObj === this._confidenceObj
+    ) {
+      return;
+    }
+    this._stateObj = stateObj;
+    this._tempObj = tempObj;
+    this._reasonObj = reasonObj;
+    this._confidenceObj = confidenceObj;
+
     // Get all sensor data
     const status = stateObj ? stateObj.state : 'Unknown';
-    const tempEntityId = entityId.replace('_status', '_effective_temperature');
-    const reasonEntityId = entityId.replace('_status', '_reason');
-    const confidenceEntityId = entityId.replace('_status', '_confidence');
-    
-    const tempObj = hass.states[tempEntityId];
-    const reasonObj = hass.states[reasonEntityId];
-    const confidenceObj = hass.states[confidenceEntityId];
-    
     const temp = tempObj ? parseFloat(tempObj.state) : null;
     const reason = reasonObj ? reasonObj.state : 'Monitoring';
     const confidence = confidenceObj ? parseInt(confidenceObj.state) : 0;
@@ -45,13 +58,11 @@ class PowerStatCard extends HTMLElement {
     this._initialized = true;
   }
 
-  _render(temp, targetTemp, status, reason, confidence, hvacMode) {
-    const statusColor = this._getStatusColor(status);
-    const modeIcon = this._getModeIcon(hvacMode);
-    
+  _build() {
     this._card.innerHTML = `
       <style>
         .powerstat-container {
+          --ps-color: #8e8e93;
           padding: 20px;
           background: linear-gradient(135deg, #1c1c1e 0%, #2c2c2e 100%);
           color: #fff;
@@ -97,7 +108,7 @@ class PowerStatCard extends HTMLElement {
           stroke: rgba(255, 255, 255, 0.1);
         }
         .temp-ring .ring-progress {
-          stroke: ${statusColor};
+          stroke: var(--ps-color);
           stroke-linecap: round;
           transition: stroke-dashoffset 0.5s ease, stroke 0.3s ease;
         }
@@ -124,11 +135,11 @@ class PowerStatCard extends HTMLElement {
           align-items: center;
           gap: 6px;
           padding: 4px 12px;
-          background: ${statusColor}22;
-          border: 1px solid ${statusColor};
+          background: var(--ps-color-faint);
+          border: 1px solid var(--ps-color);
           border-radius: 12px;
           font-size: 0.75rem;
-          color: ${statusColor};
+          color: var(--ps-color);
           margin-top: 8px;
         }
         .stats-grid {
@@ -158,7 +169,7 @@ class PowerStatCard extends HTMLElement {
           margin-top: 20px;
           padding: 12px;
           background: rgba(255, 255, 255, 0.06);
-          border-left: 3px solid ${statusColor};
+          border-left: 3px solid var(--ps-color);
           border-radius: 6px;
           font-size: 0.85rem;
           color: rgba(255, 255, 255, 0.9);
@@ -172,8 +183,8 @@ class PowerStatCard extends HTMLElement {
         }
         .confidence-fill {
           height: 100%;
-          background: linear-gradient(90deg, ${statusColor}, ${statusColor}aa);
-          width: ${confidence}%;
+          background: linear-gradient(90deg, var(--ps-color), var(--ps-color-soft));
+          width: 0%;
           transition: width 0.3s ease;
         }
       </style>
@@ -181,7 +192,7 @@ class PowerStatCard extends HTMLElement {
       <div class="powerstat-container">
         <div class="header">
           <div class="brand">PowerStat</div>
-          <img src="/local/powerstat-card/logo.png" class="logo" />
+          <img src="/powerstat/logo.png" class="logo" />
         </div>
         
         <div class="temp-display">
@@ -189,15 +200,15 @@ class PowerStatCard extends HTMLElement {
             <svg width="200" height="200" viewBox="0 0 200 200">
               <circle class="ring-bg" cx="100" cy="100" r="90"></circle>
               <circle class="ring-progress" cx="100" cy="100" r="90" 
-                      stroke-dasharray="${565}" 
-                      stroke-dashoffset="${this._calculateRingOffset(temp, targetTemp)}"></circle>
+                      stroke-dasharray="565" 
+                      stroke-dashoffset="565"></circle>
             </svg>
             <div class="temp-value">
-              <div class="current-temp">${temp !== null ? temp.toFixed(1) : '--'}°</div>
-              <div class="target-temp">Target: ${targetTemp}°C</div>
+              <div class="current-temp"></div>
+              <div class="target-temp"></div>
               <div class="mode-indicator">
-                <span>${modeIcon}</span>
-                <span>${hvacMode.toUpperCase()}</span>
+                <span class="mode-icon"></span>
+                <span class="mode-name"></span>
               </div>
             </div>
           </div>
@@ -206,22 +217,86 @@ class PowerStatCard extends HTMLElement {
         <div class="stats-grid">
           <div class="stat-card">
             <div class="stat-label">Status</div>
-            <div class="stat-value">${status}</div>
+            <div class="stat-value status-value"></div>
           </div>
           <div class="stat-card">
             <div class="stat-label">Confidence</div>
-            <div class="stat-value">${confidence}%</div>
+            <div class="stat-value confidence-value"></div>
           </div>
         </div>
         
         <div class="reason-bar">
-          <strong>Decision:</strong> ${reason}
+          <strong>Decision:</strong> <span class="reason-text"></span>
         </div>
         <div class="confidence-bar">
           <div class="confidence-fill"></div>
         </div>
       </div>
     `;
+
+    const find = (selector) => this._card.querySelector(selector);
+    this._els = {
+      container: find('.powerstat-container'),
+      ring: find('.ring-progress'),
+      currentTemp: find('.current-temp'),
+      targetTemp: find('.target-temp'),
+      modeIcon: find('.mode-icon'),
+      modeName: find('.mode-name'),
+      status: find('.status-value'),
+      confidence: find('.confidence-value'),
+      reason: find('.reason-text'),
+      confidenceFill: find('.confidence-fill'),
+    };
+    this._last = {};
+    this._view = 'main';
+  }
+
+  _render(temp, targetTemp, status, reason, confidence, hvacMode) {
+    if (this._view !== 'main') {
+      this._build();
+    }
+
+    const els = this._els;
+    const statusColor = this._getStatusColor(status);
+    const modeIcon = this._getModeIcon(hvacMode);
+
+    // Only touch the DOM for values that actually changed
+    this._patch('color', statusColor, () => {
+      els.container.style.setProperty('--ps-color', statusColor);
+      els.container.style.setProperty('--ps-color-faint', `${statusColor}22`);
+      els.container.style.setProperty('--ps-color-soft', `${statusColor}aa`);
+    });
+    this._patch('ring', this._calculateRingOffset(temp, targetTemp), (offset) => {
+      els.ring.setAttribute('stroke-dashoffset', offset);
+    });
+    this._patch('temp', temp !== null ? `${temp.toFixed(1)}°` : '--°', (text) => {
+      els.currentTemp.textContent = text;
+    });
+    this._patch('target', `Target: ${targetTemp}°C`, (text) => {
+      els.targetTemp.textContent = text;
+    });
+    this._patch('modeIcon', modeIcon, (text) => {
+      els.modeIcon.textContent = text;
+    });
+    this._patch('mode', hvacMode.toUpperCase(), (text) => {
+      els.modeName.textContent = text;
+    });
+    this._patch('status', status, (text) => {
+      els.status.textContent = text;
+    });
+    this._patch('confidence', confidence, (value) => {
+      els.confidence.textContent = `${value}%`;
+      els.confidenceFill.style.width = `${value}%`;
+    });
+    this._patch('reason', reason, (text) => {
+      els.reason.textContent = text;
+    });
+  }
+
+  _patch(key, value, apply) {
+    if (this._last[key] === value) return;
+    this._last[key] = value;
+    apply(value);
   }
 
   _calculateRingOffset(currentTemp, targetTemp) {
@@ -248,6 +323,7 @@ class PowerStatCard extends HTMLElement {
   }
 
   _renderPlaceholder() {
+    this._view = 'placeholder';
     this._card.innerHTML = `
       <style>
         .placeholder-container {
@@ -292,6 +368,9 @@ class PowerStatCard extends HTMLElement {
 
   setConfig(config) {
     this.config = config || {};
+    // Force a fresh render for the new entity on the next hass update
+    this._view = null;
+    this._stateObj = undefined;
   }
 
   getCardSize() {
@@ -0,0 +1,75 @@
+"""Tests for the PowerStat actuation circuit breaker."""
+from __future__ import annotations
+
+from custom_components.powerstat.const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_BACKOFF,
+)
+from custom_components.powerstat.engine.breaker import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+)
+
+def _tripped(now: float = 0.0) -> CircuitBreaker:
+    """Return a breaker opened by consecutive failures at `now`."""
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure(now, "unavailable")
+    return breaker
+
+def test_opens_after_threshold() -> None:
+    """Failures below the threshold keep the breaker closed."""
+    breaker = CircuitBreaker()
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(0.0, "unavailable")
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow(0.0)
+
+    breaker.record_failure(0.0, "timed out")
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.retry_at == BREAKER_BASE_BACKOFF
+    assert breaker.last_error == "timed out"
+    assert not breaker.allow(BREAKER_BASE_BACKOFF - 1)
+
+def test_success_resets_failures() -> None:
+    """Failures only trip the breaker when consecutive."""
+    breaker = CircuitBreaker()
+    for _ in range(3):
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            breaker.record_failure(0.0, "unavailable")
+        breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+    assert breaker.last_error is None
+
+def test_half_open_probe_success_closes() -> None:
+    """The first command after the backoff is a probe."""
+    breaker = _tripped()
+    assert breaker.allow(BREAKER_BASE_BACKOFF)
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.trips == 0
+    assert breaker.retry_at is None
+
+def test_half_open_probe_failure_doubles_backoff() -> None:
+    """A failed probe reopens at once, with the backoff doubled up to the cap."""
+    breaker = _tripped()
+    now = 0.0
+    backoff = BREAKER_BASE_BACKOFF
+    while backoff < BREAKER_MAX_BACKOFF:
+        now = breaker.retry_at
+        assert breaker.allow(now)
+        breaker.record_failure(now, "unavailable")
+        backoff = min(backoff * 2, BREAKER_MAX_BACKOFF)
+        assert breaker.state == BREAKER_OPEN
+        assert breaker.retry_at == now + backoff
+
+    now = breaker.retry_at
+    breaker.allow(now)
+    breaker.record_failure(now, "unavailable")
+    assert breaker.retry_at == now + BREAKER_MAX_BACKOFF
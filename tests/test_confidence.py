@@ -0,0 +1,89 @@
+"""Tests for the PowerStat plan confidence score."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from custom_components.powerstat.const import CONFIDENCE_LOW, CONFIDENCE_SAMPLE_PRIOR
+from custom_components.powerstat.engine.confidence import assess_confidence
+from custom_components.powerstat.models.learning import PreferenceModel
+from custom_components.powerstat.models.thermal import ThermalModel
+
+WHEN = datetime(2026, 1, 5, 8, 0)
+RUNS = 20
+
+def _heat_only() -> ThermalModel:
+    """Return a model that has only ever heated, at a steady rate."""
+    model = ThermalModel()
+    for _ in range(RUNS):
+        model.update("heat", 1.0, 20)
+    return model
+
+def _assess(
+    thermal_model: ThermalModel,
+    hvac_mode: str,
+    preference_model: PreferenceModel | None = None,
+    sensor_count: int = 2,
+    fresh_count: int = 2,
+    estimate: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Score a plan for the WHEN context without outdoor data."""
+    preference_model = preference_model or PreferenceModel()
+    context = preference_model.get_context(WHEN, "home", True)
+    return assess_confidence(
+        thermal_model,
+        preference_model,
+        context,
+        hvac_mode,
+        None,
+        WHEN,
+        sensor_count,
+        fresh_count,
+        estimate,
+    )
+
+def test_idle_scores_the_trained_mode() -> None:
+    """A heat-only house is as trusted while off as while heating."""
+    model = _heat_only()
+    heating = _assess(model, "heat")
+    idle = _assess(model, "off")
+
+    sample_factor = RUNS / (RUNS + CONFIDENCE_SAMPLE_PRIOR)
+    assert heating["score"] == round(100 * (0.5 + 0.5 * sample_factor))
+    assert idle["score"] == heating["score"]
+    assert idle["model_mode"] == "heat"
+    assert idle["spread_factor"] == 1.0
+
+def test_untrained_mode_is_kept_low() -> None:
+    """No learned run, overall or for the running mode, caps the score."""
+    assert _assess(ThermalModel(), "off")["score"] == CONFIDENCE_LOW - 1
+    cooling = _assess(_heat_only(), "cool")
+    assert cooling["score"] == CONFIDENCE_LOW - 1
+    assert cooling["model_samples"] == 0
+
+def test_data_scales_the_score() -> None:
+    """Stale sensors and an uncertain estimate scale the whole score."""
+    model = _heat_only()
+    full = _assess(model, "heat")["score"]
+    result = _assess(model, "heat", fresh_count=1, estimate={"uncertainty": 0.5})
+
+    assert (result["freshness"], result["estimator_certainty"]) == (0.5, 0.5)
+    assert result["score"] == round(full * 0.25)
+
+def test_setpoint_spread_needs_enough_samples() -> None:
+    """Learned setpoints only weigh in once the planner follows them."""
+    model = _heat_only()
+    preference_model = PreferenceModel()
+    context = preference_model.get_context(WHEN, "home", True)
+    for setpoint in (20.0, 22.0):
+        preference_model.update_preference(context, "heat", setpoint)
+    assert _assess(model, "heat", preference_model)["setpoint_std"] is None
+
+    preference_model.update_preference(context, "heat", 21.0)
+    result = _assess(model, "heat", preference_model)
+    assert result["setpoint_std"] == 1.0
+    assert result["preference_factor"] == pytest.approx(0.5)
+    # Idle follows the same mode as the model factor
+    assert _assess(model, "off", preference_model)["setpoint_std"] == 1.0
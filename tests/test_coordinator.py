@@ -0,0 +1,178 @@
+"""Tests for the PowerStat coordinator's actuation and override handling."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import Context, Event, HomeAssistant, ServiceCall, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.powerstat.const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    CONF_CLIMATE_ENTITY,
+    CONF_MANUAL_HOLD_DURATION,
+    CONF_OVERRIDE_WINDOW,
+    CONF_TEMP_SENSORS,
+    CONF_WEATHER_ENTITY,
+    DEFAULT_DECISION_INTERVAL,
+    DEFAULT_OVERRIDE_WINDOW,
+    DOMAIN,
+    RUNTIME_SAVE_DELAY,
+)
+from custom_components.powerstat.coordinator import PowerStatCoordinator
+from custom_components.powerstat.engine.breaker import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+)
+
+CLIMATE = "climate.hall"
+SENSOR = "sensor.hall_temperature"
+IDLE = {"hvac_mode": "off", "target_temp": 20.0, "available": True}
+
+def _changed(
+    hvac_mode: str, setpoint: float, context: Context | None = None, old_mode: str = "off"
+) -> Event:
+    """Return a thermostat change from 20 °C in `old_mode`."""
+    return Event(
+        "state_changed",
+        {
+            "entity_id": CLIMATE,
+            "old_state": State(CLIMATE, old_mode, {"temperature": 20.0}),
+            "new_state": State(CLIMATE, hvac_mode, {"temperature": setpoint}),
+        },
+        context=context or Context(),
+    )
+
+def _coordinator(hass: HomeAssistant, **options: Any) -> PowerStatCoordinator:
+    """Return a coordinator for one thermostat and one sensor."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_CLIMATE_ENTITY: CLIMATE, CONF_TEMP_SENSORS: [SENSOR]},
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    return PowerStatCoordinator(hass, entry)
+
+async def test_failing_commands_open_breaker(hass: HomeAssistant, freezer) -> None:
+    """Cycles held back by the rate limit don't reset the failure count."""
+    hass.states.async_set(CLIMATE, "off", {"temperature": 20.0})
+    hass.states.async_set(SENSOR, "15.0", {"unit_of_measurement": "°C"})
+    calls: list[ServiceCall] = []
+
+    async def fail(call: ServiceCall) -> None:
+        calls.append(call)
+        raise HomeAssistantError("Cloud API unreachable")
+
+    hass.services.async_register("climate", "set_hvac_mode", fail)
+    hass.services.async_register("climate", "set_temperature", fail)
+    coordinator = _coordinator(hass)
+
+    for _ in range(4 * BREAKER_FAILURE_THRESHOLD):
+        await coordinator._async_update_data()
+        if coordinator.breaker.state == BREAKER_OPEN:
+            break
+        freezer.tick(timedelta(seconds=DEFAULT_DECISION_INTERVAL))
+
+    assert coordinator.breaker.state == BREAKER_OPEN
+    assert coordinator.breaker.last_error == "Cloud API unreachable"
+    assert len(calls) == BREAKER_FAILURE_THRESHOLD
+
+async def test_noop_cycle_leaves_breaker_alone(hass: HomeAssistant) -> None:
+    """A cycle without commands counts as neither success nor failure."""
+    coordinator = _coordinator(hass)
+    breaker = coordinator.breaker
+    breaker.record_failure(0.0, "unavailable")
+
+    await coordinator._async_actuate_guarded(0.0, IDLE, {"hvac_mode": "off"})
+    assert (breaker.state, breaker.failures) == (BREAKER_CLOSED, 1)
+
+    # A half-open breaker waits for a command to probe with
+    for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+        breaker.record_failure(0.0, "unavailable")
+    await coordinator._async_actuate_guarded(BREAKER_BASE_BACKOFF, IDLE, {"hvac_mode": "off"})
+    assert breaker.state == BREAKER_HALF_OPEN
+
+async def test_forecast_scorer_needs_weather_entity(hass: HomeAssistant) -> None:
+    """The scorer, and numpy with it, only loads once a forecast can arrive."""
+    coordinator = _coordinator(hass)
+    await coordinator.async_load_forecast_scorer()
+    assert coordinator.forecast_scorer is None
+
+    coordinator = _coordinator(hass, **{CONF_WEATHER_ENTITY: "weather.home"})
+    await coordinator.async_load_forecast_scorer()
+    assert coordinator.forecast_scorer is not None
+
+async def test_saved_runtime_is_not_rewritten(hass: HomeAssistant, hass_storage) -> None:
+    """Saving on unload drops the delayed write, so removal sticks."""
+    coordinator = _coordinator(hass)
+    key = f"{DOMAIN}.{coordinator.entry.entry_id}.runtime"
+    assert coordinator._observe_runtime(State(CLIMATE, "heat", {"hvac_action": "heating"}))
+
+    await coordinator.async_save_runtime()
+    assert hass_storage[key]["data"]["running"] is True
+
+    await coordinator._runtime_store.async_remove()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=RUNTIME_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+async def test_own_changes_are_not_overrides(hass: HomeAssistant) -> None:
+    """Our service calls, and what they cause, don't start a hold."""
+    coordinator = _coordinator(hass)
+    coordinator.async_request_refresh = AsyncMock()
+    own = Context()
+    coordinator._own_contexts.append(own.id)
+
+    coordinator._async_climate_changed(_changed("heat", 21.0, own))
+    coordinator._async_climate_changed(_changed("heat", 21.0, Context(parent_id=own.id)))
+    await hass.async_block_till_done()
+
+    assert coordinator.manual_hold_until is None
+    coordinator.async_request_refresh.assert_not_called()
+
+async def test_command_echo_within_window(hass: HomeAssistant, freezer) -> None:
+    """A late echo of our last command is ignored inside the override window."""
+    coordinator = _coordinator(hass)
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator._last_command = (dt_util.utcnow(), "heat", 21.0)
+
+    coordinator._async_climate_changed(_changed("heat", 21.0))
+    assert coordinator.manual_hold_until is None
+
+    # A different setpoint is a person, even inside the window
+    coordinator._async_climate_changed(_changed("heat", 22.0))
+    assert coordinator.manual_hold_until is not None
+
+    coordinator.manual_hold_until = None
+    freezer.tick(timedelta(minutes=DEFAULT_OVERRIDE_WINDOW + 1))
+    coordinator._async_climate_changed(_changed("heat", 21.0))
+    assert coordinator.manual_hold_until is not None
+
+async def test_manual_change_holds_and_teaches(hass: HomeAssistant, freezer) -> None:
+    """A manual setpoint starts a hold and is learned for its context."""
+    coordinator = _coordinator(hass, **{CONF_MANUAL_HOLD_DURATION: 45, CONF_OVERRIDE_WINDOW: 5})
+    coordinator.async_request_refresh = AsyncMock()
+    coordinator.data = {"snapshot": {"is_away": False, "is_sleep": False, "presence": {}}}
+
+    coordinator._async_climate_changed(_changed("heat", 22.5))
+    await hass.async_block_till_done()
+
+    assert coordinator.manual_hold_until == dt_util.utcnow() + timedelta(minutes=45)
+    coordinator.async_request_refresh.assert_awaited_once()
+    preference = coordinator.preference_model.get_preference(
+        coordinator._preference_context(False, False, {})
+    )
+    assert (preference["heat"], preference["n_heat"], preference["n_cool"]) == (22.5, 1, 0)
+
+    # Turning the unit off is a hold, but says nothing about a setpoint
+    coordinator._async_climate_changed(_changed("off", 22.5, old_mode="heat"))
+    assert preference["n_heat"] == 1
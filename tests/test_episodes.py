@@ -0,0 +1,87 @@
+"""Tests for the PowerStat thermal episode log."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from custom_components.powerstat.models.episodes import (
+    EPISODE_RECORD,
+    Episode,
+    EpisodeLog,
+    EpisodeTracker,
+)
+
+def _episode(index: int, outdoor: float | None = 5.0) -> Episode:
+    """Return a ten-minute heating run starting at index hours."""
+    start = 1_700_000_000 + index * 3600
+    return Episode(start, start + 600, "heat", 20.0, 20.5, outdoor, 10.0)
+
+def test_round_trip(tmp_path) -> None:
+    """Records read back as written, with unknown outdoor temperature kept."""
+    log = EpisodeLog(str(tmp_path / "episodes"))
+    written = [_episode(0), _episode(1, outdoor=None)]
+    for episode in written:
+        log.append(episode)
+
+    assert log.read() == written
+    assert log.read(since=written[1].end) == written[1:]
+
+def test_missing_file_reads_empty(tmp_path) -> None:
+    """A log that was never written has no episodes."""
+    assert EpisodeLog(str(tmp_path / "episodes")).read() == []
+
+def test_rotation_keeps_one_generation(tmp_path) -> None:
+    """A full file moves to .1, replacing the previous generation."""
+    path = str(tmp_path / "episodes")
+    log = EpisodeLog(path, max_records=3)
+
+    for index in range(4):
+        log.append(_episode(index))
+    assert os.path.getsize(f"{path}.1") == 3 * EPISODE_RECORD.size
+    assert [episode.start for episode in log.read()] == [_episode(i).start for i in range(4)]
+
+    for index in range(4, 7):
+        log.append(_episode(index))
+    # Episodes 0-2 went with the first generation
+    assert [episode.start for episode in log.read()] == [_episode(i).start for i in range(3, 7)]
+
+def test_partial_record_is_ignored(tmp_path) -> None:
+    """A torn trailing write doesn't break reading the complete records."""
+    path = str(tmp_path / "episodes")
+    log = EpisodeLog(path)
+    log.append(_episode(0))
+    with open(path, "ab") as log_file:
+        log_file.write(b"\x01\x02\x03")
+
+    assert log.read() == [_episode(0)]
+
+def test_tracker_closes_runs() -> None:
+    """A run becomes an episode when the mode changes; short runs are dropped."""
+    tracker = EpisodeTracker()
+    assert tracker.observe(0, "heat", 20.0, 4.0) is None
+    assert tracker.observe(300, "heat", 20.4, 6.0) is None
+    episode = tracker.observe(900, "off", 20.8, 6.0)
+
+    assert episode is not None
+    assert (episode.mode, episode.start, episode.end) == ("heat", 0, 900)
+    assert (episode.indoor_start, episode.indoor_end) == (20.0, 20.8)
+    assert episode.outdoor_avg == 5.0
+    assert episode.runtime == pytest.approx(15.0)
+
+    tracker.observe(1000, "cool", 20.8, None)
+    assert tracker.observe(1060, "off", 20.7, None) is None
+
+def test_tracker_closes_off_periods() -> None:
+    """Off periods become episodes once they have a known start."""
+    tracker = EpisodeTracker()
+    assert tracker.observe(0, "off", 21.0, 3.0) is None
+    assert tracker.observe(600, "heat", 20.5, 3.0) is None  # Startup period
+    tracker.observe(1200, "off", 21.0, 3.0)
+    episode = tracker.observe(3000, "heat", 20.4, 1.0)
+
+    assert episode is not None
+    assert (episode.mode, episode.start, episode.end) == ("off", 1200, 3000)
+    assert (episode.indoor_start, episode.indoor_end) == (21.0, 20.4)
+    assert episode.outdoor_avg == 3.0
+    assert episode.runtime == pytest.approx(30.0)
@@ -0,0 +1,78 @@
+"""Tests for the PowerStat Kalman estimator."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.powerstat.const import (
+    KALMAN_INITIAL_SENSOR_NOISE,
+    KALMAN_MIN_SENSOR_NOISE,
+    KALMAN_NOISE_LEARNING_RATE,
+    KALMAN_PROCESS_NOISE,
+)
+from custom_components.powerstat.engine.estimator import KalmanEstimator
+from custom_components.powerstat.models.thermal import ThermalModel
+
+START = 1_767_600_000.0  # 2026-01-05 08:00 UTC
+STALE_AFTER = 90 * 60.0
+
+def _estimator() -> KalmanEstimator:
+    """Return an estimator over a model that heats at 0.05 °C a minute."""
+    model = ThermalModel()
+    model.update("heat", 1.0, 20)
+    return KalmanEstimator(model, STALE_AFTER)
+
+def test_first_measurement_seeds_the_state() -> None:
+    """The first value is taken as is, with that sensor's noise as variance."""
+    estimator = _estimator()
+    estimator.update("sensor.a", 20.0, START, "heat")
+
+    assert (estimator.temperature, estimator.variance) == (20.0, KALMAN_INITIAL_SENSOR_NOISE)
+    assert estimator.sensor_noise == {}
+
+def test_predict_then_update() -> None:
+    """The model's rate moves the state before each measurement is blended in."""
+    estimator = _estimator()
+    estimator.update("sensor.a", 20.0, START, "heat")
+    estimator.update("sensor.a", 21.0, START + 600, "heat", weight=2.0)
+
+    prior = KALMAN_INITIAL_SENSOR_NOISE + KALMAN_PROCESS_NOISE * 10
+    gain = prior / (prior + KALMAN_INITIAL_SENSOR_NOISE / 2.0)
+    assert estimator.temperature == pytest.approx(20.5 + gain * 0.5)
+    assert estimator.variance == pytest.approx((1 - gain) * prior)
+    assert estimator.sensor_noise["sensor.a"] == pytest.approx(
+        (1 - KALMAN_NOISE_LEARNING_RATE) * KALMAN_INITIAL_SENSOR_NOISE
+        + KALMAN_NOISE_LEARNING_RATE * (0.25 - prior)
+    )
+
+    # An estimate predicts forward without touching the state
+    temperature = estimator.temperature
+    result = estimator.estimate(START + 1200, "heat")
+    assert result["temperature"] == pytest.approx(temperature + 0.5, abs=0.01)
+    assert estimator.temperature == temperature
+
+def test_learned_noise_is_clamped() -> None:
+    """A smaller innovation than expected can't push the noise below the floor."""
+    estimator = _estimator()
+    estimator.sensor_noise["sensor.a"] = KALMAN_MIN_SENSOR_NOISE * 1.01
+    estimator.update("sensor.b", 20.0, START, "off")
+    estimator.update("sensor.a", 20.0, START + 600, "off")
+
+    assert estimator.sensor_noise["sensor.a"] == KALMAN_MIN_SENSOR_NOISE
+
+    # Large innovations teach the sensor it is noisier than assumed
+    estimator.update("sensor.b", 23.0, START + 660, "off")
+    assert estimator.sensor_noise["sensor.b"] > KALMAN_INITIAL_SENSOR_NOISE
+
+def test_no_estimate_once_stale() -> None:
+    """Without a recent report there is no estimate; any report revives it."""
+    estimator = _estimator()
+    assert estimator.estimate(START, "off") is None
+
+    estimator.update("sensor.a", 20.0, START, "off")
+    assert estimator.estimate(START + STALE_AFTER, "off") is not None
+    assert estimator.estimate(START + STALE_AFTER + 1, "off") is None
+
+    estimator.report(START + 600)
+    estimator.report(START + 300)  # Out of order reports don't move it back
+    assert estimator.reported_at == START + 600
+    assert estimator.estimate(START + STALE_AFTER + 1, "off") is not None
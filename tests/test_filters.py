@@ -0,0 +1,154 @@
+"""Tests for the PowerStat temperature input filters."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from custom_components.powerstat.engine.filters import (
+    STATUS_OK,
+    STATUS_OUT_OF_RANGE,
+    STATUS_OUTLIER,
+    STATUS_RATE,
+    STATUS_UNAVAILABLE,
+    SensorFilter,
+    SensorFilterBank,
+    TimeWeightedAverage,
+)
+
+START = datetime(2026, 1, 5, 8, 0, tzinfo=timezone.utc)
+
+def _state(value: str, minutes: float, reported: float | None = None) -> SimpleNamespace:
+    """Return a state-like object updated `minutes` after START."""
+    updated = START + timedelta(minutes=minutes)
+    last_reported = START + timedelta(minutes=reported) if reported is not None else updated
+    return SimpleNamespace(state=value, last_updated=updated, last_reported=last_reported)
+
+def _seconds(minutes: float) -> float:
+    """Return the Unix timestamp `minutes` after START."""
+    return (START + timedelta(minutes=minutes)).timestamp()
+
+def test_filter_accepts_steady_readings() -> None:
+    """Small changes pass both checks."""
+    sensor_filter = SensorFilter()
+    for minute, value in enumerate((20.0, 20.1, 20.0, 20.2, 20.1)):
+        assert sensor_filter.add(value, _seconds(minute * 5))
+    assert sensor_filter.value == 20.1
+    assert sensor_filter.status == STATUS_OK
+
+def test_filter_rejects_out_of_range() -> None:
+    """Readings outside the valid range never enter the window."""
+    sensor_filter = SensorFilter()
+    assert not sensor_filter.add(85.0, _seconds(0))
+    assert sensor_filter.status == STATUS_OUT_OF_RANGE
+    assert not sensor_filter.window
+
+def test_filter_rejects_fast_changes() -> None:
+    """A jump faster than the rate limit is rejected; the last good value stays."""
+    sensor_filter = SensorFilter()
+    assert sensor_filter.add(20.0, _seconds(0))
+    assert not sensor_filter.add(23.0, _seconds(1))
+    assert sensor_filter.status == STATUS_RATE
+    assert sensor_filter.value == 20.0
+
+def test_filter_rejects_outlier_then_follows_level_shift() -> None:
+    """A lone spike is an outlier; a sustained shift is accepted once it dominates."""
+    sensor_filter = SensorFilter()
+    for minute, value in enumerate((20.0, 20.1, 20.0, 20.1, 20.0)):
+        assert sensor_filter.add(value, _seconds(minute * 5))
+
+    results = [sensor_filter.add(25.0, _seconds(60 + step * 10)) for step in range(4)]
+    assert results == [False, False, False, True]
+    assert sensor_filter.value == 25.0
+    assert sensor_filter.status == STATUS_OK
+
+def test_bank_ignores_repeated_states() -> None:
+    """A state seen before isn't a new sample."""
+    bank = SensorFilterBank(timedelta(minutes=90), timedelta(0))
+    assert bank.observe("sensor.a", _state("20.5", 0)) == 20.5
+    assert bank.observe("sensor.a", _state("20.5", 0, reported=10)) is None
+    assert bank.filters["sensor.a"].last_reported == START + timedelta(minutes=10)
+
+def test_bank_snapshot_sorts_sensors() -> None:
+    """Values, rejected and stale sensors are reported separately."""
+    bank = SensorFilterBank(timedelta(minutes=30), timedelta(0))
+    bank.observe("sensor.fresh", _state("21.0", 50))
+    bank.observe("sensor.quiet", _state("22.0", 0, reported=55))
+    bank.observe("sensor.stale", _state("19.0", 0))
+    bank.observe("sensor.gone", SimpleNamespace(state="unavailable"))
+    bank.observe("sensor.spiky", _state("20.0", 40))
+    bank.observe("sensor.spiky", _state("26.0", 41))
+
+    snapshot = bank.snapshot(START + timedelta(minutes=60))
+    assert snapshot["values"] == {"sensor.fresh": 21.0, "sensor.quiet": 22.0, "sensor.spiky": 20.0}
+    assert snapshot["rejected"] == {"sensor.gone": STATUS_UNAVAILABLE, "sensor.spiky": STATUS_RATE}
+    assert snapshot["stale"] == ["sensor.stale"]
+
+def test_bank_outlier_status() -> None:
+    """An outlier is rejected while the sensor keeps its last good value."""
+    bank = SensorFilterBank(timedelta(minutes=90), timedelta(0))
+    for minute, value in enumerate(("20.0", "20.1", "20.0", "20.1")):
+        bank.observe("sensor.a", _state(value, minute * 5))
+    assert bank.observe("sensor.a", _state("24.0", 60)) is None
+    assert bank.filters["sensor.a"].status == STATUS_OUTLIER
+    assert bank.snapshot(START + timedelta(minutes=61))["values"]["sensor.a"] == 20.1
+
+def test_bank_reconfigure_seeds_new_average() -> None:
+    """Turning averaging on keeps the held value of a steady sensor."""
+    bank = SensorFilterBank(timedelta(minutes=90), timedelta(0))
+    bank.observe("sensor.a", _state("20.5", 0, reported=30))
+    bank.reconfigure(timedelta(minutes=90), timedelta(minutes=10))
+
+    assert bank.filters["sensor.a"].average is not None
+    assert bank.snapshot(START + timedelta(minutes=31))["values"] == {"sensor.a": 20.5}
+
+    bank.reconfigure(timedelta(minutes=90), timedelta(0))
+    assert bank.filters["sensor.a"].average is None
+
+def _reference_mean(samples: list[tuple[float, float]], now: float, window: float) -> float:
+    """Time-weighted mean computed directly from every sample."""
+    start = now - window
+    total = span = 0.0
+    for index, (timestamp, value) in enumerate(samples):
+        end = samples[index + 1][0] if index + 1 < len(samples) else now
+        low, high = max(timestamp, start), min(end, now)
+        if high > low:
+            total += value * (high - low)
+            span += high - low
+    return total / span
+
+def test_average_weights_by_hold_time() -> None:
+    """Each value counts for as long as it was current."""
+    average = TimeWeightedAverage(120)
+    assert average.value(0) is None
+    average.add(0, 20.0)
+    average.add(90, 24.0)
+    assert average.value(120) == 21.0
+    # Only the part of the first hold inside the window counts
+    assert average.value(180) == 23.0
+
+def test_average_ignores_out_of_order_samples() -> None:
+    """An older sample is dropped and a same-time sample replaces the last."""
+    average = TimeWeightedAverage(100)
+    average.add(0, 20.0)
+    average.add(50, 22.0)
+    average.add(40, 30.0)
+    average.add(50, 24.0)
+    assert average.value(100) == 22.0
+
+def test_average_matches_direct_integration() -> None:
+    """The ring and running integral agree with a direct computation.
+
+    Once the ring is full the oldest sample goes, so the mean covers at most
+    the newest `capacity` samples.
+    """
+    average = TimeWeightedAverage(600, capacity=8)
+    samples = []
+    timestamp = 0.0
+    for step in range(50):
+        timestamp += 30 + (step * 37) % 90
+        value = 18 + (step * 13) % 7 * 0.5
+        average.add(timestamp, value)
+        samples.append((timestamp, value))
+        now = timestamp + 15
+        expected = _reference_mean(samples[-8:], now, 600)
+        assert abs(average.value(now) - expected) < 1e-9
@@ -0,0 +1,91 @@
+"""Tests for the PowerStat forecast free heating and cooling stage."""
+from __future__ import annotations
+
+import numpy as np
+
+from custom_components.powerstat.const import FORECAST_STEP
+from custom_components.powerstat.engine.forecast import ForecastGrid, free_energy_stage
+
+NOW = 1_760_000_000.0
+POINTS = 37  # Three hours ahead
+
+def _grid(change_at: int = 0, before: dict | None = None, **after: float | bool) -> ForecastGrid:
+    """Return a grid starting two minutes ago whose values change at a point.
+
+    Until `change_at` it is 5 °C and overcast with the house cooling slowly
+    on its own, or as `before` says; from there on `after` applies.
+    """
+    columns = {"outdoor": 5.0, "sunny": False, "drift": -0.005, "heat_rate": 0.05}
+    columns.update(before or {})
+    arrays = {name: np.full(POINTS, value) for name, value in columns.items()}
+    for name, value in after.items():
+        arrays[name][change_at:] = value
+    return ForecastGrid(
+        NOW - 120 + np.arange(POINTS) * FORECAST_STEP * 60,
+        arrays["outdoor"],
+        arrays["sunny"].astype(bool),
+        arrays["heat_rate"],
+        np.full(POINTS, -0.05),
+        arrays["drift"],
+    )
+
+def _heat_windows(result: dict) -> list[dict]:
+    """Return the free heating windows of a result."""
+    return [window for window in result["free_windows"] if window["type"] == "heat"]
+
+def _stage(grid: ForecastGrid, indoor: float, hvac_mode: str = "heat") -> dict:
+    """Run the stage for a 21 °C target with a 0.5 °C deadband."""
+    return free_energy_stage(grid, NOW, indoor, 21.0, 0.5, hvac_mode, 2.0)
+
+def test_window_in_progress_never_defers() -> None:
+    """Sun at 20 °C outside that isn't warming the room must not hold off heating."""
+    grid = _grid(outdoor=20.0, sunny=True, drift=0.01)
+    result = _stage(grid, 20.4)
+
+    assert "hvac_mode" not in result
+    assert [window["type"] for window in result["free_windows"]] == ["heat"]
+    assert result["free_windows"][0]["start"] < NOW
+
+def test_no_window_without_model_drift() -> None:
+    """Favourable weather alone is not a free window."""
+    grid = _grid(4, outdoor=20.0, sunny=True, drift=0.0)
+    result = _stage(grid, 20.4)
+
+    assert _heat_windows(result) == []
+    assert "hvac_mode" not in result
+
+def test_defers_for_upcoming_window_that_reaches_target() -> None:
+    """A window starting soon whose drift reaches the target defers the run."""
+    grid = _grid(4, outdoor=20.0, sunny=True, drift=0.02)
+    result = _stage(grid, 20.4)
+
+    assert result["hvac_mode"] == "off"
+    assert result["reason_code"] == "free_heating"
+    assert "in 18 min" in result["reason"]
+    assert _heat_windows(result)[0]["drift"] > 0.6
+
+def test_no_defer_when_drift_falls_short() -> None:
+    """A window too weak to reach the target leaves the run alone."""
+    grid = _grid(4, outdoor=20.0, sunny=True, drift=0.0001)
+    assert "hvac_mode" not in _stage(grid, 20.4)
+
+def test_no_defer_when_room_gets_too_cold_first() -> None:
+    """Waiting must not let the drift push the room past the overshoot limit."""
+    grid = _grid(7, {"drift": -0.2}, outdoor=20.0, sunny=True, drift=0.5)
+    assert "hvac_mode" not in _stage(grid, 20.4)
+
+def test_no_defer_beyond_lead() -> None:
+    """Windows further out than the deferral lead are only listed."""
+    grid = _grid(20, outdoor=20.0, sunny=True, drift=0.02)
+    result = _stage(grid, 20.4)
+
+    assert "hvac_mode" not in result
+    assert len(_heat_windows(result)) == 1
+
+def test_preempts_before_rate_drops() -> None:
+    """Inside the deadband, heat now if the compressor is about to weaken."""
+    grid = _grid(6, heat_rate=0.02)
+    result = _stage(grid, 20.8, hvac_mode="off")
+
+    assert result["hvac_mode"] == "heat"
+    assert result["reason_code"] == "preempt"
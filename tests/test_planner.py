@@ -0,0 +1,46 @@
+"""Tests for the PowerStat planner's target selection."""
+from __future__ import annotations
+
+from typing import Any
+
+from custom_components.powerstat.engine.planner import PowerStatPlanner
+
+def _snapshot(temperature: float, **preference: Any) -> dict[str, Any]:
+    """Return a confident home snapshot at `temperature` with learned setpoints."""
+    return {
+        "estimate": {"temperature": temperature, "uncertainty": 0.1},
+        "confidence": {"score": 100},
+        "preference": {"heat": 21.0, "cool": 24.0, "n_heat": 0, "n_cool": 0, **preference},
+    }
+
+async def _plan(temperature: float, **preference: Any) -> dict[str, Any]:
+    """Plan from a snapshot with the default settings."""
+    return await PowerStatPlanner(None, {}, _snapshot(temperature, **preference)).async_calculate_plan()
+
+async def test_learned_targets_need_enough_samples() -> None:
+    """Setpoints seen fewer than PREFERENCE_MIN_SAMPLES times are ignored."""
+    plan = await _plan(19.0, heat=22.0, n_heat=2)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("heat", 21.0)
+    assert plan["reason"] == "Mode: Home"
+
+    plan = await _plan(19.0, heat=22.04, n_heat=3)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("heat", 22.0)
+    assert plan["reason"] == "Mode: Home (learned)"
+
+async def test_learned_cool_target_when_warm() -> None:
+    """Above the learned cool setpoint the plan cools towards it."""
+    plan = await _plan(25.0, heat=22.0, n_heat=3, cool=24.0, n_cool=3)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("cool", 24.0)
+
+    plan = await _plan(22.3, heat=22.0, n_heat=3, cool=24.0, n_cool=3)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("off", 22.0)
+
+async def test_cool_target_never_below_heat_target() -> None:
+    """A learned cool setpoint under the heat one is raised to it."""
+    plan = await _plan(23.0, heat=22.0, n_heat=3, cool=20.0, n_cool=3)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("cool", 22.0)
+
+    # Only a learned cool setpoint still can't undercut the default heat target
+    plan = await _plan(20.0, cool=19.0, n_cool=3)
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("heat", 21.0)
+    assert plan["reason"] == "Mode: Home"
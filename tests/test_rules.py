@@ -0,0 +1,160 @@
+"""Tests for the PowerStat rule pipeline."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.powerstat.const import (
+    CONF_LOAD_SHED_ENTITY,
+    CONF_MIN_ACTION_INTERVAL,
+    CONF_WINDOW_SENSORS,
+)
+from custom_components.powerstat.engine.rules import (
+    RULES,
+    OUTCOME_BLOCKED,
+    OUTCOME_MODIFIED,
+    OUTCOME_PASS,
+    PowerStatRules,
+    Rule,
+)
+
+def _snapshot(**climate: Any) -> dict[str, Any]:
+    """Return a snapshot of a unit heating for an hour, without commands or holds."""
+    return {
+        "climate": {
+            "hvac_mode": "heat",
+            "target_temp": 21.0,
+            "running": True,
+            "state_since": dt_util.utcnow() - timedelta(hours=1),
+            "manual_hold_until": None,
+            "last_command_at": None,
+            **climate,
+        },
+        "load_shed": False,
+        "environment": {"window_states": {}},
+    }
+
+def _outcomes(plan: dict[str, Any]) -> list[tuple[str, str]]:
+    """Return the (rule, outcome) pairs of a plan's trace."""
+    return [(step["rule"], step["outcome"]) for step in plan["rules"]]
+
+def test_pipeline_is_ordered_and_skips_unconfigured_rules() -> None:
+    """Rules run by their order; those without inputs configured are left out."""
+    rules = PowerStatRules(None, {})
+    assert [rule.name for rule in rules.pipeline] == [
+        "manual_hold",
+        "min_on_time",
+        "min_off_time",
+        "action_rate_limit",
+    ]
+
+    rules = PowerStatRules(
+        None,
+        {
+            CONF_LOAD_SHED_ENTITY: "binary_sensor.shed",
+            CONF_WINDOW_SENSORS: ["binary_sensor.window"],
+            CONF_MIN_ACTION_INTERVAL: 0,
+        },
+    )
+    names = [rule.name for rule in rules.pipeline]
+    assert names == ["manual_hold", "load_shed", "window_pause", "min_on_time", "min_off_time"]
+    assert names == sorted(names, key=lambda name: RULES[name].order)
+
+def test_all_rules_pass() -> None:
+    """A plan no rule objects to comes back unchanged, with a full trace."""
+    proposed = {"hvac_mode": "heat", "target_temp": 21.0}
+    plan = PowerStatRules(None, {}).validate_action(_snapshot(), proposed)
+
+    assert plan["hvac_mode"] == "heat"
+    assert "blocked" not in plan
+    assert {outcome for _, outcome in _outcomes(plan)} == {OUTCOME_PASS}
+    assert all(step["ms"] >= 0 for step in plan["rules"])
+
+def test_blocking_rule_stops_the_pipeline() -> None:
+    """A manual hold keeps the climate as it is and no later rule runs."""
+    snapshot = _snapshot(manual_hold_until=dt_util.utcnow() + timedelta(minutes=30))
+    plan = PowerStatRules(None, {}).validate_action(snapshot, {"hvac_mode": "cool", "target_temp": 24.0})
+
+    assert plan["blocked"] is True
+    assert plan["rule"] == "manual_hold"
+    assert (plan["hvac_mode"], plan["target_temp"]) == ("heat", 21.0)
+    assert _outcomes(plan) == [("manual_hold", OUTCOME_BLOCKED)]
+
+def test_modified_plan_feeds_later_rules() -> None:
+    """Load shedding turns a run off, and min on-time then holds the fresh run."""
+    snapshot = _snapshot(state_since=dt_util.utcnow() - timedelta(minutes=2))
+    snapshot["load_shed"] = True
+    rules = PowerStatRules(None, {CONF_LOAD_SHED_ENTITY: "binary_sensor.shed"})
+    plan = rules.validate_action(snapshot, {"hvac_mode": "heat", "target_temp": 21.0})
+
+    assert plan["rule"] == "min_on_time"
+    assert plan["hvac_mode"] == "heat"
+    assert _outcomes(plan) == [
+        ("manual_hold", OUTCOME_PASS),
+        ("load_shed", OUTCOME_MODIFIED),
+        ("min_on_time", OUTCOME_BLOCKED),
+    ]
+
+def test_load_shed_after_min_on_time() -> None:
+    """Once the run is long enough, load shedding turns it off."""
+    snapshot = _snapshot()
+    snapshot["load_shed"] = True
+    rules = PowerStatRules(None, {CONF_LOAD_SHED_ENTITY: "binary_sensor.shed"})
+    plan = rules.validate_action(snapshot, {"hvac_mode": "heat", "target_temp": 21.0})
+
+    assert plan["hvac_mode"] == "off"
+    assert plan["rule"] == "load_shed"
+    assert "blocked" not in plan
+
+def test_min_on_time_ignores_idle_unit() -> None:
+    """A unit idling in its mode can be switched off straight away."""
+    snapshot = _snapshot(running=False, state_since=dt_util.utcnow() - timedelta(minutes=2))
+    plan = PowerStatRules(None, {}).validate_action(snapshot, {"hvac_mode": "off"})
+
+    assert plan["hvac_mode"] == "off"
+    assert "blocked" not in plan
+
+def test_min_off_time_holds_off() -> None:
+    """A unit that just stopped is kept off."""
+    snapshot = _snapshot(
+        hvac_mode="off", running=False, state_since=dt_util.utcnow() - timedelta(minutes=1)
+    )
+    plan = PowerStatRules(None, {}).validate_action(snapshot, {"hvac_mode": "heat", "target_temp": 21.0})
+
+    assert plan["hvac_mode"] == "off"
+    assert plan["rule"] == "min_off_time"
+    assert plan["blocked"] is True
+
+def test_window_pause_after_grace_period() -> None:
+    """An opening that outlasts the grace period pauses the run."""
+    snapshot = _snapshot()
+    snapshot["environment"]["window_states"] = {
+        "binary_sensor.window": {"name": "Kitchen window", "open": True, "duration": 600}
+    }
+    rules = PowerStatRules(None, {CONF_WINDOW_SENSORS: ["binary_sensor.window"]})
+    plan = rules.validate_action(snapshot, {"hvac_mode": "heat", "target_temp": 21.0})
+
+    assert plan["hvac_mode"] == "off"
+    assert plan["rule"] == "window_pause"
+
+def test_action_rate_limit() -> None:
+    """Changes are held back until the command interval has passed."""
+    rules = PowerStatRules(None, {CONF_MIN_ACTION_INTERVAL: 300})
+    proposed = {"hvac_mode": "heat", "target_temp": 22.0}
+
+    recent = _snapshot(last_command_at=dt_util.utcnow() - timedelta(seconds=60))
+    plan = rules.validate_action(recent, proposed)
+    assert plan["rule"] == "action_rate_limit"
+    assert plan["target_temp"] == 21.0
+
+    earlier = _snapshot(last_command_at=dt_util.utcnow() - timedelta(seconds=600))
+    assert rules.validate_action(earlier, proposed)["target_temp"] == 22.0
+
+def test_rule_must_implement_evaluate() -> None:
+    """The base rule is abstract."""
+    with pytest.raises(TypeError):
+        Rule({})
@@ -0,0 +1,67 @@
+"""Tests for the PowerStat runtime accountant."""
+from __future__ import annotations
+
+from custom_components.powerstat.const import RUNTIME_RATE_WINDOW, RUNTIME_WINDOW
+from custom_components.powerstat.engine.runtime import RuntimeAccountant
+
+DAY = 24 * 3600.0
+MINUTE = 60.0
+
+def _accountant(*runs: tuple[float, float]) -> RuntimeAccountant:
+    """Return an accountant that saw the given runs, in minutes after DAY."""
+    accountant = RuntimeAccountant()
+    accountant.observe(False, DAY)
+    for start, end in runs:
+        accountant.observe(True, DAY + start * MINUTE)
+        accountant.observe(False, DAY + end * MINUTE)
+    return accountant
+
+def test_observe_closes_runs_on_change() -> None:
+    """Only an on-to-off change closes a run; repeats are ignored."""
+    accountant = _accountant((10, 20))
+    accountant.observe(False, DAY + 30 * MINUTE)
+    accountant.observe(True, DAY + 40 * MINUTE)
+    accountant.observe(True, DAY + 45 * MINUTE)
+
+    assert list(accountant.runs) == [(DAY + 10 * MINUTE, DAY + 20 * MINUTE)]
+    assert (accountant.running, accountant.since) == (True, DAY + 40 * MINUTE)
+
+def test_stats_counts_the_open_run() -> None:
+    """Runtime and starts include the run in progress; the average doesn't."""
+    accountant = _accountant((10, 20), (40, 70))
+    accountant.observe(True, DAY + 100 * MINUTE)
+    stats = accountant.stats(DAY + 110 * MINUTE, DAY + 15 * MINUTE)
+
+    assert stats["running"] is True
+    assert stats["runtime_today"] == 5 + 30 + 10
+    assert stats["cycles_per_hour"] == round(3 / RUNTIME_RATE_WINDOW, 2)
+    assert stats["average_run"] == 20.0
+
+def test_prevented_counted_once_per_period() -> None:
+    """Blocks in the same off period count as one prevented short cycle."""
+    accountant = _accountant((10, 20))
+    accountant.record_prevented(DAY + 22 * MINUTE)
+    accountant.record_prevented(DAY + 24 * MINUTE)
+    assert accountant.stats(DAY + 25 * MINUTE, DAY)["short_cycles_prevented"] == 1
+
+    accountant.observe(True, DAY + 30 * MINUTE)
+    accountant.record_prevented(DAY + 32 * MINUTE)
+    assert accountant.stats(DAY + 35 * MINUTE, DAY)["short_cycles_prevented"] == 2
+
+def test_restore_round_trips_and_prunes() -> None:
+    """Persisted state comes back whole, less what fell out of the window."""
+    accountant = _accountant((10, 20), (40, 70))
+    accountant.record_prevented(DAY + 75 * MINUTE)
+
+    restored = RuntimeAccountant()
+    restored.restore(accountant.as_dict(), DAY + 80 * MINUTE)
+    assert restored.as_dict() == accountant.as_dict()
+
+    # The dedupe survives a restart too
+    restored.record_prevented(DAY + 78 * MINUTE)
+    assert len(restored.prevented) == 1
+
+    later = RuntimeAccountant()
+    later.restore(accountant.as_dict(), DAY + RUNTIME_WINDOW * 3600 + 30 * MINUTE)
+    assert list(later.runs) == [(DAY + 40 * MINUTE, DAY + 70 * MINUTE)]
+    assert len(later.prevented) == 1
@@ -0,0 +1,122 @@
+"""Tests for the PowerStat shadow planner runner."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from custom_components.powerstat.const import (
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
+    CONF_SHADOW_PLANNERS,
+    CONF_TEMP_DEADBAND,
+    DEFAULT_TEMP_DEADBAND,
+    SHADOW_CPU_BUDGET,
+    SHADOW_CYCLE_BUDGET,
+)
+from custom_components.powerstat.engine import shadow
+from custom_components.powerstat.engine.shadow import ShadowRunner
+
+CHEAP = SHADOW_CPU_BUDGET / 4
+SLOW = SHADOW_CPU_BUDGET * 1.5
+
+class _Clock:
+    """A CPU clock that only moves when a fake planner spends time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def thread_time(self) -> float:
+        """Return the CPU seconds spent so far."""
+        return self.now
+
+class _Rules:
+    """Rules that pass every plan through."""
+
+    def __init__(self, hass: Any, config: dict[str, Any]) -> None:
+        pass
+
+    def validate_action(self, snapshot: dict[str, Any], plan: dict[str, Any]) -> dict[str, Any]:
+        """Return the plan unchanged."""
+        return plan
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Register a cheap and a slow variant that run on a fake CPU clock."""
+    clock = _Clock()
+
+    class Planner:
+        """A planner that spends the CPU time its config asks for."""
+
+        def __init__(self, hass: Any, config: dict[str, Any], snapshot: dict[str, Any]) -> None:
+            self.cost = config["cost"]
+
+        async def async_calculate_plan(self) -> dict[str, Any]:
+            clock.now += self.cost
+            return {"hvac_mode": "off"}
+
+    monkeypatch.setattr(shadow, "time", SimpleNamespace(thread_time=clock.thread_time))
+    monkeypatch.setattr(shadow, "PowerStatRules", _Rules)
+    monkeypatch.setitem(shadow.SHADOW_VARIANTS, "cheap", (Planner, {"cost": CHEAP}))
+    monkeypatch.setitem(shadow.SHADOW_VARIANTS, "slow", (Planner, {"cost": SLOW}))
+    return clock
+
+async def _cycle(runner: ShadowRunner, elapsed: float = 0.0) -> None:
+    """Run one shadow cycle against an idle production plan."""
+    await runner.async_run(0.0, {}, {}, {"hvac_mode": "off"}, elapsed)
+
+async def test_overrun_is_paid_back(clock: _Clock) -> None:
+    """An overrun is charged to later cycles, where slow variants wait."""
+    runner = ShadowRunner(None, {CONF_SHADOW_PLANNERS: ["cheap", "slow"]})
+
+    # The slow variant's cost is unknown at first, so it runs and overruns
+    await _cycle(runner)
+    assert runner.totals["slow"]["overruns"] == 1
+    assert runner.debt == pytest.approx(CHEAP + SLOW - SHADOW_CPU_BUDGET)
+
+    # Only the cheap variant fits what the debt leaves
+    await _cycle(runner)
+    assert (runner.totals["cheap"]["cycles"], runner.totals["slow"]["cycles"]) == (2, 1)
+    assert runner.skipped == 1
+    assert runner.costs["slow"] == pytest.approx(SLOW / 2)
+    assert runner.debt == pytest.approx(0.0)
+
+    # Its halved estimate fits a full budget, so it is retried
+    await _cycle(runner)
+    assert runner.totals["slow"]["cycles"] == 2
+    assert runner.totals["slow"]["overruns"] == 2
+    assert runner.totals["cheap"]["overruns"] == 0
+
+async def test_slow_cycle_skips_everything(clock: _Clock) -> None:
+    """A slow production cycle runs nothing, but still pays down the debt."""
+    runner = ShadowRunner(None, {CONF_SHADOW_PLANNERS: ["cheap"]})
+    runner.debt = SHADOW_CPU_BUDGET * 1.5
+
+    await _cycle(runner, SHADOW_CYCLE_BUDGET * 2)
+    assert runner.skipped == 1
+    assert runner.debt == pytest.approx(SHADOW_CPU_BUDGET / 2)
+    assert clock.now == 0.0
+
+    # What is left of the debt only shrinks the next budget
+    await _cycle(runner)
+    assert runner.totals["cheap"]["cycles"] == 1
+    assert runner.debt == pytest.approx(0.0)
+
+def test_variants_follow_configured_settings() -> None:
+    """Built-in variants scale what the user configured, not fixed values."""
+    variants = ["narrow_deadband", "wide_deadband", "long_min_times"]
+    runner = ShadowRunner(None, {CONF_SHADOW_PLANNERS: variants, CONF_TEMP_DEADBAND: 0.4})
+    configs = {name: config for name, _, config, _ in runner.variants}
+
+    assert configs["narrow_deadband"][CONF_TEMP_DEADBAND] == pytest.approx(0.2)
+    assert configs["wide_deadband"][CONF_TEMP_DEADBAND] == pytest.approx(0.8)
+    assert configs["long_min_times"][CONF_TEMP_DEADBAND] == 0.4
+
+    runner = ShadowRunner(
+        None, {CONF_SHADOW_PLANNERS: variants, CONF_MIN_ON_TIME: 6, CONF_MIN_OFF_TIME: 4}
+    )
+    configs = {name: config for name, _, config, _ in runner.variants}
+    assert configs["narrow_deadband"][CONF_TEMP_DEADBAND] == DEFAULT_TEMP_DEADBAND / 2
+    long_min_times = configs["long_min_times"]
+    assert (long_min_times[CONF_MIN_ON_TIME], long_min_times[CONF_MIN_OFF_TIME]) == (9, 6)
@@ -0,0 +1,124 @@
+"""Tests for the PowerStat thermal model batch updates."""
+from __future__ import annotations
+
+import math
+import random
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from custom_components.powerstat.models.thermal import (
+    ThermalModel,
+    grouped_ema,
+    grouped_welford,
+    welford,
+)
+
+FIELDS = ("cell_rates", "cell_means", "cell_m2", "rate_means", "rate_m2")
+
+def test_welford_matches_sample_variance() -> None:
+    """Folding values one by one gives the two-pass mean and variance."""
+    values = [1.0, 4.0, 2.5, 3.0, -1.0]
+    mean = m2 = 0.0
+    for count, value in enumerate(values, 1):
+        mean, m2 = welford(count, mean, m2, value)
+    expected = sum(values) / len(values)
+    assert math.isclose(mean, expected)
+    assert math.isclose(
+        m2 / (len(values) - 1),
+        sum((value - expected) ** 2 for value in values) / (len(values) - 1),
+    )
+
+def test_grouped_welford_matches_sequential() -> None:
+    """Merging a batch into existing groups equals folding it in order."""
+    rng = random.Random(1)
+    groups = [rng.randrange(4) for _ in range(200)]
+    values = [rng.gauss(0.1, 0.05) for _ in range(200)]
+    split = 60
+
+    counts, means, m2 = [0] * 5, [0.0] * 5, [0.0] * 5
+    for group, value in zip(groups[:split], values[:split]):
+        counts[group] += 1
+        means[group], m2[group] = welford(counts[group], means[group], m2[group], value)
+    batch = grouped_welford(
+        np.array(groups[split:]),
+        np.array(values[split:]),
+        np.array(counts),
+        np.array(means),
+        np.array(m2),
+    )
+    for group, value in zip(groups[split:], values[split:]):
+        counts[group] += 1
+        means[group], m2[group] = welford(counts[group], means[group], m2[group], value)
+
+    assert batch[0].tolist() == counts
+    assert np.allclose(batch[1], means, rtol=1e-12, atol=1e-15)
+    assert np.allclose(batch[2], m2, rtol=1e-9, atol=1e-15)
+    assert batch[1][4] == 0.0 and batch[2][4] == 0.0  # Untouched group
+
+def test_grouped_ema_seeds_new_groups() -> None:
+    """A group's first value is its starting EMA; later ones are blended in."""
+    result = grouped_ema(
+        np.array([0, 0, 1]),
+        np.array([1.0, 2.0, 5.0]),
+        np.array([0.0, 3.0, 7.0]),
+        np.array([0, 4, 2]),
+        0.5,
+    )
+    assert result.tolist() == [1.5, 4.0, 7.0]
+
+def test_update_batch_matches_update() -> None:
+    """Every field update_batch writes agrees with per-sample updates."""
+    rng = random.Random(2)
+    count = 500
+    modes = [rng.choice(("heat", "cool", "off")) for _ in range(count)]
+    deltas = [rng.gauss(0.5, 0.3) for _ in range(count)]
+    runtimes = [rng.choice((0.0, rng.uniform(5, 60))) for _ in range(count)]
+    outdoor = [rng.choice((math.nan, rng.uniform(-20, 40))) for _ in range(count)]
+    hours = [rng.randrange(24) for _ in range(count)]
+
+    sequential, batch = ThermalModel(), ThermalModel()
+    for model in (sequential, batch):
+        model.update("heat", 0.4, 10, 5.0, datetime(2026, 1, 1, 7))
+    for index in range(count):
+        sequential.update(
+            modes[index],
+            deltas[index],
+            runtimes[index],
+            None if math.isnan(outdoor[index]) else outdoor[index],
+            datetime(2026, 1, 1, hours[index]),
+        )
+    batch.update_batch(modes, deltas, runtimes, outdoor, hours)
+
+    for field in FIELDS:
+        assert np.allclose(
+            getattr(sequential, field), getattr(batch, field), rtol=1e-9, atol=1e-12
+        ), field
+    assert math.isclose(sequential.heat_rate, batch.heat_rate, rel_tol=1e-9)
+    assert math.isclose(sequential.cool_rate, batch.cool_rate, rel_tol=1e-9)
+    assert math.isclose(sequential.drift_rate, batch.drift_rate, rel_tol=1e-9)
+    assert list(sequential.cell_samples) == list(batch.cell_samples)
+    assert (sequential.samples_heat, sequential.samples_cool, sequential.samples_off) == (
+        batch.samples_heat,
+        batch.samples_cool,
+        batch.samples_off,
+    )
+
+def test_update_batch_ignores_empty_input() -> None:
+    """Nothing usable leaves the model and its version alone."""
+    model = ThermalModel()
+    model.update_batch(["dry", "heat"], [1.0, 1.0], [10.0, 0.0])
+    assert model.version == 0
+    assert model.samples_heat == 0
+
+def test_off_learns_passive_drift() -> None:
+    """Off periods train the drift without touching the run rates."""
+    model = ThermalModel()
+    model.update("off", -0.6, 60, 0.0, datetime(2026, 1, 1, 2))
+    model.update("off", -0.3, 60, 0.0, datetime(2026, 1, 1, 3))
+    assert model.drift_rate == pytest.approx(0.1 * -0.005 + 0.9 * -0.01)
+    assert model.samples_off == 2
+    assert (model.samples_heat, model.heat_rate) == (0, 0.0)
+    assert model.predict_rate("off", 0.0, datetime(2026, 1, 1, 3)) < 0
+    assert model.rate_table().shape[0] == 3